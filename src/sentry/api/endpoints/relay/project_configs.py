@@ -1,6 +1,5 @@
 import logging
 import random
-from typing import Optional
 
 from django.conf import settings
 from rest_framework.request import Request
@@ -114,9 +113,9 @@ class RelayProjectConfigsEndpoint(Endpoint):
 
         proj_configs = {}
         pending = []
-        for key in public_keys:
-            computed = self._get_cached_or_schedule(key)
+        for key, computed in projectconfig_cache.get_many(public_keys).items():
             if not computed:
+                schedule_build_project_config(public_key=key)
                 pending.append(key)
             else:
                 proj_configs[key] = computed
@@ -127,20 +126,6 @@ class RelayProjectConfigsEndpoint(Endpoint):
 
         return Response(res, status=200)
 
-    def _get_cached_or_schedule(self, public_key) -> Optional[dict]:
-        """
-        Returns the config of a project if it's in the cache; else, schedules a
-        task to compute and write it into the cache.
-
-        Debouncing of the project happens after the task has been scheduled.
-        """
-        cached_config = projectconfig_cache.get(public_key)
-        if cached_config:
-            return cached_config
-
-        schedule_build_project_config(public_key=public_key)
-        return None
-
     def _post_by_key(self, request: Request, full_config_requested):
         public_keys = request.relay_request_data.get("publicKeys")
         public_keys = set(public_keys or ())
@@ -2,6 +2,7 @@ import re
 from collections import namedtuple
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, List, Mapping, NamedTuple, Sequence, Set, Tuple, Union
 
 from django.utils.functional import cached_property
@@ -1135,6 +1136,22 @@ default_config = SearchConfig(
 )
 
 
+# Upper bound of distinct query strings whose parse trees are kept around.
+PARSE_TREE_CACHE_SIZE = 1000
+
+
+@lru_cache(maxsize=PARSE_TREE_CACHE_SIZE)
+def parse_tree(query: str) -> Node:
+    """
+    Parses a query string with the search grammar. The grammar does not depend
+    on the search config, params or builder, so trees are shared between all
+    callers. They are never modified by ``SearchVisitor``, which still runs on
+    every call so that relative dates and builder-dependent types are resolved
+    at the time of the request.
+    """
+    return event_search_grammar.parse(query)
+
+
 def parse_search_query(
     query, config=None, params=None, builder=None, config_overrides=None
 ) -> Sequence[SearchFilter]:
@@ -1142,7 +1159,7 @@ def parse_search_query(
         config = default_config
 
     try:
-        tree = event_search_grammar.parse(query)
+        tree = parse_tree(query)
     except IncompleteParseError as e:
         idx = e.column()
         prefix = query[max(0, idx - 5) : idx]
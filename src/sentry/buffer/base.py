@@ -1,6 +1,9 @@
 import logging
 
-from django.db.models import F
+from django.db import connections, router
+from django.db.models import F, Model
+from django.db.models.signals import post_save
+from psycopg2.extras import execute_values
 
 from sentry.signals import buffer_incr_complete
 from sentry.tasks.process_buffer import process_incr
@@ -14,6 +17,19 @@ class BufferMount(type):
         return new_cls
 
 
+BULK_UPDATE_QUERY = """
+    UPDATE {table}
+    SET {assignments}
+    FROM (VALUES %s) AS data ({columns})
+    WHERE {table}.{pk} = data.{pk}
+    RETURNING data.{pk}"""
+
+
+def _filter_pk(filters):
+    (value,) = filters.values()
+    return value.pk if isinstance(value, Model) else value
+
+
 class Buffer(Service, metaclass=BufferMount):
     """
     Buffers act as temporary stores for counters. The default implementation is just a passthru and
@@ -102,3 +118,95 @@ class Buffer(Service, metaclass=BufferMount):
             created=created,
             sender=model,
         )
+
+    def process_batch(self, model, updates):
+        """
+        Applies many buffered updates for a single model at once. ``updates`` is a
+        sequence of ``(columns, filters, extra, signal_only)`` tuples, at most one per
+        distinct set of filters.
+
+        Updates filtering on nothing but the primary key are written with one multi-row
+        UPDATE per distinct set of columns. Everything else, and rows which turn out not
+        to exist yet, fall back to ``process``.
+        """
+        from sentry.models import Group
+
+        pk_name = model._meta.pk.name
+        grouped = {}
+        for columns, filters, extra, signal_only in updates:
+            if signal_only or set(filters) - {"pk", pk_name} or len(filters) != 1:
+                # Subclasses such as ``RedisBuffer`` override ``process`` with a
+                # different signature, so the base implementation is called explicitly.
+                Buffer.process(self, model, columns, filters, extra, signal_only)
+                continue
+            shape = (tuple(sorted(columns)), tuple(sorted(extra or ())))
+            grouped.setdefault(shape, []).append((columns, filters, extra))
+
+        for (column_names, extra_names), rows in grouped.items():
+            updated = self._bulk_update(model, column_names, extra_names, rows)
+
+            for columns, filters, extra in rows:
+                if _filter_pk(filters) not in updated:
+                    if model is not Group:
+                        Buffer.process(self, model, columns, filters, extra)
+                    # Groups deleted before the buffer was flushed are dropped, the
+                    # same way ``process`` does it.
+                    continue
+                buffer_incr_complete.send_robust(
+                    model=model,
+                    columns=columns,
+                    filters=filters,
+                    extra=extra,
+                    created=False,
+                    sender=model,
+                )
+
+            if model is Group and updated:
+                # Mirror ``Group.update`` so the group cache and other ``post_save``
+                # receivers see the new values.
+                for group in Group.objects.filter(id__in=updated):
+                    post_save.send(sender=Group, instance=group, created=False)
+
+    def _bulk_update(self, model, column_names, extra_names, rows):
+        from sentry.models import Group
+
+        using = router.db_for_write(model)
+        connection = connections[using]
+        qn = connection.ops.quote_name
+        table = qn(model._meta.db_table)
+        pk = qn(model._meta.pk.column)
+
+        fields = [model._meta.get_field(name) for name in column_names + extra_names]
+        assignments = [
+            f"{qn(field.column)} = {table}.{qn(field.column)} + data.{qn(field.column)}"
+            for field in fields[: len(column_names)]
+        ] + [
+            f"{qn(field.column)} = data.{qn(field.column)}::{field.db_type(connection)}"
+            for field in fields[len(column_names) :]
+        ]
+        # HACK: keep in sync with the score handling in ``process``
+        if model is Group and "times_seen" in column_names and "last_seen" in extra_names:
+            assignments.append(
+                f"score = log({table}.times_seen + data.times_seen) * 600"
+                " + extract(epoch from data.last_seen::timestamptz)::int"
+            )
+
+        query = BULK_UPDATE_QUERY.format(
+            table=table,
+            assignments=", ".join(assignments),
+            columns=", ".join([pk] + [qn(field.column) for field in fields]),
+            pk=pk,
+        )
+        values = []
+        for columns, filters, extra in rows:
+            row = [_filter_pk(filters)]
+            row.extend(columns[name] for name in column_names)
+            row.extend(
+                field.get_db_prep_save(extra[field.name], connection)
+                for field in fields[len(column_names) :]
+            )
+            values.append(tuple(row))
+
+        with connection.cursor() as cursor:
+            result = execute_values(cursor, query, values, page_size=len(values), fetch=True)
+        return {row[0] for row in result}
@@ -51,12 +51,24 @@ class RedisBuffer(Buffer):
     key_expire = 60 * 60  # 1 hour
     pending_key = "b:p"
 
-    def __init__(self, pending_partitions=1, incr_batch_size=2, **options):
+    def __init__(
+        self,
+        pending_partitions=1,
+        incr_batch_size=2,
+        bulk_flush=False,
+        bulk_batch_size=500,
+        **options,
+    ):
         self.cluster, options = get_cluster_from_options("SENTRY_BUFFER_OPTIONS", options)
         self.pending_partitions = pending_partitions
         self.incr_batch_size = incr_batch_size
+        # When enabled, ``process_pending`` drains the pending set itself instead
+        # of fanning out ``process_incr`` tasks.
+        self.bulk_flush = bulk_flush
+        self.bulk_batch_size = bulk_batch_size
         assert self.pending_partitions > 0
         assert self.incr_batch_size > 0
+        assert self.bulk_batch_size > 0
 
     def validate(self):
         try:
@@ -229,6 +241,13 @@ class RedisBuffer(Buffer):
         if not client.set(lock_key, "1", nx=True, ex=60):
             return
 
+        if self.bulk_flush:
+            try:
+                self._process_pending_bulk(pending_key)
+            finally:
+                client.delete(lock_key)
+            return
+
         pending_buffer = PendingBuffer(self.incr_batch_size)
 
         try:
@@ -255,6 +274,65 @@ class RedisBuffer(Buffer):
         finally:
             client.delete(lock_key)
 
+    def _process_pending_bulk(self, pending_key):
+        """
+        Drains ``pending_key`` on every host without going through ``process_incr``.
+
+        Keys are read and removed with one transactional pipeline per
+        ``bulk_batch_size`` keys, coalesced per model and filters, and then written
+        through ``Buffer.process_batch``.
+        """
+        keycount = 0
+        with self.cluster.all() as conn:
+            results = conn.zrange(pending_key, 0, -1)
+
+        for host_id, keys in results.value.items():
+            if not keys:
+                continue
+            keycount += len(keys)
+            conn = self.cluster.get_local_client(host_id)
+            for i in range(0, len(keys), self.bulk_batch_size):
+                batch_keys = keys[i : i + self.bulk_batch_size]
+                pipe = conn.pipeline()
+                for key in batch_keys:
+                    pipe.hgetall(key)
+                pipe.zrem(pending_key, *batch_keys)
+                pipe.delete(*batch_keys)
+                self._process_bulk(pipe.execute()[: len(batch_keys)])
+
+        metrics.timing("buffer.pending-size", keycount)
+
+    def _process_bulk(self, batch_values):
+        pending = {}
+        for values in batch_values:
+            values = {force_text(k): v for k, v in values.items()}
+            if not values:
+                metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
+                continue
+
+            model, incr_values, filters, extra_values, signal_only = self._load_buffered(values)
+            updates = pending.setdefault(model, {})
+            # Coalesce on the same representation ``_make_key`` hashes.
+            update_key = (
+                tuple((k, self._coerce_val(v)) for k, v in sorted(filters.items())),
+                signal_only,
+            )
+            if update_key in updates:
+                columns, _, extra, _ = updates[update_key]
+                for column, amount in incr_values.items():
+                    columns[column] = columns.get(column, 0) + amount
+                extra.update(extra_values)
+            else:
+                updates[update_key] = (incr_values, filters, extra_values, signal_only)
+
+        for model, updates in pending.items():
+            metrics.timing(
+                "buffer.bulk-batch-size",
+                len(updates),
+                tags={"module": model.__module__, "model": model.__name__},
+            )
+            self.process_batch(model, list(updates.values()))
+
     def process(self, key=None, batch_keys=None):
         assert not (key is None and batch_keys is None)
         assert not (key is not None and batch_keys is not None)
@@ -298,32 +376,38 @@ class RedisBuffer(Buffer):
                 self.logger.debug("buffer.revoked.empty", extra={"redis_key": key})
                 return
 
-            # XXX(py3): Note that ``import_string`` explicitly wants a str in
-            # python2, so we'll decode (for python3) and then translate back to
-            # a byte string (in python2) for import_string.
-            model = import_string(str(values.pop("m").decode("utf-8")))
-
-            if values["f"].startswith(b"{"):
-                filters = self._load_values(json.loads(values.pop("f").decode("utf-8")))
-            else:
-                # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                filters = pickle.loads(values.pop("f"))
-
-            incr_values = {}
-            extra_values = {}
-            signal_only = None
-            for k, v in values.items():
-                if k.startswith("i+"):
-                    incr_values[k[2:]] = int(v)
-                elif k.startswith("e+"):
-                    if v.startswith(b"["):
-                        extra_values[k[2:]] = self._load_value(json.loads(v.decode("utf-8")))
-                    else:
-                        # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                        extra_values[k[2:]] = pickle.loads(v)
-                elif k == "s":
-                    signal_only = bool(int(v))  # Should be 1 if set
-
-            self._process(model, incr_values, filters, extra_values, signal_only)
+            self._process(*self._load_buffered(values))
         finally:
             client.delete(lock_key)
+
+    def _load_buffered(self, values):
+        """
+        Decodes a buffered hash into ``(model, columns, filters, extra, signal_only)``.
+        """
+        # XXX(py3): Note that ``import_string`` explicitly wants a str in
+        # python2, so we'll decode (for python3) and then translate back to
+        # a byte string (in python2) for import_string.
+        model = import_string(str(values.pop("m").decode("utf-8")))
+
+        if values["f"].startswith(b"{"):
+            filters = self._load_values(json.loads(values.pop("f").decode("utf-8")))
+        else:
+            # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+            filters = pickle.loads(values.pop("f"))
+
+        incr_values = {}
+        extra_values = {}
+        signal_only = None
+        for k, v in values.items():
+            if k.startswith("i+"):
+                incr_values[k[2:]] = int(v)
+            elif k.startswith("e+"):
+                if v.startswith(b"["):
+                    extra_values[k[2:]] = self._load_value(json.loads(v.decode("utf-8")))
+                else:
+                    # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+                    extra_values[k[2:]] = pickle.loads(v)
+            elif k == "s":
+                signal_only = bool(int(v))  # Should be 1 if set
+
+        return model, incr_values, filters, extra_values, signal_only
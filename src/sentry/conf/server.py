@@ -1507,6 +1507,9 @@ CACHE_VERSION = 1
 # Digests backend
 SENTRY_DIGESTS = "sentry.digests.backends.dummy.DummyBackend"
 SENTRY_DIGESTS_OPTIONS = {}
+# When greater than zero, ready timelines are delivered in batches of this
+# size by ``deliver_digests`` instead of one ``deliver_digest`` task each.
+SENTRY_DIGESTS_DELIVERY_BATCH_SIZE = 0
 
 # Quota backend
 SENTRY_QUOTAS = "sentry.quotas.Quota"
@@ -1514,6 +1517,8 @@ SENTRY_QUOTA_OPTIONS = {}
 
 # Cache for Relay project configs
 SENTRY_RELAY_PROJECTCONFIG_CACHE = "sentry.relay.projectconfig_cache.redis.RedisProjectConfigCache"
+# Set ``local_cache_size`` (and optionally ``local_cache_ttl`` in seconds) to
+# keep recently read configs in a short-lived in-process LRU.
 SENTRY_RELAY_PROJECTCONFIG_CACHE_OPTIONS = {}
 
 # Which cache to use for debouncing cache updates to the projectconfig cache
@@ -1541,6 +1546,16 @@ SENTRY_DEFAULT_MAX_EVENTS_PER_MINUTE = "90%"
 SENTRY_SNUBA = os.environ.get("SNUBA", "http://127.0.0.1:1218")
 SENTRY_SNUBA_TIMEOUT = 30
 SENTRY_SNUBA_CACHE_TTL_SECONDS = 60
+# For referrers listed in the ``snuba.query-cache.window-referrers`` option,
+# timestamps in cached Snuba queries are floored to this many seconds when
+# building the cache key, so that queries with a sliding time window share
+# cache entries. Queries are still sent with their exact timestamps, so only
+# referrers that tolerate results for a slightly different window should be
+# listed. 0 disables this.
+SENTRY_SNUBA_CACHE_WINDOW_SECONDS = 10
+# How long cached Snuba results may be served after they expired while they
+# are being refreshed in the background.
+SENTRY_SNUBA_CACHE_STALE_SECONDS = 0
 
 # Node storage backend
 SENTRY_NODESTORE = "sentry.nodestore.django.DjangoNodeStorage"
@@ -1674,6 +1689,12 @@ SENTRY_SOURCE_FETCH_MAX_SIZE = 40 * 1024 * 1024
 # e.g. memcached defaults to 1MB  = 1024 * 1024
 SENTRY_CACHE_MAX_VALUE_SIZE = None
 
+# Maximum combined size (in bytes) of the parsed JavaScript sources and
+# sourcemaps kept in memory by each worker process, and how long (in seconds)
+# they are kept. Set the size to 0 to disable this cache.
+SENTRY_JS_ARTIFACT_CACHE_SIZE = 128 * 1024 * 1024
+SENTRY_JS_ARTIFACT_CACHE_MAX_AGE = 300
+
 # Fields which managed users cannot change via Sentry UI. Username and password
 # cannot be changed by managed users. Optionally include 'email' and
 # 'name' in SENTRY_MANAGED_USER_FIELDS.
@@ -1905,6 +1926,12 @@ SENTRY_TEAM_ROLES = (
 # See sentry/options/__init__.py for more information
 SENTRY_OPTIONS = {}
 SENTRY_DEFAULT_OPTIONS = {}
+# If set, every process keeps a snapshot of all options stored in the database
+# and checks every this many seconds whether it needs to be reloaded. See
+# ``OptionsStore.enable_snapshot``.
+SENTRY_OPTIONS_SNAPSHOT_INTERVAL = 0
+# Reload the options snapshot at least this often (in seconds).
+SENTRY_OPTIONS_SNAPSHOT_MAX_AGE = 60
 
 # You should not change this setting after your database has been created
 # unless you have altered all schemas first
@@ -2972,6 +2999,8 @@ ORGANIZATION_VITALS_OVERVIEW_PROJECT_LIMIT = 300
 # Default string indexer cache options
 SENTRY_STRING_INDEXER_CACHE_OPTIONS = {
     "cache_name": "default",
+    # Set "local_cache_size" to keep that many entries in process memory in
+    # front of the cache.
 }
 SENTRY_POSTGRES_INDEXER_RETRY_COUNT = 2
 
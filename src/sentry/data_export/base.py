@@ -3,6 +3,8 @@ from enum import Enum
 
 MAX_BATCH_SIZE = 8 * 1024 * 1024
 MAX_FRAGMENTS_PER_BATCH = 10
+# Streamed batches are not buffered on disk, see `stream_export_batch`
+MAX_STREAM_BATCH_SIZE = 256 * 1024 * 1024
 EXPORTED_ROWS_LIMIT = 10000000
 SNUBA_MAX_RESULTS = 10000
 DEFAULT_EXPIRATION = timedelta(weeks=4)
@@ -90,19 +90,29 @@ class IssuesByTagProcessor:
             result["ip_address"] = euser.ip_address if euser else ""
         return result
 
-    def get_raw_data(self, limit=1000, offset=0):
+    def get_raw_data(self, limit=1000, offset=0, callbacks=None):
         """
-        Returns list of GroupTagValues
+        Returns list of GroupTagValues, processed by ``callbacks`` (the
+        processor's callbacks by default)
         """
         return tagstore.get_group_tag_value_iter(
             group=self.group,
             environment_ids=[self.environment_id],
             key=self.lookup_key,
-            callbacks=self.callbacks,
+            callbacks=self.callbacks if callbacks is None else callbacks,
             limit=limit,
             offset=offset,
         )
 
+    def serialize_data(self, raw_data):
+        """
+        Returns list of serialized GroupTagValue dictionaries for GroupTagValues
+        fetched without callbacks
+        """
+        for callback in self.callbacks:
+            callback(raw_data)
+        return [self.serialize_row(item, self.key) for item in raw_data]
+
     def get_serialized_data(self, limit=1000, offset=0):
         """
         Returns list of serialized GroupTagValue dictionaries
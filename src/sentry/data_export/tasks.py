@@ -1,7 +1,10 @@
 import codecs
 import csv
+import io
 import logging
 import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from hashlib import sha1
 
 import celery
@@ -15,9 +18,10 @@ else:
 
 from celery.exceptions import MaxRetriesExceededError
 from django.core.files.base import ContentFile
-from django.db import IntegrityError, router
+from django.db import IntegrityError, connections, router
 from django.utils import timezone
 
+from sentry import options
 from sentry.models import (
     DEFAULT_BLOB_SIZE,
     MAX_FILE_SIZE,
@@ -35,6 +39,7 @@ from .base import (
     EXPORTED_ROWS_LIMIT,
     MAX_BATCH_SIZE,
     MAX_FRAGMENTS_PER_BATCH,
+    MAX_STREAM_BATCH_SIZE,
     SNUBA_MAX_RESULTS,
     ExportError,
     ExportQueryType,
@@ -108,52 +113,66 @@ def assemble_download(
 
             processor = get_processor(data_export, environment_id)
 
-            with tempfile.TemporaryFile(mode="w+b") as tf:
-                # XXX(python3):
-                #
-                # In python3 we write unicode strings (which is all the csv
-                # module is able to do, it will NOT write bytes like in py2).
-                # Because of this we use the codec getwriter to transform our
-                # file handle to a stream writer that will encode to utf8.
-                tfw = codecs.getwriter("utf-8")(tf)
-
-                writer = csv.DictWriter(tfw, processor.header_fields, extrasaction="ignore")
-                if first_page:
-                    writer.writeheader()
-
-                # the position in the file at the end of the headers
-                starting_pos = tf.tell()
-
-                # the row offset relative to the start of the current task
-                # this offset tells you the number of rows written during this batch fragment
-                fragment_offset = 0
-
-                # the absolute row offset from the beginning of the export
-                next_offset = offset + fragment_offset
+            stream_workers = options.get("dataexport.stream-workers")
+            if stream_workers > 0:
+                rows, next_offset, new_bytes_written = stream_export_batch(
+                    processor,
+                    data_export,
+                    export_limit=export_limit,
+                    batch_size=batch_size,
+                    offset=offset,
+                    bytes_written=bytes_written,
+                    workers=stream_workers,
+                    write_header=first_page,
+                )
+                bytes_written += new_bytes_written
+            else:
+                with tempfile.TemporaryFile(mode="w+b") as tf:
+                    # XXX(python3):
+                    #
+                    # In python3 we write unicode strings (which is all the csv
+                    # module is able to do, it will NOT write bytes like in py2).
+                    # Because of this we use the codec getwriter to transform our
+                    # file handle to a stream writer that will encode to utf8.
+                    tfw = codecs.getwriter("utf-8")(tf)
+
+                    writer = csv.DictWriter(tfw, processor.header_fields, extrasaction="ignore")
+                    if first_page:
+                        writer.writeheader()
+
+                    # the position in the file at the end of the headers
+                    starting_pos = tf.tell()
+
+                    # the row offset relative to the start of the current task
+                    # this offset tells you the number of rows written during this batch fragment
+                    fragment_offset = 0
+
+                    # the absolute row offset from the beginning of the export
+                    next_offset = offset + fragment_offset
 
-                rows = []
+                    rows = []
 
-                for _ in range(MAX_FRAGMENTS_PER_BATCH):
-                    # the number of rows to export in the next batch fragment
-                    fragment_row_count = min(batch_size, max(export_limit - next_offset, 1))
+                    for _ in range(MAX_FRAGMENTS_PER_BATCH):
+                        # the number of rows to export in the next batch fragment
+                        fragment_row_count = min(batch_size, max(export_limit - next_offset, 1))
 
-                    rows = process_rows(processor, data_export, fragment_row_count, next_offset)
-                    writer.writerows(rows)
+                        rows = process_rows(processor, data_export, fragment_row_count, next_offset)
+                        writer.writerows(rows)
 
-                    fragment_offset += len(rows)
-                    next_offset = offset + fragment_offset
+                        fragment_offset += len(rows)
+                        next_offset = offset + fragment_offset
 
-                    if (
-                        not rows
-                        or len(rows) < batch_size
-                        # the batch may exceed MAX_BATCH_SIZE but immediately stops
-                        or tf.tell() - starting_pos >= MAX_BATCH_SIZE
-                    ):
-                        break
+                        if (
+                            not rows
+                            or len(rows) < batch_size
+                            # the batch may exceed MAX_BATCH_SIZE but immediately stops
+                            or tf.tell() - starting_pos >= MAX_BATCH_SIZE
+                        ):
+                            break
 
-                tf.seek(0)
-                new_bytes_written = store_export_chunk_as_blob(data_export, bytes_written, tf)
-                bytes_written += new_bytes_written
+                    tf.seek(0)
+                    new_bytes_written = store_export_chunk_as_blob(data_export, bytes_written, tf)
+                    bytes_written += new_bytes_written
         except ExportError as error:
             if error.recoverable and export_retries > 0:
                 assemble_download.apply_async(
@@ -205,7 +224,8 @@ def assemble_download(
                         "environment_id": environment_id,
                         "export_retries": export_retries,
                     },
-                    countdown=3,
+                    # streamed batches are large enough to not need spacing out
+                    countdown=0 if stream_workers > 0 else 3,
                 )
             else:
                 metrics.timing("dataexport.row_count", next_offset, sample_rate=1.0)
@@ -267,6 +287,154 @@ def process_discover(processor, limit, offset):
     return processor.handle_fields(raw_data_unicode)
 
 
+@handle_snuba_errors(logger)
+def fetch_raw_rows(processor, data_export, limit, offset):
+    """
+    Runs the Snuba query of ``process_rows``. Unlike ``process_rows`` this is
+    safe to call from another thread, ``finish_raw_rows`` turns the result
+    into rows.
+    """
+    try:
+        if data_export.query_type == ExportQueryType.ISSUES_BY_TAG:
+            return processor.get_raw_data(limit=limit, offset=offset, callbacks=())
+        elif data_export.query_type == ExportQueryType.DISCOVER:
+            return processor.data_fn(limit=limit, offset=offset)["data"]
+        else:
+            raise ExportError(f"No processor found for this query type: {data_export.query_type}")
+    finally:
+        # the queries may need the database, don't leak the connections of
+        # worker threads
+        connections.close_all()
+
+
+def finish_raw_rows(processor, data_export, raw_rows):
+    if data_export.query_type == ExportQueryType.ISSUES_BY_TAG:
+        return processor.serialize_data(raw_rows)
+    return processor.handle_fields(raw_rows)
+
+
+class CsvRowEncoder:
+    """
+    Encodes rows like ``csv.DictWriter(extrasaction="ignore")``, a list of
+    rows at a time.
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def _flush(self):
+        value = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return value
+
+    def encode_header(self):
+        self._writer.writerow(self.fields)
+        return self._flush()
+
+    def encode(self, rows):
+        fields = self.fields
+        self._writer.writerows([row.get(field, "") for field in fields] for row in rows)
+        return self._flush()
+
+
+def stream_export_batch(
+    processor,
+    data_export,
+    export_limit,
+    batch_size,
+    offset,
+    bytes_written,
+    workers,
+    write_header=False,
+    blob_size=DEFAULT_BLOB_SIZE,
+):
+    """
+    Exports rows starting at ``offset`` until the export is complete or
+    ``MAX_STREAM_BATCH_SIZE`` bytes have been written.
+
+    Up to ``workers`` pages of ``batch_size`` rows are queried concurrently
+    ahead of the page being written. Pages are written in order, and the
+    output is stored as blobs as soon as a full blob is available rather than
+    at the end of the batch.
+
+    Returns a tuple of (rows of the last page, next row offset, bytes written),
+    where bytes written is 0 if the file size limit was reached.
+    """
+    # Blobs past ``bytes_written`` are left over from an interrupted attempt
+    # at this batch, which is going to be written again.
+    ExportedDataBlob.objects.filter(data_export=data_export, offset__gte=bytes_written).delete()
+
+    encoder = CsvRowEncoder(processor.header_fields)
+    buffer = bytearray(encoder.encode_header() if write_header else b"")
+    new_bytes_written = 0
+    next_offset = fetch_offset = offset
+    rows = []
+    pages = deque()
+    hub = sentry_sdk.Hub(sentry_sdk.Hub.current)
+
+    def fetch(limit, page_offset):
+        with hub:
+            return fetch_raw_rows(processor, data_export, limit, page_offset)
+
+    def store(contents):
+        fileobj = io.BytesIO(contents)
+        return store_export_chunk_as_blob(
+            data_export, bytes_written + new_bytes_written, fileobj, blob_size=blob_size
+        )
+
+    def discard_batch():
+        # The file size limit was reached part way through the batch. Blobs
+        # are cut at blob rather than row boundaries, so the ones already
+        # stored for this batch are dropped like a rolled back batch would be.
+        ExportedDataBlob.objects.filter(data_export=data_export, offset__gte=bytes_written).delete()
+        return rows, next_offset, 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            while True:
+                # Pages are queried assuming the previous ones are full, a
+                # short page ends the export and discards the pages after it.
+                while len(pages) < workers and (
+                    fetch_offset == offset or fetch_offset < export_limit
+                ):
+                    limit = min(batch_size, max(export_limit - fetch_offset, 1))
+                    pages.append(executor.submit(fetch, limit, fetch_offset))
+                    fetch_offset += limit
+
+                rows = finish_raw_rows(processor, data_export, pages.popleft().result())
+                buffer += encoder.encode(rows)
+                next_offset += len(rows)
+
+                if len(buffer) >= blob_size:
+                    full_size = len(buffer) - len(buffer) % blob_size
+                    stored = store(bytes(buffer[:full_size]))
+                    if not stored:
+                        return discard_batch()
+                    new_bytes_written += stored
+                    del buffer[:full_size]
+
+                if (
+                    len(rows) < batch_size
+                    or next_offset >= export_limit
+                    or new_bytes_written + len(buffer) >= MAX_STREAM_BATCH_SIZE
+                ):
+                    break
+        finally:
+            for page in pages:
+                page.cancel()
+
+    if buffer:
+        stored = store(bytes(buffer))
+        if not stored:
+            return discard_batch()
+        new_bytes_written += stored
+
+    return rows, next_offset, new_bytes_written
+
+
 class ExportDataFileTooBig(Exception):
     pass
 
@@ -70,6 +70,106 @@ class BulkDeleteQuery:
             cursor.execute(query)
             results = cursor.rowcount > 0
 
+    def _get_key_range_conditions(self):
+        quote_name = connections[self.using].ops.quote_name
+
+        where = []
+        if self.dtfield and self.days is not None:
+            cutoff = timezone.now() - timedelta(days=self.days)
+            where.append((f"{quote_name(self.dtfield)} < %s", [cutoff]))
+        if self.project_id:
+            where.append(("project_id = %s", [self.project_id]))
+        return where
+
+    def get_key_ranges(self, count):
+        """Splits the primary keys of the model into at most `count` ranges
+        `(start, end]` of about the same width, covering all rows currently
+        matching the query.
+        """
+        conditions = []
+        parameters = []
+        for condition, params in self._get_key_range_conditions():
+            conditions.append(condition)
+            parameters.extend(params)
+
+        query = f"select min(id), max(id) from {self.model._meta.db_table}"
+        if conditions:
+            query += " where " + " and ".join(conditions)
+
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(query, parameters)
+            min_id, max_id = cursor.fetchone()
+
+        if min_id is None:
+            return []
+
+        start = min_id - 1
+        width = -(-(max_id - start) // count)
+        return [(lo, min(lo + width, max_id)) for lo in range(start, max_id, width)]
+
+    def _iter_key_pages(self, cursor, start, end, batch_size):
+        # Keyset pagination over the primary key: every page covers the next
+        # `batch_size` keys of the range regardless of how many of the rows
+        # match the query, which bounds the work done per statement.
+        while start < end:
+            cursor.execute(
+                """
+                select max(id) from (
+                    select id
+                    from {table}
+                    where id > %s and id <= %s
+                    order by id
+                    limit %s
+                ) page
+                """.format(
+                    table=self.model._meta.db_table
+                ),
+                [start, end, batch_size],
+            )
+            page_end = cursor.fetchone()[0]
+            if page_end is None:
+                return
+            yield start, page_end
+            start = page_end
+
+    def _key_range_query(self, statement, page_start, page_end, where):
+        conditions = ["id > %s", "id <= %s"]
+        parameters = [page_start, page_end]
+        for condition, params in where:
+            conditions.append(condition)
+            parameters.extend(params)
+
+        query = "{statement} from {table} where {conditions}".format(
+            statement=statement,
+            table=self.model._meta.db_table,
+            conditions=" and ".join(conditions),
+        )
+        return query, parameters
+
+    def iterator_key_range(self, start, end, batch_size=100):
+        """Yields `(position, ids)` for every page of at most `batch_size`
+        primary keys in `(start, end]`, where `ids` are the keys of the page
+        matching the query and `position` is the last key of the page.
+        """
+        where = self._get_key_range_conditions()
+
+        with connections[self.using].cursor() as cursor:
+            for page_start, page_end in self._iter_key_pages(cursor, start, end, batch_size):
+                cursor.execute(*self._key_range_query("select id", page_start, page_end, where))
+                yield page_end, tuple(row[0] for row in cursor.fetchall())
+
+    def execute_key_range(self, start, end, batch_size=10000):
+        """Deletes the rows matching the query with primary keys in
+        `(start, end]` page by page, like `iterator_key_range`. Yields
+        `(position, deleted)` after every page.
+        """
+        where = self._get_key_range_conditions()
+
+        with connections[self.using].cursor() as cursor:
+            for page_start, page_end in self._iter_key_pages(cursor, start, end, batch_size):
+                cursor.execute(*self._key_range_query("delete", page_start, page_end, where))
+                yield page_end, cursor.rowcount
+
     def iterator(self, chunk_size=100, batch_size=100000):
         assert self.days is not None
         assert self.dtfield is not None and self.dtfield == self.order_by
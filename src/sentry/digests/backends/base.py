@@ -1,5 +1,5 @@
 import logging
-from typing import TYPE_CHECKING, Any, Iterable, Mapping, Optional
+from typing import TYPE_CHECKING, Any, Iterable, Mapping, Optional, Sequence
 
 from sentry.utils.imports import import_string
 from sentry.utils.services import Service
@@ -58,7 +58,16 @@ class Backend(Service):
     be transitioned to "waiting" instead.)
     """
 
-    __all__ = ("add", "delete", "digest", "enabled", "maintenance", "schedule", "validate")
+    __all__ = (
+        "add",
+        "delete",
+        "digest",
+        "digest_many",
+        "enabled",
+        "maintenance",
+        "schedule",
+        "validate",
+    )
 
     def __init__(self, **options: Any) -> None:
         # The ``minimum_delay`` option defines the default minimum amount of
@@ -168,6 +177,40 @@ class Backend(Service):
         """
         raise NotImplementedError
 
+    def digest_many(
+        self, keys: Sequence[str], minimum_delays: Optional[Mapping[str, int]] = None
+    ) -> Any:
+        """
+        Extract records from many timelines at once for processing.
+
+        This works like ``digest``, but the target of the ``as`` clause is a
+        mapping of timeline keys to their records. Timelines that are not in
+        the "ready" state, or that are currently being digested elsewhere, are
+        left out of the mapping rather than raising ``InvalidState``.
+        ``minimum_delays`` optionally maps timeline keys to the minimum delay
+        to use for them.
+
+        If the context manager successfully exits, every timeline that is still
+        part of the mapping is closed as it would be by ``digest``. Timelines
+        that were removed from the mapping by the caller (for instance because
+        their digest could not be built) are left untouched, so they are
+        retried like a failed ``digest``. If an exception is raised, no
+        timeline changes state. Timelines that could not be closed because
+        they were claimed elsewhere in the meantime are removed from the
+        mapping on exit and must not be delivered.
+
+        For example::
+
+            with timelines.digest_many(['project:1', 'project:2']) as digests:
+                messages = {key: build_digest_email(records) for key, records in digests.items()}
+
+            for key, message in messages.items():
+                if key in digests:
+                    message.send_async()
+
+        """
+        raise NotImplementedError
+
     def schedule(
         self, deadline: float, timestamp: Optional[float] = None
     ) -> Optional[Iterable["ScheduleEntry"]]:
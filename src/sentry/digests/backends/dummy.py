@@ -1,5 +1,5 @@
 from contextlib import contextmanager
-from typing import TYPE_CHECKING, Any, Iterable, Optional
+from typing import TYPE_CHECKING, Any, Iterable, Mapping, Optional, Sequence
 
 from sentry.digests.backends.base import Backend
 
@@ -26,6 +26,12 @@ class DummyBackend(Backend):
     def digest(self, key: str, minimum_delay: Optional[int] = None) -> Any:
         yield []
 
+    @contextmanager
+    def digest_many(
+        self, keys: Sequence[str], minimum_delays: Optional[Mapping[str, int]] = None
+    ) -> Any:
+        yield {}
+
     def schedule(
         self, deadline: float, timestamp: Optional[float] = None
     ) -> Optional[Iterable["ScheduleEntry"]]:
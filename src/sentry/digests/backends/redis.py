@@ -1,7 +1,8 @@
 import logging
 import time
+from collections import defaultdict
 from contextlib import contextmanager
-from typing import Any, Iterable, Optional, Tuple
+from typing import Any, Iterable, List, Mapping, MutableMapping, Optional, Sequence, Tuple
 
 from rb.clients import LocalClient
 from redis.exceptions import ResponseError
@@ -71,7 +72,8 @@ class RedisBackend(Backend):
 
     def __init__(self, **options: Any) -> None:
         self.cluster, options = get_cluster_from_options("SENTRY_DIGESTS_OPTIONS", options)
-        self.locks = LockManager(RedisLockBackend(self.cluster))
+        self.lock_backend = RedisLockBackend(self.cluster)
+        self.locks = LockManager(self.lock_backend)
 
         self.namespace = options.pop("namespace", "d")
 
@@ -186,6 +188,32 @@ class RedisBackend(Backend):
                     exc_info=True,
                 )
 
+    def __decode_records(self, response: Sequence[Any]) -> List[Record]:
+        return [
+            Record(
+                key.decode(),
+                self.codec.decode(value) if value is not None else None,
+                float(timestamp),
+            )
+            for key, value, timestamp in response
+        ]
+
+    def __filter_records(self, key: str, records: Sequence[Record]) -> List[Record]:
+        # If the record value is `None`, this means the record data was
+        # missing (it was presumably evicted by Redis) so we don't need to
+        # return it here.
+        filtered_records = [record for record in records if record.value is not None]
+        if len(records) != len(filtered_records):
+            logger.warning(
+                "Filtered out missing records when fetching digest",
+                extra={
+                    "key": key,
+                    "record_count": len(records),
+                    "filtered_record_count": len(filtered_records),
+                },
+            )
+        return filtered_records
+
     @contextmanager
     def digest(
         self, key: str, minimum_delay: Optional[int] = None, timestamp: Optional[float] = None
@@ -217,29 +245,8 @@ class RedisBackend(Backend):
                 else:
                     raise
 
-            records = [
-                Record(
-                    key.decode(),
-                    self.codec.decode(value) if value is not None else None,
-                    float(timestamp),
-                )
-                for key, value, timestamp in response
-            ]
-
-            # If the record value is `None`, this means the record data was
-            # missing (it was presumably evicted by Redis) so we don't need to
-            # return it here.
-            filtered_records = [record for record in records if record.value is not None]
-            if len(records) != len(filtered_records):
-                logger.warning(
-                    "Filtered out missing records when fetching digest",
-                    extra={
-                        "key": key,
-                        "record_count": len(records),
-                        "filtered_record_count": len(filtered_records),
-                    },
-                )
-            yield filtered_records
+            records = self.__decode_records(response)
+            yield self.__filter_records(key, records)
 
             script(
                 connection,
@@ -248,6 +255,106 @@ class RedisBackend(Backend):
                 + [record.key for record in records],
             )
 
+    @contextmanager
+    def digest_many(
+        self,
+        keys: Sequence[str],
+        minimum_delays: Optional[Mapping[str, int]] = None,
+        timestamp: Optional[float] = None,
+    ) -> Any:
+        if minimum_delays is None:
+            minimum_delays = {}
+
+        if timestamp is None:
+            timestamp = time.time()
+
+        # Timelines are claimed with the same lock keys that ``digest`` uses,
+        # but the locks are acquired and released by the script itself so that
+        # each host only takes one round trip to open and one to close.
+        lock_arguments = [self.lock_backend.prefix, self.lock_backend.uuid, 30]
+
+        router = self.cluster.get_router()
+        keys_by_host: MutableMapping[int, List[str]] = defaultdict(list)
+        for key in keys:
+            keys_by_host[router.get_host_for_key(f"{self.namespace}:t:{key}")].append(key)
+
+        claimed: MutableMapping[int, List[str]] = defaultdict(list)
+        record_keys: MutableMapping[str, List[str]] = {}
+        timelines: MutableMapping[str, List[Record]] = {}
+        try:
+            for host, host_keys in keys_by_host.items():
+                response = script(
+                    self.cluster.get_local_client(host),
+                    ["-"],
+                    [
+                        "DIGEST_OPEN_MANY",
+                        self.namespace,
+                        self.ttl,
+                        timestamp,
+                        self.capacity if self.capacity else -1,
+                    ]
+                    + lock_arguments
+                    + host_keys,
+                )
+                for key, records_response in response:
+                    key = key.decode("utf-8")
+                    claimed[host].append(key)
+                    records = self.__decode_records(records_response)
+                    record_keys[key] = [record.key for record in records]
+                    timelines[key] = self.__filter_records(key, records)
+
+            yield timelines
+        except Exception:
+            for host, host_keys in claimed.items():
+                script(
+                    self.cluster.get_local_client(host),
+                    ["-"],
+                    ["DIGEST_RELEASE_MANY", self.namespace, self.ttl, timestamp]
+                    + lock_arguments
+                    + host_keys,
+                )
+            raise
+
+        for host, host_keys in claimed.items():
+            close_arguments: List[Any] = []
+            release_arguments: List[Any] = []
+            for key in host_keys:
+                if key in timelines:
+                    close_arguments += [
+                        key,
+                        minimum_delays.get(key, self.minimum_delay),
+                        len(record_keys[key]),
+                    ] + record_keys[key]
+                else:
+                    release_arguments.append(key)
+
+            client = self.cluster.get_local_client(host)
+            if close_arguments:
+                closed = {
+                    key.decode("utf-8")
+                    for key in script(
+                        client,
+                        ["-"],
+                        ["DIGEST_CLOSE_MANY", self.namespace, self.ttl, timestamp]
+                        + lock_arguments
+                        + close_arguments,
+                    )
+                }
+                # Timelines whose lock expired before they were closed are
+                # removed so that the caller does not deliver them twice.
+                for key in host_keys:
+                    if key in timelines and key not in closed:
+                        logger.warning("digests.lock-lost", extra={"key": key})
+                        del timelines[key]
+            if release_arguments:
+                script(
+                    client,
+                    ["-"],
+                    ["DIGEST_RELEASE_MANY", self.namespace, self.ttl, timestamp]
+                    + lock_arguments
+                    + release_arguments,
+                )
+
     def delete(self, key: str, timestamp: Optional[float] = None) -> None:
         if timestamp is None:
             timestamp = time.time()
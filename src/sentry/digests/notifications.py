@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 import functools
 import itertools
 import logging
@@ -19,11 +20,11 @@ logger = logging.getLogger("sentry.digests")
 Notification = namedtuple("Notification", "event rules")
 
 
-def split_key(
+def _split_key_parts(
     key: str,
-) -> tuple[Project, ActionTargetType, str | None, FallthroughChoiceType | None]:
+) -> tuple[int, ActionTargetType, str | None, FallthroughChoiceType | None]:
     key_parts = key.split(":", 5)
-    project_id = key_parts[2]
+    project_id = int(key_parts[2])
     # XXX: We transitioned to new style keys (len == 5) a while ago on
     # sentry.io. But self-hosted users might transition at any time, so we need
     # to keep this transition code around for a while, maybe indefinitely.
@@ -42,9 +43,32 @@ def split_key(
         target_type = ActionTargetType.ISSUE_OWNERS
         target_identifier = None
         fallthrough_choice = None
+    return project_id, target_type, target_identifier, fallthrough_choice
+
+
+def split_key(
+    key: str,
+) -> tuple[Project, ActionTargetType, str | None, FallthroughChoiceType | None]:
+    project_id, target_type, target_identifier, fallthrough_choice = _split_key_parts(key)
     return Project.objects.get(pk=project_id), target_type, target_identifier, fallthrough_choice
 
 
+def split_keys(
+    keys: Sequence[str],
+) -> Mapping[str, tuple[Project, ActionTargetType, str | None, FallthroughChoiceType | None]]:
+    """
+    Same as ``split_key`` for many keys, fetching all projects with a single
+    query. Keys of projects that do not exist are left out of the result.
+    """
+    parts = {key: _split_key_parts(key) for key in keys}
+    projects = Project.objects.in_bulk({project_id for project_id, _, _, _ in parts.values()})
+    return {
+        key: (projects[project_id], target_type, target_identifier, fallthrough_choice)
+        for key, (project_id, target_type, target_identifier, fallthrough_choice) in parts.items()
+        if project_id in projects
+    }
+
+
 def unsplit_key(
     project: Project,
     target_type: ActionTargetType,
@@ -89,6 +113,66 @@ def fetch_state(project: Project, records: Sequence[Record]) -> Mapping[str, Any
     }
 
 
+def fetch_state_many(
+    digests: Mapping[str, tuple[Project, Sequence[Record]]]
+) -> Mapping[str, Mapping[str, Any]]:
+    """
+    Same as ``fetch_state`` for many digests, keyed by timeline. Groups and
+    rules of all digests are fetched with one query each. Event and user
+    counts still depend on the time window of each digest, so they are read
+    per digest.
+    """
+    groups = Group.objects.in_bulk(
+        {
+            record.value.event.group_id
+            for _, records in digests.values()
+            for record in records
+            if record.value.event.group_id is not None
+        }
+    )
+    rules = Rule.objects.in_bulk(
+        {
+            rule_id
+            for _, records in digests.values()
+            for record in records
+            for rule_id in record.value.rules
+        }
+    )
+
+    states = {}
+    for key, (project, records) in digests.items():
+        if not records:
+            continue
+
+        start = records[-1].datetime
+        end = records[0].datetime
+        # ``attach_state`` annotates the groups with the counts of this digest,
+        # so digests must not share group instances.
+        digest_groups = {}
+        for record in records:
+            group_id = record.value.event.group_id
+            if group_id in groups and group_id not in digest_groups:
+                digest_groups[group_id] = copy.copy(groups[group_id])
+
+        states[key] = {
+            "project": project,
+            "groups": digest_groups,
+            "rules": {
+                rule_id: rules[rule_id]
+                for record in records
+                for rule_id in record.value.rules
+                if rule_id in rules
+            },
+            "event_counts": tsdb.get_sums(
+                tsdb.models.group, list(digest_groups.keys()), start, end
+            ),
+            "user_counts": tsdb.get_distinct_counts_totals(
+                tsdb.models.users_affected_by_group, list(digest_groups.keys()), start, end
+            ),
+        }
+    return states
+
+
 def attach_state(
     project: Project,
     groups: MutableMapping[int, Group],
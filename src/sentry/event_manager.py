@@ -446,219 +446,14 @@ class EventManager:
 
             return jobs[0]["event"]
 
-        with metrics.timer("event_manager.save.organization.get_from_cache"):
-            project.set_cached_field_value(
-                "organization", Organization.objects.get_from_cache(id=project.organization_id)
-            )
-
-        jobs = [job]
-
-        is_reprocessed = is_reprocessed_event(job["data"])
-
-        with sentry_sdk.start_span(op="event_manager.save.pull_out_data"):
-            _pull_out_data(jobs, projects)
-
-        with sentry_sdk.start_span(op="event_manager.save.get_or_create_release_many"):
-            _get_or_create_release_many(jobs, projects)
-
-        with sentry_sdk.start_span(op="event_manager.save.get_event_user_many"):
-            _get_event_user_many(jobs, projects)
-
-        job["project_key"] = None
-        if job["key_id"] is not None:
-            with metrics.timer("event_manager.load_project_key"):
-                try:
-                    job["project_key"] = ProjectKey.objects.get_from_cache(id=job["key_id"])
-                except ProjectKey.DoesNotExist:
-                    pass
-
-        _derive_plugin_tags_many(jobs, projects)
-        _derive_interface_tags_many(jobs)
-
-        do_background_grouping_before = options.get("store.background-grouping-before")
-        if do_background_grouping_before:
-            _run_background_grouping(project, job)
-
-        secondary_hashes = None
-
-        try:
-            secondary_grouping_config = project.get_option("sentry:secondary_grouping_config")
-            secondary_grouping_expiry = project.get_option("sentry:secondary_grouping_expiry")
-            if secondary_grouping_config and (secondary_grouping_expiry or 0) >= time.time():
-                with metrics.timer("event_manager.secondary_grouping"):
-                    secondary_event = copy.deepcopy(job["event"])
-                    loader = SecondaryGroupingConfigLoader()
-                    secondary_grouping_config = loader.get_config_dict(project)
-                    secondary_hashes = _calculate_event_grouping(
-                        project, secondary_event, secondary_grouping_config
-                    )
-        except Exception:
-            sentry_sdk.capture_exception()
-
-        with metrics.timer("event_manager.load_grouping_config"):
-            # At this point we want to normalize the in_app values in case the
-            # clients did not set this appropriately so far.
-            if is_reprocessed:
-                # The customer might have changed grouping enhancements since
-                # the event was ingested -> make sure we get the fresh one for reprocessing.
-                grouping_config = get_grouping_config_dict_for_project(project)
-                # Write back grouping config because it might have changed since the
-                # event was ingested.
-                # NOTE: We could do this unconditionally (regardless of `is_processed`).
-                job["data"]["grouping_config"] = grouping_config
-            else:
-                grouping_config = get_grouping_config_dict_for_event_data(
-                    job["event"].data.data, project
-                )
-
-        with sentry_sdk.start_span(op="event_manager.save.calculate_event_grouping"), metrics.timer(
-            "event_manager.calculate_event_grouping"
-        ):
-            hashes = _calculate_event_grouping(project, job["event"], grouping_config)
-
-        hashes = CalculatedHashes(
-            hashes=list(hashes.hashes) + list(secondary_hashes and secondary_hashes.hashes or []),
-            hierarchical_hashes=hashes.hierarchical_hashes,
-            tree_labels=hashes.tree_labels,
-        )
-
-        if not do_background_grouping_before:
-            _run_background_grouping(project, job)
-
-        if hashes.tree_labels:
-            job["finest_tree_label"] = hashes.finest_tree_label
-
-        _materialize_metadata_many(jobs)
-
-        kwargs = _create_kwargs(job)
-
-        kwargs["culprit"] = job["culprit"]
-
-        # Load attachments first, but persist them at the very last after
-        # posting to eventstream to make sure all counters and eventstream are
-        # incremented for sure. Also wait for grouping to remove attachments
-        # based on the group counter.
-        with metrics.timer("event_manager.get_attachments"):
-            with sentry_sdk.start_span(op="event_manager.save.get_attachments"):
-                attachments = get_attachments(cache_key, job)
-
-        try:
-            with sentry_sdk.start_span(op="event_manager.save.save_aggregate_fn"):
-                group_info = _save_aggregate(
-                    event=job["event"],
-                    hashes=hashes,
-                    release=job["release"],
-                    metadata=dict(job["event_metadata"]),
-                    received_timestamp=job["received_timestamp"],
-                    **kwargs,
-                )
-                job["groups"] = [group_info]
-        except HashDiscarded as err:
-            logger.info(
-                "event_manager.save.discard",
-                extra={
-                    "reason": err.reason,
-                    "tombstone_id": err.tombstone_id,
-                },
-            )
-            discard_event(job, attachments)
-            raise
+        job["cache_key"] = cache_key
+        save_error_events([job], projects, auto_upgrade_grouping=auto_upgrade_grouping)
 
-        if not group_info:
-            return job["event"]
+        if job.get("discarded") is not None:
+            raise job["discarded"]
 
-        job["event"].group = group_info.group
-
-        # store a reference to the group id to guarantee validation of isolation
-        # XXX(markus): No clue what this does
-        job["event"].data.bind_ref(job["event"])
-
-        _get_or_create_environment_many(jobs, projects)
-        _get_or_create_group_environment_many(jobs, projects)
-        _get_or_create_release_associated_models(jobs, projects)
-        _increment_release_associated_counts_many(jobs, projects)
-        _get_or_create_group_release_many(jobs, projects)
-        _tsdb_record_all_metrics(jobs)
-
-        UserReport.objects.filter(project_id=project.id, event_id=job["event"].event_id).update(
-            group_id=group_info.group.id, environment_id=job["environment"].id
-        )
-
-        with metrics.timer("event_manager.filter_attachments_for_group"):
-            attachments = filter_attachments_for_group(attachments, job)
-
-        # XXX: DO NOT MUTATE THE EVENT PAYLOAD AFTER THIS POINT
-        _materialize_event_metrics(jobs)
-
-        for attachment in attachments:
-            key = f"bytes.stored.{attachment.type}"
-            old_bytes = job["event_metrics"].get(key) or 0
-            job["event_metrics"][key] = old_bytes + attachment.size
-
-        _nodestore_save_many(jobs)
-        save_unprocessed_event(project, job["event"].event_id)
-
-        if not raw:
-            if not project.first_event:
-                project.update(first_event=job["event"].datetime)
-                first_event_received.send_robust(
-                    project=project, event=job["event"], sender=Project
-                )
-
-            if (
-                has_event_minified_stack_trace(job["event"])
-                and not project.flags.has_minified_stack_trace
-            ):
-                first_event_with_minified_stack_trace_received.send_robust(
-                    project=project, event=job["event"], sender=Project
-                )
-
-        if is_reprocessed:
-            safe_execute(
-                reprocessing2.buffered_delete_old_primary_hash,
-                project_id=job["event"].project_id,
-                group_id=reprocessing2.get_original_group_id(job["event"]),
-                event_id=job["event"].event_id,
-                datetime=job["event"].datetime,
-                old_primary_hash=reprocessing2.get_original_primary_hash(job["event"]),
-                current_primary_hash=job["event"].get_primary_hash(),
-                _with_transaction=False,
-            )
-
-        _eventstream_insert_many(jobs)
-
-        # Do this last to ensure signals get emitted even if connection to the
-        # file store breaks temporarily.
-        #
-        # We do not need this for reprocessed events as for those we update the
-        # group_id on existing models in post_process_group, which already does
-        # this because of indiv. attachments.
-        if not is_reprocessed:
-            with metrics.timer("event_manager.save_attachments"):
-                save_attachments(cache_key, attachments, job)
-
-        metric_tags = {"from_relay": "_relay_processed" in job["data"]}
-
-        metrics.timing(
-            "events.latency",
-            job["received_timestamp"] - job["recorded_timestamp"],
-            tags=metric_tags,
-        )
-        metrics.timing("events.size.data.post_save", job["event"].size, tags=metric_tags)
-        metrics.incr(
-            "events.post_save.normalize.errors",
-            amount=len(job["data"].get("errors") or ()),
-            tags=metric_tags,
-        )
-
-        _track_outcome_accepted_many(jobs)
-
-        self._data = job["event"].data.data
-
-        # Check if the project is configured for auto upgrading and we need to upgrade
-        # to the latest grouping config.
-        if auto_upgrade_grouping and _project_should_update_grouping(project):
-            _auto_update_grouping(project)
+        if job["groups"]:
+            self._data = job["event"].data.data
 
         return job["event"]
 
@@ -983,6 +778,80 @@ def _derive_interface_tags_many(jobs: Sequence[Job]) -> None:
                 data.pop(iface.path, None)
 
 
+@metrics.wraps("save_event.get_project_key_many")
+def _get_project_key_many(jobs: Sequence[Job]) -> None:
+    key_ids = {job["key_id"] for job in jobs if job["key_id"] is not None}
+    project_keys: dict[int, ProjectKey] = {}
+    if key_ids:
+        with metrics.timer("event_manager.load_project_key"):
+            project_keys = {
+                key.id: key for key in ProjectKey.objects.get_many_from_cache(list(key_ids))
+            }
+
+    for job in jobs:
+        job["project_key"] = project_keys.get(job["key_id"])
+
+
+@metrics.wraps("save_event.calculate_event_grouping_many")
+def _calculate_event_grouping_many(jobs: Sequence[Job], projects: ProjectsMapping) -> None:
+    do_background_grouping_before = options.get("store.background-grouping-before")
+
+    for job in jobs:
+        project = projects[job["project_id"]]
+
+        if do_background_grouping_before:
+            _run_background_grouping(project, job)
+
+        secondary_hashes = None
+
+        try:
+            secondary_grouping_config = project.get_option("sentry:secondary_grouping_config")
+            secondary_grouping_expiry = project.get_option("sentry:secondary_grouping_expiry")
+            if secondary_grouping_config and (secondary_grouping_expiry or 0) >= time.time():
+                with metrics.timer("event_manager.secondary_grouping"):
+                    secondary_event = copy.deepcopy(job["event"])
+                    loader = SecondaryGroupingConfigLoader()
+                    secondary_grouping_config = loader.get_config_dict(project)
+                    secondary_hashes = _calculate_event_grouping(
+                        project, secondary_event, secondary_grouping_config
+                    )
+        except Exception:
+            sentry_sdk.capture_exception()
+
+        with metrics.timer("event_manager.load_grouping_config"):
+            # At this point we want to normalize the in_app values in case the
+            # clients did not set this appropriately so far.
+            if job["is_reprocessed"]:
+                # The customer might have changed grouping enhancements since
+                # the event was ingested -> make sure we get the fresh one for reprocessing.
+                grouping_config = get_grouping_config_dict_for_project(project)
+                # Write back grouping config because it might have changed since the
+                # event was ingested.
+                # NOTE: We could do this unconditionally (regardless of `is_processed`).
+                job["data"]["grouping_config"] = grouping_config
+            else:
+                grouping_config = get_grouping_config_dict_for_event_data(
+                    job["event"].data.data, project
+                )
+
+        with sentry_sdk.start_span(op="event_manager.save.calculate_event_grouping"), metrics.timer(
+            "event_manager.calculate_event_grouping"
+        ):
+            hashes = _calculate_event_grouping(project, job["event"], grouping_config)
+
+        job["hashes"] = hashes = CalculatedHashes(
+            hashes=list(hashes.hashes) + list(secondary_hashes and secondary_hashes.hashes or []),
+            hierarchical_hashes=hashes.hierarchical_hashes,
+            tree_labels=hashes.tree_labels,
+        )
+
+        if not do_background_grouping_before:
+            _run_background_grouping(project, job)
+
+        if hashes.tree_labels:
+            job["finest_tree_label"] = hashes.finest_tree_label
+
+
 @metrics.wraps("save_event.materialize_metadata_many")
 def _materialize_metadata_many(jobs: Sequence[Job]) -> None:
     for job in jobs:
@@ -1011,6 +880,45 @@ def _materialize_metadata_many(jobs: Sequence[Job]) -> None:
         job["culprit"] = data["culprit"]
 
 
+@metrics.wraps("save_event.save_aggregate_many")
+def _save_aggregate_many(jobs: Sequence[Job]) -> None:
+    for job in jobs:
+        kwargs = _create_kwargs(job)
+        kwargs["culprit"] = job["culprit"]
+
+        # Load attachments first, but persist them at the very last after
+        # posting to eventstream to make sure all counters and eventstream are
+        # incremented for sure. Also wait for grouping to remove attachments
+        # based on the group counter.
+        with metrics.timer("event_manager.get_attachments"):
+            with sentry_sdk.start_span(op="event_manager.save.get_attachments"):
+                job["attachments"] = get_attachments(job["cache_key"], job)
+
+        try:
+            with sentry_sdk.start_span(op="event_manager.save.save_aggregate_fn"):
+                group_info = _save_aggregate(
+                    event=job["event"],
+                    hashes=job["hashes"],
+                    release=job["release"],
+                    metadata=dict(job["event_metadata"]),
+                    received_timestamp=job["received_timestamp"],
+                    **kwargs,
+                )
+        except HashDiscarded as err:
+            logger.info(
+                "event_manager.save.discard",
+                extra={
+                    "reason": err.reason,
+                    "tombstone_id": err.tombstone_id,
+                },
+            )
+            discard_event(job, job["attachments"])
+            job["discarded"] = err
+            group_info = None
+
+        job["groups"] = [group_info] if group_info else []
+
+
 def _create_kwargs(job: Union[Job, PerformanceJob]) -> dict[str, Any]:
     kwargs = {
         "platform": job["platform"],
@@ -1030,27 +938,48 @@ def _create_kwargs(job: Union[Job, PerformanceJob]) -> dict[str, Any]:
 
 @metrics.wraps("save_event.get_or_create_environment_many")
 def _get_or_create_environment_many(jobs: Sequence[Job], projects: ProjectsMapping) -> None:
+    environments: dict[tuple[int, Optional[str]], Environment] = {}
     for job in jobs:
-        job["environment"] = Environment.get_or_create(
-            project=projects[job["project_id"]], name=job["environment"]
-        )
+        env_key = (job["project_id"], job["environment"])
+        if env_key not in environments:
+            environments[env_key] = Environment.get_or_create(
+                project=projects[job["project_id"]], name=job["environment"]
+            )
+        job["environment"] = environments[env_key]
 
 
 @metrics.wraps("save_event.get_or_create_group_environment_many")
 def _get_or_create_group_environment_many(jobs: Sequence[Job], projects: ProjectsMapping) -> None:
+    seen: set[tuple[int, int]] = set()
     for job in jobs:
-        _get_or_create_group_environment(job["environment"], job["release"], job["groups"])
+        _get_or_create_group_environment(
+            job["environment"], job["release"], job["groups"], seen=seen
+        )
 
 
 def _get_or_create_group_environment(
-    environment: Environment, release: Optional[Release], groups: Sequence[GroupInfo]
+    environment: Environment,
+    release: Optional[Release],
+    groups: Sequence[GroupInfo],
+    seen: Optional[set[tuple[int, int]]] = None,
 ) -> None:
+    """
+    ``seen`` collects the (group, environment) pairs looked up so far in a batch;
+    only the first event of a pair can have created the ``GroupEnvironment``.
+    """
     for group_info in groups:
+        pair = (group_info.group.id, environment.id)
+        if seen is not None and pair in seen:
+            group_info.is_new_group_environment = False
+            continue
+
         group_info.is_new_group_environment = GroupEnvironment.get_or_create(
             group_id=group_info.group.id,
             environment_id=environment.id,
             defaults={"first_release": release or None},
         )[1]
+        if seen is not None:
+            seen.add(pair)
 
 
 @metrics.wraps("save_event.get_or_create_release_associated_models")
@@ -1060,22 +989,43 @@ def _get_or_create_release_associated_models(
     # XXX: This is possibly unnecessarily detached from
     # _get_or_create_release_many, but we do not want to destroy order of
     # execution right now
+    jobs_by_key: dict[tuple[int, int, int], list[Job]] = {}
     for job in jobs:
         release = job["release"]
         if not release:
             continue
 
-        project = projects[job["project_id"]]
-        environment = job["environment"]
-        date = job["event"].datetime
-
-        ReleaseEnvironment.get_or_create(
-            project=project, release=release, environment=environment, datetime=date
+        jobs_by_key.setdefault((job["project_id"], release.id, job["environment"].id), []).append(
+            job
         )
 
-        ReleaseProjectEnvironment.get_or_create(
-            project=project, release=release, environment=environment, datetime=date
-        )
+    for (project_id, _, _), key_jobs in jobs_by_key.items():
+        project = projects[project_id]
+        release = key_jobs[0]["release"]
+        environment = key_jobs[0]["environment"]
+
+        for date in _first_and_last_seen(key_jobs):
+            ReleaseEnvironment.get_or_create(
+                project=project, release=release, environment=environment, datetime=date
+            )
+
+            ReleaseProjectEnvironment.get_or_create(
+                project=project, release=release, environment=environment, datetime=date
+            )
+
+
+def _first_and_last_seen(jobs: Sequence[Job]) -> list[datetime]:
+    """
+    Returns the datetimes to pass to a ``get_or_create(..., datetime=...)`` that
+    bumps ``last_seen`` when it is called once per event: the earliest so that a
+    created row gets the right ``first_seen``, then the latest if it differs.
+    The second call is served from the model's cache.
+    """
+    first_seen = min(job["event"].datetime for job in jobs)
+    last_seen = max(job["event"].datetime for job in jobs)
+    if first_seen == last_seen:
+        return [first_seen]
+    return [first_seen, last_seen]
 
 
 def _increment_release_associated_counts_many(
@@ -1123,10 +1073,27 @@ def _increment_release_associated_counts(
 
 @metrics.wraps("save_event.get_or_create_group_release_many")
 def _get_or_create_group_release_many(jobs: Sequence[Job], projects: ProjectsMapping) -> None:
+    group_infos_by_key: dict[tuple[int, int, int], list[GroupInfo]] = {}
+    jobs_by_key: dict[tuple[int, int, int], list[Job]] = {}
     for job in jobs:
-        _get_or_create_group_release(
-            job["environment"], job["release"], job["event"], job["groups"]
-        )
+        if not job["release"]:
+            continue
+        for group_info in job["groups"]:
+            key = (group_info.group.id, job["release"].id, job["environment"].id)
+            group_infos_by_key.setdefault(key, []).append(group_info)
+            jobs_by_key.setdefault(key, []).append(job)
+
+    for key, key_jobs in jobs_by_key.items():
+        group_infos = group_infos_by_key[key]
+        for date in _first_and_last_seen(key_jobs):
+            group_release = GroupRelease.get_or_create(
+                group=group_infos[0].group,
+                release=key_jobs[0]["release"],
+                environment=key_jobs[0]["environment"],
+                datetime=date,
+            )
+        for group_info in group_infos:
+            group_info.group_release = group_release
 
 
 def _get_or_create_group_release(
@@ -1154,19 +1121,28 @@ def _tsdb_record_all_metrics(jobs: Sequence[Job]) -> None:
 
     # XXX: validate whether anybody actually uses those metrics
 
+    # Counters carry their own timestamp, so all events of an environment go
+    # into one ``incr_multi`` call. Records and frequencies are batched per
+    # (environment, timestamp).
+    incrs: dict[int, list[tuple[Any, ...]]] = {}
+    frequencies: dict[tuple[int, datetime], list[tuple[Any, ...]]] = {}
+    records: dict[tuple[int, datetime], list[tuple[Any, ...]]] = {}
+
     for job in jobs:
-        incrs = []
-        frequencies = []
-        records = []
-        incrs.append((tsdb.models.project, job["project_id"]))
         event = job["event"]
         release = job["release"]
         environment = job["environment"]
         user = job["user"]
+        timestamp_options = {"timestamp": event.datetime}
+        job_incrs = incrs.setdefault(environment.id, [])
+        job_frequencies = frequencies.setdefault((environment.id, event.datetime), [])
+        job_records = records.setdefault((environment.id, event.datetime), [])
+
+        job_incrs.append((tsdb.models.project, job["project_id"], timestamp_options))
 
         for group_info in job["groups"]:
-            incrs.append((tsdb.models.group, group_info.group.id))
-            frequencies.append(
+            job_incrs.append((tsdb.models.group, group_info.group.id, timestamp_options))
+            job_frequencies.append(
                 (
                     tsdb.models.frequent_environments_by_group,
                     {group_info.group.id: {environment.id: 1}},
@@ -1174,32 +1150,36 @@ def _tsdb_record_all_metrics(jobs: Sequence[Job]) -> None:
             )
 
             if group_info.group_release:
-                frequencies.append(
+                job_frequencies.append(
                     (
                         tsdb.models.frequent_releases_by_group,
                         {group_info.group.id: {group_info.group_release.id: 1}},
                     )
                 )
             if user:
-                records.append(
+                job_records.append(
                     (tsdb.models.users_affected_by_group, group_info.group.id, (user.tag_value,))
                 )
 
         if release:
-            incrs.append((tsdb.models.release, release.id))
+            job_incrs.append((tsdb.models.release, release.id, timestamp_options))
 
         if user:
             project_id = job["project_id"]
-            records.append((tsdb.models.users_affected_by_project, project_id, (user.tag_value,)))
+            job_records.append(
+                (tsdb.models.users_affected_by_project, project_id, (user.tag_value,))
+            )
 
-        if incrs:
-            tsdb.incr_multi(incrs, timestamp=event.datetime, environment_id=environment.id)
+    for environment_id, env_incrs in incrs.items():
+        tsdb.incr_multi(env_incrs, environment_id=environment_id)
 
-        if records:
-            tsdb.record_multi(records, timestamp=event.datetime, environment_id=environment.id)
+    for (environment_id, timestamp), env_records in records.items():
+        if env_records:
+            tsdb.record_multi(env_records, timestamp=timestamp, environment_id=environment_id)
 
-        if frequencies:
-            tsdb.record_frequency_multi(frequencies, timestamp=event.datetime)
+    for (_, timestamp), env_frequencies in frequencies.items():
+        if env_frequencies:
+            tsdb.record_frequency_multi(env_frequencies, timestamp=timestamp)
 
 
 @metrics.wraps("save_event.nodestore_save_many")
@@ -1223,6 +1203,28 @@ def _nodestore_save_many(jobs: Sequence[Job]) -> None:
         job["event"].data.save(subkeys=subkeys)
 
 
+@metrics.wraps("save_event.send_first_event_signals_many")
+def _send_first_event_signals_many(jobs: Sequence[Job], projects: ProjectsMapping) -> None:
+    for job in jobs:
+        if job["raw"]:
+            continue
+
+        project = projects[job["project_id"]]
+        # ``update`` also sets ``first_event`` on the instance, so later jobs of the
+        # same project in this batch do not send the signal again.
+        if not project.first_event:
+            project.update(first_event=job["event"].datetime)
+            first_event_received.send_robust(project=project, event=job["event"], sender=Project)
+
+        if (
+            has_event_minified_stack_trace(job["event"])
+            and not project.flags.has_minified_stack_trace
+        ):
+            first_event_with_minified_stack_trace_received.send_robust(
+                project=project, event=job["event"], sender=Project
+            )
+
+
 @metrics.wraps("save_event.eventstream_insert_many")
 def _eventstream_insert_many(jobs: Sequence[Job]) -> None:
     for job in jobs:
@@ -2508,6 +2510,148 @@ def save_transaction_events(jobs: Sequence[Job], projects: ProjectsMapping) -> S
     return jobs
 
 
+@metrics.wraps("event_manager.save_error_events")
+def save_error_events(
+    jobs: Sequence[Job], projects: ProjectsMapping, auto_upgrade_grouping: bool = False
+) -> Sequence[Job]:
+    """
+    Saves a batch of error events, possibly spanning multiple projects.
+
+    Every job needs ``data``, ``project_id``, ``raw``, ``start_time`` and
+    ``cache_key`` set. Each stage runs once over the whole batch so that
+    lookups shared between events (releases, environments, group environments
+    and group releases) are only done once per distinct value.
+
+    Jobs whose hash was discarded get the ``HashDiscarded`` error stored as
+    ``discarded``; they and jobs that did not end up in a group are left with
+    empty ``groups`` and skipped by all stages after grouping.
+    """
+    with metrics.timer("event_manager.save_errors.organization_ids"):
+        organization_ids = {project.organization_id for project in projects.values()}
+
+    with metrics.timer("event_manager.save_errors.fetch_organizations"):
+        organizations = {
+            o.id: o for o in Organization.objects.get_many_from_cache(organization_ids)
+        }
+
+    with metrics.timer("event_manager.save_errors.set_organization_cache"):
+        for project in projects.values():
+            try:
+                project.set_cached_field_value(
+                    "organization", organizations[project.organization_id]
+                )
+            except KeyError:
+                continue
+
+    for job in jobs:
+        job["is_reprocessed"] = is_reprocessed_event(job["data"])
+
+    with sentry_sdk.start_span(op="event_manager.save.pull_out_data"):
+        _pull_out_data(jobs, projects)
+
+    with sentry_sdk.start_span(op="event_manager.save.get_or_create_release_many"):
+        _get_or_create_release_many(jobs, projects)
+
+    with sentry_sdk.start_span(op="event_manager.save.get_event_user_many"):
+        _get_event_user_many(jobs, projects)
+
+    _get_project_key_many(jobs)
+    _derive_plugin_tags_many(jobs, projects)
+    _derive_interface_tags_many(jobs)
+    _calculate_event_grouping_many(jobs, projects)
+    _materialize_metadata_many(jobs)
+    _save_aggregate_many(jobs)
+
+    saved_jobs = [job for job in jobs if job["groups"]]
+    for job in saved_jobs:
+        job["event"].group = job["groups"][0].group
+
+        # store a reference to the group id to guarantee validation of isolation
+        # XXX(markus): No clue what this does
+        job["event"].data.bind_ref(job["event"])
+
+    _get_or_create_environment_many(saved_jobs, projects)
+    _get_or_create_group_environment_many(saved_jobs, projects)
+    _get_or_create_release_associated_models(saved_jobs, projects)
+    _increment_release_associated_counts_many(saved_jobs, projects)
+    _get_or_create_group_release_many(saved_jobs, projects)
+    _tsdb_record_all_metrics(saved_jobs)
+
+    for job in saved_jobs:
+        UserReport.objects.filter(
+            project_id=job["project_id"], event_id=job["event"].event_id
+        ).update(group_id=job["groups"][0].group.id, environment_id=job["environment"].id)
+
+        with metrics.timer("event_manager.filter_attachments_for_group"):
+            job["attachments"] = filter_attachments_for_group(job["attachments"], job)
+
+    # XXX: DO NOT MUTATE THE EVENT PAYLOAD AFTER THIS POINT
+    _materialize_event_metrics(saved_jobs)
+
+    for job in saved_jobs:
+        for attachment in job["attachments"]:
+            key = f"bytes.stored.{attachment.type}"
+            old_bytes = job["event_metrics"].get(key) or 0
+            job["event_metrics"][key] = old_bytes + attachment.size
+
+    _nodestore_save_many(saved_jobs)
+    for job in saved_jobs:
+        save_unprocessed_event(projects[job["project_id"]], job["event"].event_id)
+
+    _send_first_event_signals_many(saved_jobs, projects)
+
+    for job in saved_jobs:
+        if job["is_reprocessed"]:
+            safe_execute(
+                reprocessing2.buffered_delete_old_primary_hash,
+                project_id=job["event"].project_id,
+                group_id=reprocessing2.get_original_group_id(job["event"]),
+                event_id=job["event"].event_id,
+                datetime=job["event"].datetime,
+                old_primary_hash=reprocessing2.get_original_primary_hash(job["event"]),
+                current_primary_hash=job["event"].get_primary_hash(),
+                _with_transaction=False,
+            )
+
+    _eventstream_insert_many(saved_jobs)
+
+    for job in saved_jobs:
+        # Do this last to ensure signals get emitted even if connection to the
+        # file store breaks temporarily.
+        #
+        # We do not need this for reprocessed events as for those we update the
+        # group_id on existing models in post_process_group, which already does
+        # this because of indiv. attachments.
+        if not job["is_reprocessed"]:
+            with metrics.timer("event_manager.save_attachments"):
+                save_attachments(job["cache_key"], job["attachments"], job)
+
+        metric_tags = {"from_relay": "_relay_processed" in job["data"]}
+
+        metrics.timing(
+            "events.latency",
+            job["received_timestamp"] - job["recorded_timestamp"],
+            tags=metric_tags,
+        )
+        metrics.timing("events.size.data.post_save", job["event"].size, tags=metric_tags)
+        metrics.incr(
+            "events.post_save.normalize.errors",
+            amount=len(job["data"].get("errors") or ()),
+            tags=metric_tags,
+        )
+
+    _track_outcome_accepted_many(saved_jobs)
+
+    # Check if the project is configured for auto upgrading and we need to upgrade
+    # to the latest grouping config.
+    if auto_upgrade_grouping:
+        for project_id in {job["project_id"] for job in saved_jobs}:
+            if _project_should_update_grouping(projects[project_id]):
+                _auto_update_grouping(projects[project_id])
+
+    return jobs
+
+
 @metrics.wraps("event_manager.save_generic_events")
 def save_generic_events(jobs: Sequence[Job], projects: ProjectsMapping) -> Sequence[Job]:
     with metrics.timer("event_manager.save_generic.organization_ids"):
@@ -122,6 +122,7 @@ class EventStorage(Service):
         "get_event_by_id",
         "get_events",
         "get_unfetched_events",
+        "get_unfetched_events_multi",
         "get_prev_event_id",
         "get_next_event_id",
         "bind_nodes",
@@ -198,6 +199,25 @@ class EventStorage(Service):
         """
         raise NotImplementedError
 
+    def get_unfetched_events_multi(
+        self,
+        snuba_filters,
+        orderby=None,
+        limit=100,
+        referrer="eventstore.get_unfetched_events_multi",
+    ):
+        """
+        Same as get_unfetched_events for several filters at once. The queries are
+        sent to Snuba concurrently. Returns a list of events for every filter.
+
+        Arguments:
+        snuba_filters (Sequence[Filter]): Filters
+        orderby (Sequence[str]): List of fields to order by - default ['-time', '-event_id']
+        limit (int): Query limit per filter - default 100
+        referrer (string): Referrer - default "eventstore.get_unfetched_events_multi"
+        """
+        raise NotImplementedError
+
     def get_event_by_id(self, project_id, event_id, group_id=None):
         """
         Gets a single event of any event type given a project_id and event_id.
@@ -92,6 +92,43 @@ class SnubaEventStorage(EventStorage):
             dataset=dataset,
         )
 
+    def get_unfetched_events_multi(
+        self,
+        filters,
+        orderby=None,
+        limit=DEFAULT_LIMIT,
+        referrer="eventstore.get_unfetched_events_multi",
+        dataset=snuba.Dataset.Events,
+    ):
+        """
+        Get events from Snuba for several filters with one bulk query, without
+        node data loaded.
+        """
+        orderby = orderby or DESC_ORDERING
+        query_params = [
+            snuba.SnubaQueryParams(
+                **snuba.aliased_query_params(
+                    selected_columns=self.__get_columns(dataset),
+                    start=filter.start,
+                    end=filter.end,
+                    conditions=filter.conditions,
+                    filter_keys=filter.filter_keys,
+                    orderby=orderby,
+                    limit=limit,
+                    offset=DEFAULT_OFFSET,
+                    referrer=referrer,
+                    dataset=dataset,
+                )
+            )
+            for filter in filters
+        ]
+
+        results = snuba.bulk_raw_query(query_params, referrer=referrer)
+        return [
+            [] if "error" in result else [self.__make_event(evt) for evt in result["data"]]
+            for result in results
+        ]
+
     def __get_events(
         self,
         filter,
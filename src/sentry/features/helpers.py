@@ -1,4 +1,5 @@
-from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Callable, Mapping, MutableMapping, Optional, Sequence
 
 from rest_framework.request import Request
 from rest_framework.response import Response
@@ -6,7 +7,7 @@ from rest_framework.response import Response
 from sentry import features
 
 if TYPE_CHECKING:
-    from sentry.models import Organization
+    from sentry.models import Organization, Project, User
 
 # TODO(mgaeta): It's not currently possible to type a Callable's args with kwargs.
 EndpointFunc = Callable[..., Response]
@@ -63,3 +64,85 @@ def requires_feature(
         return wrapped
 
     return decorator
+
+
+def _get_request_memo() -> Optional[MutableMapping[Any, bool]]:
+    from sentry.app import env
+
+    request = env.request
+    if request is None:
+        return None
+
+    memo: Optional[MutableMapping[Any, bool]] = getattr(request, "_feature_batch_memo", None)
+    if memo is None:
+        memo = request._feature_batch_memo = {}
+    return memo
+
+
+def batch_has_for_projects(
+    feature_names: Sequence[str],
+    projects: Sequence["Project"],
+    actor: Optional["User"] = None,
+) -> Mapping["Project", Mapping[str, bool]]:
+    """
+    Determine which of the project features are enabled for every project.
+
+    Projects are checked per organization. The entity handler is asked about
+    all features at once (``batch_has``), and the features it does not handle
+    are checked with ``has_for_batch``, which lets every registered handler
+    answer for all projects of the organization in one call.
+
+    Within a request, results are memoized per feature, project and actor, so
+    that serializers and endpoints can call this repeatedly.
+
+    >>> batch_has_for_projects(['projects:feature'], projects, actor=request.user)
+    """
+    memo = _get_request_memo()
+    actor_id = getattr(actor, "id", None)
+
+    result: MutableMapping["Project", MutableMapping[str, bool]] = {
+        project: {} for project in projects
+    }
+
+    projects_by_org = defaultdict(list)
+    for project in projects:
+        projects_by_org[project.organization].append(project)
+
+    for organization, org_projects in projects_by_org.items():
+        pending = []
+        for feature_name in feature_names:
+            if memo is not None and all(
+                (feature_name, project.id, actor_id) in memo for project in org_projects
+            ):
+                for project in org_projects:
+                    result[project][feature_name] = memo[(feature_name, project.id, actor_id)]
+            else:
+                pending.append(feature_name)
+
+        if not pending:
+            continue
+
+        batch_features = features.batch_has(
+            pending, actor=actor, projects=org_projects, organization=organization
+        )
+        if batch_features:
+            for project in org_projects:
+                for feature_name, active in batch_features.get(f"project:{project.id}", {}).items():
+                    if feature_name in pending:
+                        result[project][feature_name] = active
+
+        for feature_name in pending:
+            unhandled = [project for project in org_projects if feature_name not in result[project]]
+            if not unhandled:
+                continue
+            for project, active in features.has_for_batch(
+                feature_name, organization, unhandled, actor
+            ).items():
+                result[project][feature_name] = active
+
+        if memo is not None:
+            for project in org_projects:
+                for feature_name in pending:
+                    memo[(feature_name, project.id, actor_id)] = result[project][feature_name]
+
+    return result
@@ -1,6 +1,7 @@
 import base64
 import os
 import zlib
+from functools import lru_cache
 
 import msgpack
 from parsimonious.exceptions import ParseError
@@ -11,6 +12,7 @@ from sentry.grouping.component import GroupingComponent
 from sentry.utils.strings import unescape_string
 
 from .actions import Action, FlagAction, VarAction
+from .dispatch import CompiledRules
 from .exceptions import InvalidEnhancerConfig
 from .matchers import (
     CalleeMatch,
@@ -70,6 +72,10 @@ _        = space*
 VERSIONS = [1, 2]
 LATEST_VERSION = VERSIONS[-1]
 
+# Number of distinct serialized enhancements kept by ``Enhancements.loads``.
+# Their frame match results share one bounded cache, see ``dispatch``.
+LOADED_ENHANCEMENTS_CACHE_SIZE = 100
+
 
 class StacktraceState:
     def __init__(self):
@@ -116,6 +122,22 @@ class Enhancements:
         self._modifier_rules = [rule for rule in self.iter_rules() if rule.is_modifier]
         self._updater_rules = [rule for rule in self.iter_rules() if rule.is_updater]
 
+        # Compiled lazily, most instances (e.g. the bases) never apply rules.
+        self._compiled_modifier_rules = None
+        self._compiled_updater_rules = None
+
+    @property
+    def compiled_modifier_rules(self):
+        if self._compiled_modifier_rules is None:
+            self._compiled_modifier_rules = CompiledRules(self._modifier_rules)
+        return self._compiled_modifier_rules
+
+    @property
+    def compiled_updater_rules(self):
+        if self._compiled_updater_rules is None:
+            self._compiled_updater_rules = CompiledRules(self._updater_rules)
+        return self._compiled_updater_rules
+
     def apply_modifications_to_frame(self, frames, platform, exception_data):
         """This applies the frame modifications to the frames itself.  This
         does not affect grouping.
@@ -125,24 +147,36 @@ class Enhancements:
 
         match_frames = [create_match_frame(frame, platform) for frame in frames]
 
-        for rule in self._modifier_rules:
-            for idx, action in rule.get_matching_frame_actions(
-                match_frames, platform, exception_data, cache
-            ):
+        compiled = self.compiled_modifier_rules
+        matched = compiled.match_frames(match_frames, cache)
+
+        for rule_idx, rule in enumerate(self._modifier_rules):
+            actions = compiled.get_matching_frame_actions(
+                rule_idx, match_frames, matched, platform, exception_data, cache
+            )
+            for idx, action in actions:
                 action.apply_modifications_to_frame(frames, match_frames, idx, rule=rule)
 
+            if actions:
+                # Actions change ``in_app`` and ``category`` of match frames
+                # which later rules have to see.
+                matched = compiled.match_frames(match_frames, cache)
+
     def update_frame_components_contributions(self, components, frames, platform, exception_data):
 
         cache = {}
 
         match_frames = [create_match_frame(frame, platform) for frame in frames]
 
+        compiled = self.compiled_updater_rules
+        matched = compiled.match_frames(match_frames, cache)
+
         stacktrace_state = StacktraceState()
         # Apply direct frame actions and update the stack state alongside
-        for rule in self._updater_rules:
+        for rule_idx, rule in enumerate(self._updater_rules):
 
-            for idx, action in rule.get_matching_frame_actions(
-                match_frames, platform, exception_data, cache
+            for idx, action in compiled.get_matching_frame_actions(
+                rule_idx, match_frames, matched, platform, exception_data, cache
             ):
                 action.update_frame_components_contributions(components, frames, idx, rule=rule)
                 action.modify_stacktrace_state(stacktrace_state, rule)
@@ -251,6 +285,12 @@ class Enhancements:
     def loads(cls, data):
         if isinstance(data, str):
             data = data.encode("ascii", "ignore")
+        # Instances are immutable, share them (and their compiled rules) between
+        # all grouping configs using the same enhancements.
+        return _load_enhancements(data)
+
+    @classmethod
+    def _loads(cls, data):
         padded = data + b"=" * (4 - (len(data) % 4))
         try:
             return cls._from_config_structure(
@@ -445,6 +485,11 @@ class EnhancmentsVisitor(NodeVisitor):
         return node.match.groups()[0].lstrip("!")
 
 
+@lru_cache(maxsize=LOADED_ENHANCEMENTS_CACHE_SIZE)
+def _load_enhancements(data):
+    return Enhancements._loads(data)
+
+
 def _load_configs():
     rv = {}
     base = os.path.join(os.path.abspath(os.path.dirname(__file__)), "enhancement-configs")
@@ -0,0 +1,219 @@
+import itertools
+import re
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from .matchers import (
+    CalleeMatch,
+    CallerMatch,
+    ExceptionFieldMatch,
+    FrameFieldMatch,
+    FrameMatch,
+    FunctionMatch,
+    PathLikeMatch,
+)
+
+# Upper bound of frame match results memoized across all ``CompiledRules``
+# instances of the process.
+FRAME_CACHE_SIZE = 10000
+
+# Keyed by (``CompiledRules`` instance token, normalized frame). A single
+# cache bounds memory no matter how many distinct enhancements are loaded.
+_frame_cache: Dict[Tuple[int, tuple], FrozenSet[int]] = {}
+# Tokens are never reused, unlike ``id()`` of collected instances.
+_cache_tokens = itertools.count()
+
+# Glob syntax we do not translate into a prefilter regex. Patterns containing
+# any of these are always handed to ``glob_match``.
+_UNTRANSLATED_GLOB_CHARS = frozenset(b"[]{}\\")
+
+
+def glob_to_prefilter(pattern: bytes, path_like: bool = False) -> Optional[bytes]:
+    """Translates a glob into a regex that matches a superset of the values
+    ``glob_match`` accepts for it, or returns ``None`` if the pattern uses syntax
+    that is not translated.
+
+    The regex may produce false positives (``?`` and ``*`` both become ``.*``,
+    ``/`` also matches ``\\``) but never false negatives, so a value that does
+    not match it can be skipped without calling into ``glob_match``.
+    """
+    if any(c in _UNTRANSLATED_GLOB_CHARS for c in pattern):
+        return None
+
+    parts = []
+    for c in pattern:
+        if c in b"*?":
+            if not parts or parts[-1] != b".*":
+                parts.append(b".*")
+        elif c == ord("/"):
+            parts.append(rb"[/\\]")
+        else:
+            parts.append(re.escape(bytes([c])))
+
+    for i, part in enumerate(parts):
+        if part != rb"[/\\]":
+            continue
+        # ``**/`` and ``/**`` may match without the slash, and
+        # ``path_like_match`` also tries the value with a leading slash.
+        if (
+            (i > 0 and parts[i - 1] == b".*")
+            or (i + 1 < len(parts) and parts[i + 1] == b".*")
+            or (path_like and i == 0)
+        ):
+            parts[i] = rb"[/\\]?"
+
+    return b"".join(parts)
+
+
+class _FieldBucket:
+    """All glob matchers of one frame field, with a combined prefilter regex."""
+
+    def __init__(self, field: str, matchers: Sequence[Tuple[int, FrameMatch]]):
+        self.field = field
+        self.prefiltered: List[Tuple[int, FrameMatch, "re.Pattern[bytes]"]] = []
+        self.unfiltered: List[Tuple[int, FrameMatch]] = []
+
+        for matcher_id, matcher in matchers:
+            regex = glob_to_prefilter(
+                matcher._encoded_pattern, path_like=isinstance(matcher, PathLikeMatch)
+            )
+            if regex is None:
+                self.unfiltered.append((matcher_id, matcher))
+            else:
+                self.prefiltered.append((matcher_id, matcher, re.compile(regex, re.DOTALL)))
+
+        self.combined = None
+        if self.prefiltered:
+            self.combined = re.compile(
+                b"|".join(b"(?:%s)" % regex.pattern for _, _, regex in self.prefiltered),
+                re.DOTALL,
+            )
+
+    def match(self, match_frame, cache, rv):
+        value = match_frame[self.field]
+
+        if value is None or self.combined is None or self.combined.fullmatch(value):
+            for matcher_id, matcher, regex in self.prefiltered:
+                if value is not None and not regex.fullmatch(value):
+                    positive = False
+                else:
+                    positive = matcher._positive_frame_match(match_frame, None, None, cache)
+                if positive != matcher.negated:
+                    rv.append(matcher_id)
+        else:
+            # None of the patterns can match, only negated matchers hold.
+            rv.extend(matcher_id for matcher_id, matcher, _ in self.prefiltered if matcher.negated)
+
+        for matcher_id, matcher in self.unfiltered:
+            if matcher.matches_frame([match_frame], 0, None, None, cache):
+                rv.append(matcher_id)
+
+
+class CompiledRules:
+    """Dispatch structure for evaluating a list of enhancement rules.
+
+    Every distinct frame matcher of the rules (including the ones wrapped in
+    caller/callee matchers) is evaluated once per distinct frame, bucketed by
+    the frame field it looks at. The set of matching matchers is memoized per
+    normalized frame (see ``create_match_frame``), so a rule only needs set
+    lookups to test a frame and its neighbors. Rules keep their order.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+
+        self._matcher_ids: Dict[int, int] = {}
+        self._matchers: List[FrameMatch] = []
+        # Per rule a tuple of (frame offset, matcher id), or ``None`` if the rule
+        # cannot be compiled and has to be evaluated by ``Rule`` itself.
+        self._plans: List[Optional[Tuple[Tuple[int, int], ...]]] = []
+        for rule in rules:
+            self._plans.append(self._compile_rule(rule))
+
+        buckets: Dict[str, List[Tuple[int, FrameMatch]]] = {}
+        self._generic: List[Tuple[int, FrameMatch]] = []
+        for matcher_id, matcher in enumerate(self._matchers):
+            if isinstance(matcher, (FrameFieldMatch, PathLikeMatch)):
+                buckets.setdefault(matcher.field, []).append((matcher_id, matcher))
+            elif isinstance(matcher, FunctionMatch):
+                buckets.setdefault("function", []).append((matcher_id, matcher))
+            else:
+                self._generic.append((matcher_id, matcher))
+        self._buckets = [_FieldBucket(field, matchers) for field, matchers in buckets.items()]
+
+        self._cache_token = next(_cache_tokens)
+
+    def _matcher_id(self, matcher: FrameMatch) -> int:
+        # ``FrameMatch`` instances are interned, so equal matchers share an id.
+        key = id(matcher)
+        if key not in self._matcher_ids:
+            self._matcher_ids[key] = len(self._matchers)
+            self._matchers.append(matcher)
+        return self._matcher_ids[key]
+
+    def _compile_rule(self, rule) -> Optional[Tuple[Tuple[int, int], ...]]:
+        plan = []
+        for matcher in rule._other_matchers:
+            if isinstance(matcher, CallerMatch):
+                offset, matcher = -1, matcher.caller
+            elif isinstance(matcher, CalleeMatch):
+                offset, matcher = 1, matcher.caller
+            else:
+                offset = 0
+
+            if not isinstance(matcher, FrameMatch) or isinstance(matcher, ExceptionFieldMatch):
+                return None
+            plan.append((offset, self._matcher_id(matcher)))
+
+        return tuple(plan)
+
+    def _match_frame(self, match_frame, cache) -> FrozenSet[int]:
+        key = (self._cache_token, tuple(sorted(match_frame.items())))
+        rv = _frame_cache.get(key)
+        if rv is not None:
+            return rv
+
+        matched: List[int] = []
+        for matcher_id, matcher in self._generic:
+            if matcher.matches_frame([match_frame], 0, None, None, cache):
+                matched.append(matcher_id)
+        for bucket in self._buckets:
+            bucket.match(match_frame, cache, matched)
+
+        if len(_frame_cache) >= FRAME_CACHE_SIZE:
+            _frame_cache.clear()
+        rv = _frame_cache[key] = frozenset(matched)
+        return rv
+
+    def match_frames(self, match_frames, cache) -> List[FrozenSet[int]]:
+        """Returns the ids of all matching frame matchers for every frame."""
+        return [self._match_frame(match_frame, cache) for match_frame in match_frames]
+
+    def get_matching_frame_actions(
+        self, rule_idx, match_frames, matched, platform, exception_data, cache
+    ):
+        """Same as ``Rule.get_matching_frame_actions`` for the rule at
+        ``rule_idx``, using ``matched`` as returned by ``match_frames``."""
+        rule = self.rules[rule_idx]
+        plan = self._plans[rule_idx]
+        if plan is None:
+            return rule.get_matching_frame_actions(match_frames, platform, exception_data, cache)
+
+        if not rule.matchers:
+            return []
+
+        for m in rule._exception_matchers:
+            if not m.matches_frame(match_frames, None, platform, exception_data, cache):
+                return []
+
+        rv = []
+        last_idx = len(matched) - 1
+        for idx in range(len(matched)):
+            for offset, matcher_id in plan:
+                neighbor = idx + offset
+                if neighbor < 0 or neighbor > last_idx or matcher_id not in matched[neighbor]:
+                    break
+            else:
+                for action in rule.actions:
+                    rv.append((idx, action))
+
+        return rv
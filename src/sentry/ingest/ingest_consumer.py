@@ -6,6 +6,7 @@ from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from typing import (
     Any,
     Callable,
+    List,
     Mapping,
     MutableMapping,
     MutableSequence,
@@ -22,7 +23,7 @@ import sentry_sdk
 from django.conf import settings
 from django.core.cache import cache
 
-from sentry import eventstore, features
+from sentry import eventstore, features, options
 from sentry.attachments import CachedAttachment, attachment_cache
 from sentry.event_manager import save_attachment
 from sentry.eventstore.processing import event_processing_store
@@ -31,7 +32,7 @@ from sentry.ingest.userreport import Conflict, save_userreport
 from sentry.killswitches import killswitch_matches_context
 from sentry.models import Project
 from sentry.signals import event_accepted
-from sentry.tasks.store import preprocess_event, save_event_transaction
+from sentry.tasks.store import preprocess_event, save_event_transaction, submit_save_event_batch
 from sentry.utils import json, metrics
 from sentry.utils.batching_kafka_consumer import AbstractBatchWorker
 from sentry.utils.cache import cache_key_for_event
@@ -96,13 +97,23 @@ class IngestConsumerWorker(AbstractBatchWorker):
 
         projects_to_fetch = set()
 
+        # Error events that are ready to be saved are collected here and saved
+        # in batches once all messages have been processed.
+        save_event_batch: Optional[List[Mapping[str, Any]]] = None
+        process_event_func = self.__process_event
+        if options.get("store.save-event-batch-size") > 0:
+            save_event_batch = []
+            process_event_func = functools.partial(
+                self.__process_event, save_event_batch=save_event_batch
+            )
+
         with metrics.timer("ingest_consumer.prepare_messages"):
             for message in batch:
                 message_type = message["type"]
                 projects_to_fetch.add(message["project_id"])
 
                 if message_type == "event":
-                    other_messages.append((self.__process_event, message))
+                    other_messages.append((process_event_func, message))
                 elif message_type == "attachment_chunk":
                     attachment_chunks.append(message)
                 elif message_type == "attachment":
@@ -148,6 +159,10 @@ class IngestConsumerWorker(AbstractBatchWorker):
                     (time.monotonic() - other_messages_flush_start) / len(other_messages),
                 )
 
+        if save_event_batch:
+            with metrics.timer("ingest_consumer.submit_save_event_batch"):
+                submit_save_event_batch(save_event_batch)
+
     def shutdown(self):
         if self.__process_event_executor is not None:
             self.__process_event_executor.shutdown()
@@ -169,8 +184,12 @@ def trace_func(**span_kwargs):
 
 
 @metrics.wraps("ingest_consumer.process_event")
-def _do_process_event(message: Message, projects: Mapping[int, Project]) -> None:
-    result = _load_event(message, projects)
+def _do_process_event(
+    message: Message,
+    projects: Mapping[int, Project],
+    save_event_batch: Optional[List[Mapping[str, Any]]] = None,
+) -> None:
+    result = _load_event(message, projects, save_event_batch)
     if result is None:
         return
 
@@ -179,7 +198,9 @@ def _do_process_event(message: Message, projects: Mapping[int, Project]) -> None
 
 
 def _load_event(
-    message: Message, projects: Mapping[int, Project]
+    message: Message,
+    projects: Mapping[int, Project],
+    save_event_batch: Optional[List[Mapping[str, Any]]] = None,
 ) -> Optional[Tuple[Any, Callable[[str], None]]]:
     """
     Perform some initial filtering and deserialize the message payload. If the
@@ -187,6 +208,9 @@ def _load_event(
     function that can be called with the event's storage key to resume
     processing after the event has been persisted and is available to be read by
     other processing components.
+
+    If ``save_event_batch`` is given, error events that need no processing are
+    appended to it instead of being saved in their own task.
     """
     payload = message["payload"]
     start_time = float(message["start_time"])
@@ -301,6 +325,7 @@ def _load_event(
                     event_id=event_id,
                     project=project,
                     has_attachments=bool(attachments),
+                    save_event_batch=save_event_batch,
                 )
 
         # remember for an 1 hour that we saved this event (deduplication protection)
@@ -318,14 +343,21 @@ def _store_event(data) -> str:
 
 
 @trace_func(name="ingest_consumer.process_event")
-def process_event(message: Message, projects: Mapping[int, Project]) -> None:
-    return _do_process_event(message, projects)
+def process_event(
+    message: Message,
+    projects: Mapping[int, Project],
+    save_event_batch: Optional[List[Mapping[str, Any]]] = None,
+) -> None:
+    return _do_process_event(message, projects, save_event_batch)
 
 
 def process_event_async(
-    executor: ThreadPoolExecutor, message: Message, projects: Mapping[int, Project]
+    executor: ThreadPoolExecutor,
+    message: Message,
+    projects: Mapping[int, Project],
+    save_event_batch: Optional[List[Mapping[str, Any]]] = None,
 ) -> Optional["AsyncResult[str]"]:
-    result = _load_event(message, projects)
+    result = _load_event(message, projects, save_event_batch)
     if result is None:
         return None
 
@@ -1,8 +1,14 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
 from symbolic import SourceView
 
+from sentry.utils import metrics
 from sentry.utils.strings import codec_lookup
 
-__all__ = ["SourceCache", "SourceMapCache"]
+__all__ = ["SourceCache", "SourceMapCache", "ArtifactCache", "artifact_cache"]
 
 
 def is_utf8(codec):
@@ -90,3 +96,83 @@ class SourceMapCache:
             sourcemap = self.get(sourcemap_url)
             return (sourcemap_url, sourcemap)
         return (None, None)
+
+
+class ArtifactCache:
+    """
+    A process-wide LRU cache of parsed artifacts (``SourceView`` and
+    ``SourceMapCache`` instances), which sits in front of the fetch cache so
+    that frequently used bundles and their sourcemaps do not have to be
+    decompressed and parsed again for every event.
+
+    The cache is bounded by the combined size (in bytes) of the artifacts it
+    holds, as given by the caller. Entries expire after ``max_age`` seconds
+    since they might have been scraped or replaced in the meantime.
+    """
+
+    def __init__(self, max_size, max_age):
+        self.max_size = max_size
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        # key -> (value, size, expires)
+        self._entries = OrderedDict()
+        self._size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self):
+        return self._size
+
+    def get(self, key):
+        if not self.max_size:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] <= time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        metrics.incr(
+            "sourcemaps.artifact_cache.get",
+            tags={"result": "hit" if entry is not None else "miss", "type": key[0]},
+            skip_internal=True,
+        )
+        return entry[0] if entry is not None else None
+
+    def set(self, key, value, size):
+        # Artifacts that would evict (nearly) everything else are not cached.
+        if not self.max_size or size > self.max_size // 4:
+            return
+
+        evicted = 0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, time.monotonic() + self.max_age)
+            self._size += size
+            while self._size > self.max_size:
+                self._remove(next(iter(self._entries)))
+                evicted += 1
+
+        if evicted:
+            metrics.incr("sourcemaps.artifact_cache.evict", amount=evicted, skip_internal=True)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+
+
+artifact_cache = ArtifactCache(
+    max_size=settings.SENTRY_JS_ARTIFACT_CACHE_SIZE,
+    max_age=settings.SENTRY_JS_ARTIFACT_CACHE_MAX_AGE,
+)
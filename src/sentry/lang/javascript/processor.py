@@ -18,6 +18,7 @@ from django.utils import timezone
 from django.utils.encoding import force_bytes, force_text
 from requests.utils import get_encoding_from_headers
 from symbolic import SourceMapCache as SmCache
+from symbolic import SourceView
 
 from sentry import features, http, options
 from sentry.event_manager import set_tag
@@ -38,7 +39,7 @@ from sentry.utils.retries import ConditionalRetryPolicy, exponential_delay
 from sentry.utils.safe import get_path
 from sentry.utils.urls import non_standard_url_join
 
-from .cache import SourceCache, SourceMapCache
+from .cache import SourceCache, SourceMapCache, artifact_cache
 
 __all__ = ["JavaScriptStacktraceProcessor"]
 
@@ -723,28 +724,38 @@ def get_max_age(headers):
 
 
 def fetch_sourcemap(url, source=b"", project=None, release=None, dist=None, allow_scraping=True):
+    body = fetch_sourcemap_body(
+        url, project=project, release=release, dist=dist, allow_scraping=allow_scraping
+    )
+    return parse_sourcemap(url, source, body)
+
+
+def fetch_sourcemap_body(url, project=None, release=None, dist=None, allow_scraping=True):
     if is_data_uri(url):
         try:
-            body = base64.b64decode(
+            return base64.b64decode(
                 force_bytes(url[BASE64_PREAMBLE_LENGTH:])
                 + (b"=" * (-(len(url) - BASE64_PREAMBLE_LENGTH) % 4))
             )
         except TypeError as e:
             raise UnparseableSourcemap({"url": "<base64>", "reason": str(e)})
-    else:
-        # look in the database and, if not found, optionally try to scrape the web
-        with sentry_sdk.start_span(
-            op="JavaScriptStacktraceProcessor.fetch_sourcemap.fetch_file"
-        ) as span:
-            span.set_data("url", url)
-            result = fetch_file(
-                url,
-                project=project,
-                release=release,
-                dist=dist,
-                allow_scraping=allow_scraping,
-            )
-        body = result.body
+
+    # look in the database and, if not found, optionally try to scrape the web
+    with sentry_sdk.start_span(
+        op="JavaScriptStacktraceProcessor.fetch_sourcemap.fetch_file"
+    ) as span:
+        span.set_data("url", url)
+        result = fetch_file(
+            url,
+            project=project,
+            release=release,
+            dist=dist,
+            allow_scraping=allow_scraping,
+        )
+    return result.body
+
+
+def parse_sourcemap(url, source, body):
     try:
         with sentry_sdk.start_span(
             op="JavaScriptStacktraceProcessor.fetch_sourcemap.SmCache.from_bytes"
@@ -1218,6 +1229,18 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
             cache.add_error(filename, {"type": EventError.JS_TOO_MANY_REMOTE_SOURCES})
             return
 
+        source_key = self._get_artifact_cache_key("source", filename)
+        cached = source_key and artifact_cache.get(source_key)
+        if cached:
+            source_view, result_url, sourcemap_url = cached
+            cache.add(filename, source_view)
+            cache.alias(result_url, filename)
+            if sourcemap_url:
+                sourcemaps.link(filename, sourcemap_url)
+                if sourcemap_url not in sourcemaps:
+                    self.cache_sourcemap(filename, sourcemap_url, source_view)
+            return
+
         # TODO: respect cache-control/max-age headers to some extent
         logger.debug("Attempting to cache source %r", filename)
         try:
@@ -1243,6 +1266,10 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
         cache.alias(result.url, filename)
 
         sourcemap_url = discover_sourcemap(result)
+        if source_key:
+            artifact_cache.set(
+                source_key, (cache.get(filename), result.url, sourcemap_url), len(result.body)
+            )
         if not sourcemap_url:
             return
 
@@ -1253,20 +1280,39 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
         if sourcemap_url in sourcemaps:
             return
 
+        self.cache_sourcemap(filename, sourcemap_url, result.body)
+
+    def cache_sourcemap(self, filename, sourcemap_url, source):
+        """
+        Fetch (or take from the artifact cache) and cache the source map of a
+        minified source file.
+
+        ``source`` is either the body of the minified file, or its
+        ``SourceView`` if it was taken from the artifact cache.
+        """
+        sourcemap_key = self._get_artifact_cache_key("sourcemap", filename, sourcemap_url)
+        sourcemap_view = sourcemap_key and artifact_cache.get(sourcemap_key)
+        if sourcemap_view is not None:
+            self.sourcemaps.add(sourcemap_url, sourcemap_view)
+            return
+
+        if isinstance(source, SourceView):
+            source = source.get_source().encode("utf-8")
+
         # pull down sourcemap
         try:
             with sentry_sdk.start_span(
                 op="JavaScriptStacktraceProcessor.cache_source.fetch_sourcemap"
             ) as span:
                 span.set_data("sourcemap_url", sourcemap_url)
-                sourcemap_view = fetch_sourcemap(
+                body = fetch_sourcemap_body(
                     sourcemap_url,
-                    source=result.body,
                     project=self.project,
                     release=self.release,
                     dist=self.dist,
                     allow_scraping=self.allow_scraping,
                 )
+                sourcemap_view = parse_sourcemap(sourcemap_url, source, body)
         except http.BadSource as exc:
             # we don't perform the same check here as above, because if someone has
             # uploaded a node_modules file, which has a sourceMappingURL, they
@@ -1274,13 +1320,24 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
             # working, if that's the case). If they're not looking for it to be
             # mapped, then they shouldn't be uploading the source file in the
             # first place.
-            cache.add_error(filename, exc.data)
+            self.cache.add_error(filename, exc.data)
             return
 
         with sentry_sdk.start_span(
             op="JavaScriptStacktraceProcessor.cache_source.cache_sourcemap_view"
         ) as span:
-            sourcemaps.add(sourcemap_url, sourcemap_view)
+            self.sourcemaps.add(sourcemap_url, sourcemap_view)
+
+        if sourcemap_key:
+            artifact_cache.set(sourcemap_key, sourcemap_view, len(source) + len(body))
+
+    def _get_artifact_cache_key(self, kind, *urls):
+        # Only artifacts of a release are kept in the process-wide cache.
+        # Releases are shared between projects, but whether and how missing
+        # artifacts are scraped depends on project settings.
+        if self.release is None:
+            return None
+        return (kind, self.project.id, self.release.id, self.dist and self.dist.id) + urls
 
     def populate_source_cache(self, frames):
         """
@@ -16,6 +16,7 @@ from django.core.files.storage import get_storage_class
 from django.db import IntegrityError, models, router, transaction
 from django.utils import timezone
 
+from sentry import options
 from sentry.db.models import (
     BoundedBigIntegerField,
     BoundedPositiveIntegerField,
@@ -39,6 +40,7 @@ UPLOAD_RETRY_TIME = getattr(settings, "SENTRY_UPLOAD_RETRY_TIME", 60)  # 1min
 DEFAULT_BLOB_SIZE = 1024 * 1024  # one mb
 CHUNK_STATE_HEADER = "__state"
 MULTI_BLOB_UPLOAD_CONCURRENCY = 8
+READAHEAD_CONCURRENCY = 8
 MAX_FILE_SIZE = 2**31  # 2GB is the maximum offset supported by fileblob
 
 
@@ -139,6 +141,9 @@ class FileBlob(Model):
             else:
                 files_with_checksums.append((fileobj, None))
 
+        if options.get("filestore.bulk-blob-upload"):
+            return cls._from_files_bulk(files_with_checksums, organization, logger)
+
         checksums_seen = set()
         blobs_created = []
         blobs_to_save = []
@@ -241,6 +246,86 @@ class FileBlob(Model):
                     pass
             logger.debug("FileBlob.from_files.end")
 
+    @classmethod
+    def _from_files_bulk(cls, files_with_checksums, organization=None, logger=nooplogger):
+        """Bulk variant of `from_files` that does not lock individual blobs.
+
+        Existing blobs are looked up with a single query and only the missing
+        ones are uploaded.  Rows are inserted in bulk and the unique
+        constraints on the checksum and owner resolve concurrent uploads of
+        the same blob: the row that made it into the database wins and the
+        files stored by everyone else are deleted again.
+        """
+        # Checksum everything before uploading anything so that a mismatch
+        # does not leave stored files behind.
+        pending = {}
+        for fileobj, reference_checksum in files_with_checksums:
+            size, checksum = _get_size_and_checksum(fileobj)
+            if reference_checksum is not None and checksum != reference_checksum:
+                raise OSError("Checksum mismatch")
+            pending.setdefault(checksum, (fileobj, size))
+
+        existing = set(
+            cls.objects.filter(checksum__in=list(pending)).values_list("checksum", flat=True)
+        )
+
+        def _upload_chunk(checksum):
+            fileobj, size = pending[checksum]
+            logger.debug(
+                "FileBlob.from_files._upload_chunk.start",
+                extra={"checksum": checksum, "size": size},
+            )
+            blob = cls(size=size, checksum=checksum, path=cls.generate_unique_path())
+            get_storage().save(blob.path, fileobj)
+            metrics.timing("filestore.blob-size", size, tags={"function": "from_files"})
+            logger.debug(
+                "FileBlob.from_files._upload_chunk.end",
+                extra={"checksum": checksum, "path": blob.path},
+            )
+            return blob
+
+        missing = [checksum for checksum in pending if checksum not in existing]
+        with ThreadPoolExecutor(max_workers=MULTI_BLOB_UPLOAD_CONCURRENCY) as exe:
+            new_blobs = list(exe.map(_upload_chunk, missing))
+
+        try:
+            with atomic_transaction(using=router.db_for_write(FileBlob)):
+                cls.objects.bulk_create(new_blobs, ignore_conflicts=True)
+        except Exception:
+            storage = get_storage()
+            for blob in new_blobs:
+                storage.delete(blob.path)
+            raise
+
+        blob_ids = {}
+        stored_paths = {}
+        for blob_id, checksum, path in cls.objects.filter(checksum__in=list(pending)).values_list(
+            "id", "checksum", "path"
+        ):
+            blob_ids[checksum] = blob_id
+            stored_paths[checksum] = path
+
+        # Blobs that lost the race against a concurrent upload of the same
+        # checksum point to a file nobody references.
+        lost = [blob for blob in new_blobs if stored_paths.get(blob.checksum) != blob.path]
+        if lost:
+            storage = get_storage()
+            for blob in lost:
+                storage.delete(blob.path)
+            metrics.incr("filestore.blob-upload-conflict", amount=len(lost))
+
+        if organization is not None:
+            with atomic_transaction(using=router.db_for_write(FileBlobOwner)):
+                FileBlobOwner.objects.bulk_create(
+                    [
+                        FileBlobOwner(organization_id=organization.id, blob_id=blob_id)
+                        for blob_id in blob_ids.values()
+                    ],
+                    ignore_conflicts=True,
+                )
+
+        logger.debug("FileBlob.from_files.end")
+
     @classmethod
     def from_file(cls, fileobj, logger=nooplogger):
         """
@@ -340,21 +425,30 @@ class File(Model):
         app_label = "sentry"
         db_table = "sentry_file"
 
-    def _get_chunked_blob(self, mode=None, prefetch=False, prefetch_to=None, delete=True):
+    def _get_chunked_blob(
+        self, mode=None, prefetch=False, prefetch_to=None, delete=True, readahead=0
+    ):
         return ChunkedFileBlobIndexWrapper(
             FileBlobIndex.objects.filter(file=self).select_related("blob").order_by("offset"),
             mode=mode,
             prefetch=prefetch,
             prefetch_to=prefetch_to,
             delete=delete,
+            readahead=readahead,
         )
 
-    def getfile(self, mode=None, prefetch=False):
+    def getfile(self, mode=None, prefetch=False, readahead=None):
         """Returns a file object.  By default the file is fetched on
         demand but if prefetch is enabled the file is fully prefetched
         into a tempfile before reading can happen.
+
+        When fetched on demand, up to ``readahead`` blobs after the one
+        being read are fetched in the background (defaults to the
+        ``filestore.readahead-blobs`` option).
         """
-        impl = self._get_chunked_blob(mode, prefetch)
+        if readahead is None:
+            readahead = options.get("filestore.readahead-blobs")
+        impl = self._get_chunked_blob(mode, prefetch, readahead=readahead)
         return FileObj(impl, self.name)
 
     def save_to(self, path):
@@ -493,12 +587,26 @@ class FileBlobIndex(Model):
         unique_together = (("file", "blob", "offset"),)
 
 
+_readahead_pool = ThreadPoolExecutor(max_workers=READAHEAD_CONCURRENCY)
+
+
+def _read_blob(blob):
+    with blob.getfile() as f:
+        return f.read()
+
+
 class ChunkedFileBlobIndexWrapper:
-    def __init__(self, indexes, mode=None, prefetch=False, prefetch_to=None, delete=True):
+    def __init__(
+        self, indexes, mode=None, prefetch=False, prefetch_to=None, delete=True, readahead=0
+    ):
         # eager load from database incase its a queryset
         self._indexes = list(indexes)
         self._curfile = None
         self._curidx = None
+        # The number of blobs to fetch ahead of the current one. Their
+        # contents are held in memory, keyed by position in ``_indexes``.
+        self._readahead = readahead
+        self._pending = {}
         if prefetch:
             self.prefetched = True
             self._prefetch(prefetch_to, delete)
@@ -527,8 +635,9 @@ class ChunkedFileBlobIndexWrapper:
         old_file = self._curfile
         try:
             try:
-                self._curidx = next(self._idxiter)
-                self._curfile = self._curidx.blob.getfile()
+                pos = next(self._idxiter)
+                self._curidx = self._indexes[pos]
+                self._curfile = self._open_blob(pos)
             except StopIteration:
                 self._curidx = None
                 self._curfile = None
@@ -536,6 +645,23 @@ class ChunkedFileBlobIndexWrapper:
             if old_file is not None:
                 old_file.close()
 
+    def _open_blob(self, pos):
+        if not self._readahead:
+            return self._indexes[pos].blob.getfile()
+
+        # Drop the blobs outside of the window after ``pos``, which happens
+        # when seeking, and start fetching the ones that are missing.
+        end = min(pos + self._readahead + 1, len(self._indexes))
+        for pending_pos in list(self._pending):
+            if not pos <= pending_pos < end:
+                self._pending.pop(pending_pos).cancel()
+        for next_pos in range(pos, end):
+            if next_pos not in self._pending:
+                blob = self._indexes[next_pos].blob
+                self._pending[next_pos] = _readahead_pool.submit(_read_blob, blob)
+
+        return io.BytesIO(self._pending.pop(pos).result())
+
     @property
     def size(self):
         return sum(i.blob.size for i in self._indexes)
@@ -577,6 +703,9 @@ class ChunkedFileBlobIndexWrapper:
     def close(self):
         if self._curfile:
             self._curfile.close()
+        for pending in self._pending.values():
+            pending.cancel()
+        self._pending.clear()
         self._curfile = None
         self._curidx = None
         self.closed = True
@@ -597,7 +726,7 @@ class ChunkedFileBlobIndexWrapper:
         for n, idx in enumerate(self._indexes[::-1]):
             if idx.offset <= pos:
                 if idx != self._curidx:
-                    self._idxiter = iter(self._indexes[-(n + 1) :])
+                    self._idxiter = iter(range(len(self._indexes) - n - 1, len(self._indexes)))
                     self._nextidx()
                 break
         else:
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Mapping, Sequence
+from typing import TYPE_CHECKING, Any, Iterable, Mapping, Sequence
 
 from django.db import models, transaction
 
@@ -119,6 +119,40 @@ class ProjectOptionManager(OptionManager["Project"]):
         values: Mapping[str, Value] = self._option_cache.get(cache_key, {})
         return values
 
+    def prefetch_all_values(self, project_ids: Iterable[int]) -> None:
+        """
+        Loads the options of many projects into the local option cache, with a
+        single cache lookup and at most one query, so that subsequent
+        ``get_value`` calls for those projects do not hit the cache or the
+        database again.
+        """
+        cache_keys = {}
+        for project_id in project_ids:
+            cache_key = self._make_key(project_id)
+            if cache_key not in self._option_cache:
+                cache_keys[cache_key] = project_id
+        if not cache_keys:
+            return
+
+        cached = cache.get_many(list(cache_keys.keys()))
+        self._option_cache.update(cached)
+
+        missing = {
+            cache_key: project_id
+            for cache_key, project_id in cache_keys.items()
+            if cached.get(cache_key) is None
+        }
+        if not missing:
+            return
+
+        results: dict[int, dict[str, Value]] = {project_id: {} for project_id in missing.values()}
+        for option in self.filter(project__in=list(missing.values())):
+            results[option.project_id][option.key] = option.value
+
+        loaded = {cache_key: results[project_id] for cache_key, project_id in missing.items()}
+        cache.set_many(loaded)
+        self._option_cache.update(loaded)
+
     def reload_cache(self, project_id: int, update_reason: str) -> Mapping[str, Value]:
         if update_reason != "projectoption.get_all_values":
             # this hook may be called from model hooks during an
@@ -10,7 +10,8 @@ from sentry.db.models.fields import FlexibleForeignKey, JSONField
 from sentry.models import ActorTuple
 from sentry.models.groupowner import OwnerRuleType
 from sentry.models.project import Project
-from sentry.ownership.grammar import Rule, load_schema, resolve_actors
+from sentry.ownership.grammar import Rule, resolve_actors
+from sentry.ownership.index import get_rule_index
 from sentry.utils import metrics
 from sentry.utils.cache import cache
 
@@ -310,14 +311,10 @@ class ProjectOwnership(Model):
         ownership: Union["ProjectOwnership", "ProjectCodeOwners"],
         data: Mapping[str, Any],
     ) -> Sequence["Rule"]:
-        rules = []
+        if ownership.schema is None:
+            return []
 
-        if ownership.schema is not None:
-            for rule in load_schema(ownership.schema):
-                if rule.test(data):
-                    rules.append(rule)
-
-        return rules
+        return get_rule_index(ownership.schema).matching_rules(data)
 
 
 def process_resource_change(instance, change, **kwargs):
@@ -3,6 +3,7 @@ from threading import local
 import sentry_sdk
 from django.core.cache import InvalidCacheBackendError, caches
 
+from sentry.nodestore import envelope
 from sentry.utils import json
 from sentry.utils.cache import memoize
 from sentry.utils.services import Service
@@ -56,8 +57,15 @@ class NodeStorage(local, Service):
 
     This is used in reprocessing to store a snapshot of the event from multiple
     stages of the pipeline.
+
+    Values are written in the format selected by ``encoding``: ``"json"``
+    (newline-separated JSON documents) or ``"envelope"`` (see
+    ``sentry.nodestore.envelope``), which lets reads decompress and parse only
+    the requested subkey. Both formats are always readable.
     """
 
+    encoding = "json"
+
     __all__ = (
         "delete",
         "delete_multi",
@@ -92,6 +100,10 @@ class NodeStorage(local, Service):
         if value is None:
             return None
 
+        if envelope.is_envelope(value):
+            payload = envelope.decode(value, subkey=subkey)
+            return None if payload is None else json_loads(payload)
+
         lines_iter = iter(value.splitlines())
         try:
             if subkey is not None:
@@ -201,6 +213,11 @@ class NodeStorage(local, Service):
         >>> _encode({"unprocessed": {}, None: {"stacktrace": {}}})
         b'{"stacktrace": {}}\nunprocessed\n{}'
         """
+        if self.encoding == "envelope":
+            return envelope.encode(
+                {key: json_dumps(value).encode("utf8") for key, value in data.items()}
+            )
+
         lines = [json_dumps(data.pop(None)).encode("utf8")]
         for key, value in data.items():
             lines.append(key.encode("ascii"))
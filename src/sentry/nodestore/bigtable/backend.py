@@ -17,7 +17,9 @@ class BigtableNodeStorage(NodeStorage):
     :param default_ttl: How many days keys should be stored (and considered
         valid for reading + returning)
     :param compression: A boolean whether to enable zlib-compression, or the
-        string "zstd" to use zstd.
+        string "zstd" to use zstd. Ignored for writes with the "envelope"
+        encoding, whose values are already compressed per subkey.
+    :param encoding: Either "json" or "envelope", see ``NodeStorage``.
 
     >>> BigtableNodeStorage(
     ...     project='some-project',
@@ -38,12 +40,15 @@ class BigtableNodeStorage(NodeStorage):
         automatic_expiry=False,
         default_ttl=None,
         compression=False,
+        encoding="json",
         **client_options,
     ):
-        if compression is True:
-            compression = "zlib"
-        elif compression is False:
+        if encoding == "envelope" or compression is False:
+            # Envelopes compress each subkey themselves. Rows written with
+            # compression are still decompressed on read based on their flags.
             compression = None
+        elif compression is True:
+            compression = "zlib"
 
         self.store = self.store_class(
             project=project,
@@ -53,6 +58,7 @@ class BigtableNodeStorage(NodeStorage):
             compression=compression,
             client_options=client_options,
         )
+        self.encoding = encoding
         self.automatic_expiry = automatic_expiry
         self.skip_deletes = automatic_expiry and "_SENTRY_CLEANUP" in os.environ
 
@@ -1,12 +1,15 @@
+import base64
 import logging
 import math
 import pickle
+import zlib
 
 from django.utils import timezone
 
 from sentry.db.models import create_or_update
+from sentry.nodestore import envelope
 from sentry.nodestore.base import NodeStorage
-from sentry.utils.strings import compress, decompress
+from sentry.utils.strings import compress
 
 from .models import Node
 
@@ -14,6 +17,9 @@ logger = logging.getLogger("sentry")
 
 
 class DjangoNodeStorage(NodeStorage):
+    def __init__(self, encoding="json"):
+        self.encoding = encoding
+
     def delete(self, id):
         Node.objects.filter(id=id).delete()
         self._delete_cache_item(id)
@@ -23,7 +29,7 @@ class DjangoNodeStorage(NodeStorage):
             return None
 
         try:
-            if value.startswith(b"{"):
+            if value.startswith(b"{") or envelope.is_envelope(value):
                 return NodeStorage._decode(self, value, subkey=subkey)
 
             if subkey is None:
@@ -37,19 +43,31 @@ class DjangoNodeStorage(NodeStorage):
     def _get_bytes(self, id):
         try:
             data = Node.objects.get(id=id).data
-            return decompress(data)
+            return self._decompress(data)
         except Node.DoesNotExist:
             return None
 
     def _get_bytes_multi(self, id_list):
-        return {n.id: decompress(n.data) for n in Node.objects.filter(id__in=id_list)}
+        return {n.id: self._decompress(n.data) for n in Node.objects.filter(id__in=id_list)}
+
+    def _decompress(self, data):
+        # Envelopes are compressed per subkey already and stored base64-encoded
+        # only, so that subkey reads do not need to inflate the whole value.
+        raw = base64.b64decode(data)
+        if envelope.is_envelope(raw):
+            return raw
+        return zlib.decompress(raw)
 
     def delete_multi(self, id_list):
         Node.objects.filter(id__in=id_list).delete()
         self._delete_cache_items(id_list)
 
     def _set_bytes(self, id, data, ttl=None):
-        create_or_update(Node, id=id, values={"data": compress(data), "timestamp": timezone.now()})
+        if envelope.is_envelope(data):
+            data = base64.b64encode(data).decode("utf-8")
+        else:
+            data = compress(data)
+        create_or_update(Node, id=id, values={"data": data, "timestamp": timezone.now()})
 
     def cleanup(self, cutoff_timestamp):
         from sentry.db.deletion import BulkDeleteQuery
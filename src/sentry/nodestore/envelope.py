@@ -0,0 +1,100 @@
+"""
+Versioned binary envelope for nodestore values.
+
+The JSON-lines format written by ``NodeStorage._encode`` requires parsing
+every line up to the requested subkey and (depending on the backend) the
+whole value has to be decompressed before that. The envelope instead stores
+a header with an offset table followed by one zstd frame per subkey, so a
+read only decompresses and parses the payload it was asked for:
+
+    magic (4 bytes) | version (1 byte) | entry count (uint16)
+    entry count * [key length (uint8) | key | offset (uint32) | length (uint32)]
+    frames
+
+Offsets are relative to the end of the header. The default payload (the
+``None`` subkey) is stored with an empty key.
+"""
+import struct
+from typing import Mapping, Optional
+
+import zstandard
+
+# Neither JSON nor pickled values can start with a NUL byte, which lets
+# readers tell envelopes apart from legacy values.
+MAGIC = b"\x00sne"
+VERSION = 1
+
+COMPRESSION_LEVEL = 3
+
+_PREAMBLE = struct.Struct(">4sBH")
+_KEY_LENGTH = struct.Struct(">B")
+_FRAME = struct.Struct(">II")
+
+MAX_KEY_LENGTH = 2 ** (8 * _KEY_LENGTH.size) - 1
+
+
+def is_envelope(value: bytes) -> bool:
+    return value[: len(MAGIC)] == MAGIC
+
+
+def encode(payloads: Mapping[Optional[str], bytes]) -> bytes:
+    """
+    Packs a mapping of subkeys to serialized payloads, where the ``None`` key
+    is the main payload.
+
+    >>> encode({None: b'{"stacktrace":{}}', "unprocessed": b"{}"})
+    """
+    compressor = zstandard.ZstdCompressor(level=COMPRESSION_LEVEL)
+
+    entries = []
+    frames = []
+    offset = 0
+    for key, payload in payloads.items():
+        # Those keys should be statically known identifiers in the app, such as
+        # "unprocessed". An empty key is reserved for the main payload.
+        encoded_key = b"" if key is None else key.encode("ascii")
+        if key is not None and not encoded_key:
+            raise ValueError("subkeys must not be empty")
+        if len(encoded_key) > MAX_KEY_LENGTH:
+            raise ValueError(f"subkeys must not be longer than {MAX_KEY_LENGTH} bytes: {key!r}")
+
+        frame = compressor.compress(payload)
+        entries.append(_KEY_LENGTH.pack(len(encoded_key)) + encoded_key)
+        entries.append(_FRAME.pack(offset, len(frame)))
+        frames.append(frame)
+        offset += len(frame)
+
+    return b"".join([_PREAMBLE.pack(MAGIC, VERSION, len(frames))] + entries + frames)
+
+
+def decode(value: bytes, subkey: Optional[str] = None) -> Optional[bytes]:
+    """
+    Returns the serialized payload stored under ``subkey`` (``None`` for the
+    main payload), or ``None`` if there is no such subkey. Only the frame of
+    that subkey is decompressed.
+    """
+    view = memoryview(value)
+    magic, version, count = _PREAMBLE.unpack_from(view)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"unsupported nodestore envelope version: {version}")
+
+    wanted = b"" if subkey is None else subkey.encode("ascii")
+    pos = _PREAMBLE.size
+    found = None
+    for _ in range(count):
+        (key_length,) = _KEY_LENGTH.unpack_from(view, pos)
+        pos += _KEY_LENGTH.size
+        key = view[pos : pos + key_length]
+        pos += key_length
+        frame = _FRAME.unpack_from(view, pos)
+        pos += _FRAME.size
+        if found is None and key == wanted:
+            found = frame
+
+    if found is None:
+        return None
+
+    # ``pos`` is now the end of the header
+    offset, length = found
+    start = pos + offset
+    return zstandard.decompress(view[start : start + length])
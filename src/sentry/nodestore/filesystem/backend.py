@@ -13,8 +13,9 @@ class FileSystemNodeStorage(NodeStorage):
     debugging and development!
     """
 
-    def __init__(self, path=None):
+    def __init__(self, path=None, encoding="json"):
         self.path: str = ""
+        self.encoding = encoding
 
         if not settings.DEBUG:
             raise ValueError("FileSystemNodeStorage should only be used in development!")
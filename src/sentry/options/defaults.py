@@ -145,6 +145,10 @@ register("beacon.anonymous", type=Bool, flags=FLAG_REQUIRED)
 # Filestore
 register("filestore.backend", default="filesystem", flags=FLAG_NOSTORE)
 register("filestore.options", default={"location": "/tmp/sentry-files"}, flags=FLAG_NOSTORE)
+# Number of blobs fetched ahead of the one being read by `File.getfile`
+register("filestore.readahead-blobs", default=0)
+# Upload chunks in `FileBlob.from_files` without per-blob locks, inserting rows in bulk
+register("filestore.bulk-blob-upload", default=False)
 
 # Symbol server
 register("symbolserver.enabled", default=False, flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK)
@@ -264,12 +268,24 @@ register("snuba.search.max-pre-snuba-candidates", default=5000)
 register("snuba.search.chunk-growth-rate", default=1.5)
 register("snuba.search.max-chunk-size", default=2000)
 register("snuba.search.max-total-chunk-time-seconds", default=30.0)
+# Split candidate queries with more group ids than this into concurrent queries (0 disables)
+register("snuba.search.candidate-chunk-size", default=0)
+# Query the next chunk while post-filtering the current one
+register("snuba.search.prefetch-chunks", type=Bool, default=False)
 register("snuba.search.hits-sample-size", default=100)
 register("snuba.track-outcomes-sample-rate", default=0.0)
+# Referrers whose queries always use the Snuba query cache
+register("snuba.query-cache.referrers", type=Sequence, default=(), flags=FLAG_ALLOW_EMPTY)
+# Referrers whose cached queries share entries across SENTRY_SNUBA_CACHE_WINDOW_SECONDS
+register("snuba.query-cache.window-referrers", type=Sequence, default=(), flags=FLAG_ALLOW_EMPTY)
 
 # The percentage of tagkeys that we want to cache. Set to 1.0 in order to cache everything, <=0.0 to stop caching
 register("snuba.tagstore.cache-tagkeys-rate", default=0.0, flags=FLAG_PRIORITIZE_DISK)
 
+# Data export
+# Number of concurrent Snuba queries of a streamed export (0 disables streaming)
+register("dataexport.stream-workers", default=0)
+
 # Kafka Publisher
 register("kafka-publisher.raw-event-sample-rate", default=0.0)
 register("kafka-publisher.max-event-size", default=100000)
@@ -373,6 +389,14 @@ register("store.reprocessing-force-disable", default=False)
 
 register("store.race-free-group-creation-force-disable", default=False)
 
+# Maximum number of error events of a project the ingest consumer hands to a
+# single save_event_batch task, at most MAX_SAVE_EVENT_BATCH_SIZE. 0 saves
+# every event in its own task.
+register("store.save-event-batch-size", default=0)
+
+# Number of time shards of the source group that unmerge queries concurrently
+register("unmerge.shards", default=0)
+
 
 # ## sentry.killswitches
 #
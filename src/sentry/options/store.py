@@ -3,19 +3,27 @@ from __future__ import annotations
 import abc
 import dataclasses
 import logging
+import os
+import threading
 from random import random
-from time import time
-from typing import Any
+from time import sleep, time
+from typing import Any, Mapping
+from uuid import uuid4
 
 from django.db.utils import OperationalError, ProgrammingError
 from django.utils import timezone
 from django.utils.functional import cached_property
 
 from sentry.services.hybrid_cloud import InterfaceWithLifecycle
+from sentry.utils import metrics
 
 CACHE_FETCH_ERR = "Unable to fetch option cache for %s"
 CACHE_UPDATE_ERR = "Unable to update option cache for %s"
 
+# Bumped in the network cache whenever an option is changed, so that processes
+# holding a snapshot of all options reload it.
+SNAPSHOT_VERSION_KEY = "o:snapshot-version"
+
 logger = logging.getLogger("sentry")
 
 
@@ -60,6 +68,10 @@ class AbstractOptionsStore(InterfaceWithLifecycle, abc.ABC):
     def maybe_clean_local_cache(self):
         pass
 
+    @abc.abstractmethod
+    def enable_snapshot(self, interval: int, max_age: int) -> None:
+        pass
+
 
 class OptionsStore(AbstractOptionsStore):
     """
@@ -78,6 +90,15 @@ class OptionsStore(AbstractOptionsStore):
         self.ttl = ttl
         self.flush_local_cache()
 
+        # See ``enable_snapshot``.
+        self.snapshot_interval = 0
+        self.snapshot_max_age = 0
+        self._snapshot: Mapping[str, Any] | None = None
+        self._snapshot_version = None
+        self._snapshot_loaded_at = 0.0
+        self._snapshot_started = False
+        self._snapshot_lock = threading.Lock()
+
     @cached_property
     def model(self):
         from sentry.models.options import Option
@@ -88,6 +109,11 @@ class OptionsStore(AbstractOptionsStore):
         """
         Fetches a value from the options store.
         """
+        if self.snapshot_interval:
+            snapshot = self.get_snapshot()
+            if snapshot is not None:
+                return snapshot.get(key.name)
+
         result = self.get_cache(key, silent=silent)
         if result is not None:
             return result
@@ -214,7 +240,8 @@ class OptionsStore(AbstractOptionsStore):
         assert self.cache is not None, "cache must be configured before mutating options"
 
         self.set_store(key, value)
-        return self.set_cache(key, value)
+        self._update_snapshot(key, value)
+        return self._set_cache(key, value) and self._bump_snapshot_version()
 
     def set_store(self, key, value):
         from sentry.db.models.query import create_or_update
@@ -224,6 +251,14 @@ class OptionsStore(AbstractOptionsStore):
         )
 
     def set_cache(self, key, value):
+        # With a snapshot, values that are not in the store (i.e. defaults)
+        # are not cached, computing them does not involve the network.
+        if self.snapshot_interval and self._snapshot is not None:
+            return None
+
+        return self._set_cache(key, value)
+
+    def _set_cache(self, key, value):
         if self.cache is None:
             return None
 
@@ -249,7 +284,8 @@ class OptionsStore(AbstractOptionsStore):
         assert self.cache is not None, "cache must be configured before mutating options"
 
         self.delete_store(key)
-        return self.delete_cache(key)
+        self._update_snapshot(key, None)
+        return self.delete_cache(key) and self._bump_snapshot_version()
 
     def delete_store(self, key):
         self.model.objects.filter(key=key.name).delete()
@@ -314,6 +350,102 @@ class OptionsStore(AbstractOptionsStore):
         if random() < 0.25:
             self.clean_local_cache()
 
+    def enable_snapshot(self, interval, max_age):
+        """
+        Serve all reads from an immutable snapshot of every option in the
+        store, loaded with a single query. A background thread checks the
+        version key in the network cache every ``interval`` seconds and
+        reloads the snapshot when an option was changed (by any process) or
+        when the snapshot is older than ``max_age`` seconds.
+
+        Until the first snapshot could be loaded, reads go through the
+        caches as usual.
+        """
+        self.snapshot_interval = interval
+        self.snapshot_max_age = max_age
+        # The refresh thread does not survive forking, so it is started lazily
+        # in every process.
+        os.register_at_fork(after_in_child=self._reset_snapshot)
+
+    def _reset_snapshot(self):
+        self._snapshot_started = False
+        self._snapshot_lock = threading.Lock()
+
+    def get_snapshot(self) -> Mapping[str, Any] | None:
+        if not self._snapshot_started:
+            with self._snapshot_lock:
+                if not self._snapshot_started:
+                    self._snapshot_started = True
+                    self.reload_snapshot()
+                    threading.Thread(
+                        target=self._run_snapshot_refresh, name="options-snapshot", daemon=True
+                    ).start()
+
+        return self._snapshot
+
+    def _run_snapshot_refresh(self):
+        while True:
+            sleep(self.snapshot_interval)
+            try:
+                self.maybe_reload_snapshot()
+            except Exception:
+                logger.warning("options.snapshot.refresh-failed", exc_info=True)
+
+    def maybe_reload_snapshot(self):
+        """
+        Reloads the snapshot if it is outdated, returning whether it did.
+        """
+        version = self.cache.get(SNAPSHOT_VERSION_KEY) if self.cache is not None else None
+        age = time() - self._snapshot_loaded_at
+        metrics.gauge("options.snapshot.age", age)
+
+        if (
+            self._snapshot is not None
+            and version == self._snapshot_version
+            and age < self.snapshot_max_age
+        ):
+            return False
+
+        self.reload_snapshot(version)
+        return True
+
+    def reload_snapshot(self, version=None):
+        if version is None and self.cache is not None:
+            try:
+                version = self.cache.get(SNAPSHOT_VERSION_KEY)
+            except Exception:
+                logger.warning(CACHE_FETCH_ERR, SNAPSHOT_VERSION_KEY, exc_info=True)
+
+        try:
+            snapshot = dict(self.model.objects.values_list("key", "value"))
+        except Exception:
+            # Keep serving the previous snapshot (if any).
+            logger.warning("options.snapshot.load-failed", exc_info=True)
+            return
+
+        self._snapshot = snapshot
+        self._snapshot_version = version
+        self._snapshot_loaded_at = time()
+
+    def _bump_snapshot_version(self):
+        try:
+            self.cache.set(SNAPSHOT_VERSION_KEY, uuid4().hex, None)
+            return True
+        except Exception:
+            logger.warning(CACHE_UPDATE_ERR, SNAPSHOT_VERSION_KEY, exc_info=True)
+            return False
+
+    def _update_snapshot(self, key, value):
+        # Make changes visible to this process right away. The snapshot is
+        # never mutated, since it is read without locking.
+        if self._snapshot is not None:
+            snapshot = dict(self._snapshot)
+            if value is None:
+                snapshot.pop(key.name, None)
+            else:
+                snapshot[key.name] = value
+            self._snapshot = snapshot
+
     def close(self) -> None:
         self.clean_local_cache()
 
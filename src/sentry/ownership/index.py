@@ -0,0 +1,165 @@
+"""
+Indexed evaluation of ownership rules.
+
+Testing every rule of a schema against an event calls into the glob matchers
+once per rule and frame, which gets slow for projects with thousands of
+CODEOWNERS lines. ``RuleIndex`` buckets the rules by a literal token of their
+pattern that any matching value has to contain, so only the rules whose token
+occurs in the event (plus the rules without such a token) need to be tested.
+"""
+from __future__ import annotations
+
+import hashlib
+import marshal
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Set
+
+from sentry.ownership.grammar import Matcher, Rule, load_schema
+from sentry.utils.event_frames import find_stack_frames
+from sentry.utils.safe import PathSearchable, get_path
+
+# Number of compiled schemas kept per process.
+INDEX_CACHE_SIZE = 100
+
+# Values are split into tokens at these characters. Patterns are split at the
+# same characters and at wildcards.
+_TOKEN_SEPARATORS = re.compile(r"[/\\.]")
+_PATTERN_DELIMITERS = re.compile(r"([/.*?])")
+_WILDCARDS = ("*", "?")
+
+# Glob syntax we do not derive tokens from. Rules with patterns containing any
+# of these are always tested.
+_UNINDEXED_PATTERN_CHARS = frozenset("[]{}\\")
+
+_index_cache: OrderedDict[str, RuleIndex] = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+
+def pattern_tokens(pattern: str) -> List[str]:
+    """Returns the lowercased tokens that every value matched by ``pattern``
+    contains as a whole token, for all matcher types.
+
+    A token is a literal run of the pattern delimited by ``/``, ``.`` or the
+    ends of the pattern on both sides. Runs next to a wildcard are skipped since
+    the wildcard may extend them. Separators may be collapsed (``**/``) or
+    normalized (``\\`` to ``/``) by the matchers, but a token is always
+    delimited by a separator or the end of the value in a match.
+    """
+    if not pattern.isascii() or any(c in _UNINDEXED_PATTERN_CHARS for c in pattern):
+        return []
+
+    # Even indices are the runs between delimiters, odd ones the delimiters.
+    parts = _PATTERN_DELIMITERS.split(pattern.lower())
+    tokens = []
+    for i in range(0, len(parts), 2):
+        if not parts[i]:
+            continue
+        if i > 0 and parts[i - 1] in _WILDCARDS:
+            continue
+        if i + 1 < len(parts) and parts[i + 1] in _WILDCARDS:
+            continue
+        tokens.append(parts[i])
+    return tokens
+
+
+def event_tokens(data: PathSearchable) -> Optional[Set[str]]:
+    """Returns the tokens of all values ownership matchers look at in ``data``,
+    or ``None`` if some value cannot be tokenized."""
+    # Values of frames and the URL are passed to the matchers as they are,
+    # user and tag matchers only look at strings.
+    values: List[Any] = []
+    strings: List[Any] = []
+
+    frames, keys = Matcher.munge_if_needed(data)
+    for frame in frames:
+        if isinstance(frame, Mapping):
+            values.extend(frame.get(key) for key in keys)
+    for frame in find_stack_frames(data):
+        if isinstance(frame, Mapping):
+            values.append(frame.get("module"))
+
+    if isinstance(data, Mapping):
+        values.append(get_path(data, "request", "url"))
+
+    for k, v in (get_path(data, "user", filter=True) or {}).items():
+        if k == "data":
+            strings.extend((v or {}).values())
+        else:
+            strings.append(v)
+    strings.extend(v for _, v in get_path(data, "tags", filter=True) or ())
+
+    tokens: Set[str] = set()
+    for value in values:
+        if not value:
+            continue
+        if not isinstance(value, str):
+            return None
+        tokens.update(_TOKEN_SEPARATORS.split(value.casefold()))
+    for value in strings:
+        if isinstance(value, str):
+            tokens.update(_TOKEN_SEPARATORS.split(value.casefold()))
+    return tokens
+
+
+class RuleIndex:
+    """The rules of an ownership schema, bucketed by pattern token.
+
+    ``matching_rules`` returns the same rules in the same order as testing
+    every rule of the schema.
+    """
+
+    def __init__(self, rules: Sequence[Rule]):
+        self.rules = rules
+        self._token_rules: Dict[str, List[int]] = {}
+        self._unindexed: List[int] = []
+
+        for idx, rule in enumerate(rules):
+            tokens = pattern_tokens(rule.matcher.pattern)
+            if tokens:
+                # The longest token is the most likely one to be selective.
+                self._token_rules.setdefault(max(tokens, key=len), []).append(idx)
+            else:
+                self._unindexed.append(idx)
+
+    def candidates(self, data: PathSearchable) -> Sequence[int]:
+        tokens = event_tokens(data)
+        if tokens is None:
+            return range(len(self.rules))
+
+        candidates = set(self._unindexed)
+        for token in tokens:
+            candidates.update(self._token_rules.get(token, ()))
+        return sorted(candidates)
+
+    def matching_rules(self, data: PathSearchable) -> List[Rule]:
+        rules = self.rules
+        return [rules[idx] for idx in self.candidates(data) if rules[idx].test(data)]
+
+
+def schema_fingerprint(schema: Mapping[str, Any]) -> str:
+    # Version 2 of the marshal format does not emit back-references, so equal
+    # schemas are always serialized to the same bytes.
+    return hashlib.md5(marshal.dumps(schema, 2)).hexdigest()
+
+
+def get_rule_index(schema: Mapping[str, Any]) -> RuleIndex:
+    """Returns the compiled ``RuleIndex`` of ``schema``.
+
+    Indices are cached per process by the content of the schema, so an
+    ownership change results in a new index without explicit invalidation.
+    """
+    key = schema_fingerprint(schema)
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            return index
+
+    index = RuleIndex(load_schema(schema))
+    with _index_cache_lock:
+        _index_cache[key] = index
+        while len(_index_cache) > INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
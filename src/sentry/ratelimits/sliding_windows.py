@@ -75,10 +75,11 @@ When using the quotas, the keys change as follows:
 
 """
 
+import threading
 from collections import defaultdict
 from dataclasses import dataclass
-from time import time
-from typing import Any, Iterator, MutableMapping, Optional, Sequence, Tuple
+from time import monotonic, time
+from typing import Any, Iterator, Mapping, MutableMapping, Optional, Sequence, Tuple
 
 from sentry.exceptions import InvalidConfiguration
 from sentry.utils import redis
@@ -274,9 +275,39 @@ class SlidingWindowRateLimiter(Service):
 
 
 class RedisSlidingWindowRateLimiter(SlidingWindowRateLimiter):
+    """
+    :param cluster: The name of the Redis cluster to use.
+    :param local_flush_interval: If set, enables local counters: granule
+        counts read from Redis are reused for this many seconds, and used
+        quota is accumulated in the process and written to Redis in one
+        pipeline once it is this many seconds old (or exceeds
+        ``local_error_budget``). This trades accuracy for Redis round trips:
+        on top of the usual inconsistencies, a process does not see quota used
+        by other processes within the interval, and other processes do not see
+        its unflushed quota.
+    :param local_error_budget: How much quota (summed over all keys) may be
+        used locally before it is flushed to Redis, regardless of
+        ``local_flush_interval``.
+    """
+
     def __init__(self, **options: Any) -> None:
         cluster_key = options.get("cluster", "default")
         self.client = redis.redis_clusters.get(cluster_key)
+        self.local_flush_interval = options.get("local_flush_interval", 0)
+        self.local_error_budget = options.get("local_error_budget", 0)
+
+        self._lock = threading.Lock()
+        # key -> (count read from Redis, monotonic time of the read), in the
+        # order of the reads
+        self._cached_counts: MutableMapping[str, Tuple[int, float]] = {}
+        # incremented on every flush, see ``_get_counts``
+        self._flushes = 0
+        # key -> quota used locally and not yet written to Redis
+        self._pending_incrs: MutableMapping[str, int] = defaultdict(int)
+        self._pending_ttls: MutableMapping[str, int] = {}
+        self._pending_total = 0
+        self._pending_since: Optional[float] = None
+
         super().__init__(**options)
 
     def validate(self) -> None:
@@ -315,7 +346,10 @@ class RedisSlidingWindowRateLimiter(SlidingWindowRateLimiter):
         else:
             timestamp = int(timestamp)
 
-        keys_to_fetch = set()
+        # The keys of every distinct window are only built (and summed up)
+        # once, since many requests can share a quota, e.g. global quotas using
+        # prefix_override.
+        window_keys: MutableMapping[Tuple[str, Quota], Sequence[str]] = {}
         for request in requests:
             # We could potentially run this check inside of __post__init__ of
             # RequestedQuota, but the list is actually mutable after
@@ -323,21 +357,17 @@ class RedisSlidingWindowRateLimiter(SlidingWindowRateLimiter):
             assert request.quotas
 
             for quota in request.quotas:
-                for granule in quota.iter_window(timestamp):
-                    keys_to_fetch.add(
+                window = (quota.prefix_override or request.prefix, quota)
+                if window not in window_keys:
+                    window_keys[window] = [
                         self._build_redis_key(request=request, quota=quota, granule=granule)
-                    )
+                        for granule in quota.iter_window(timestamp)
+                    ]
 
-        # Stabilize the iteration order of `keys_to_fetch` by converting it
-        # into a list, because the next line will iterate over keys_to_fetch
-        # twice.
-        #
-        # While CPython 3.8 does not change the iteration order of a set as
-        # long as it is not being modified
-        # (https://stackoverflow.com/a/3812600/1544347), there are no formal
-        # guarantees about it.
-        ordered_keys_to_fetch = list(keys_to_fetch)
-        redis_results = dict(zip(ordered_keys_to_fetch, self.client.mget(ordered_keys_to_fetch)))
+        counts = self._get_counts({key for keys in window_keys.values() for key in keys})
+        window_used = {
+            window: sum(counts[key] for key in keys) for window, keys in window_keys.items()
+        }
 
         results = []
 
@@ -366,15 +396,7 @@ class RedisSlidingWindowRateLimiter(SlidingWindowRateLimiter):
             # negative "grants" to zero.
             for quota in request.quotas:
                 used_quota = (
-                    sum(
-                        int(
-                            redis_results.get(
-                                self._build_redis_key(request=request, quota=quota, granule=granule)
-                            )
-                            or 0
-                        )
-                        for granule in quota.iter_window(timestamp)
-                    )
+                    window_used[(quota.prefix_override or request.prefix, quota)]
                     + quota_used_cache[id(quota)]
                 )
 
@@ -418,6 +440,113 @@ class RedisSlidingWindowRateLimiter(SlidingWindowRateLimiter):
                 keys_to_incr[key] += grant.granted
                 keys_ttl[key] = quota.window_seconds
 
+        if not self.local_flush_interval:
+            self._incr(keys_to_incr, keys_ttl)
+            return
+
+        with self._lock:
+            for key, value in keys_to_incr.items():
+                self._pending_incrs[key] += value
+                self._pending_ttls[key] = keys_ttl[key]
+                self._pending_total += value
+            if self._pending_since is None:
+                self._pending_since = monotonic()
+            self._maybe_flush()
+
+    def flush(self) -> None:
+        """
+        Writes all quota used locally to Redis. Only relevant with
+        ``local_flush_interval``.
+        """
+        with self._lock:
+            self._flush()
+
+    def _get_counts(self, keys: Sequence[str]) -> Mapping[str, int]:
+        # Stabilize the iteration order of the keys by converting them into
+        # a list, because they are iterated over twice.
+        keys = list(keys)
+
+        if not self.local_flush_interval:
+            return {key: int(value or 0) for key, value in zip(keys, self.client.mget(keys))}
+
+        with self._lock:
+            self._maybe_flush()
+
+            now = monotonic()
+            self._prune_cached_counts(now)
+            counts = {}
+            keys_to_fetch = []
+            for key in keys:
+                cached = self._cached_counts.get(key)
+                if cached is not None and now - cached[1] < self.local_flush_interval:
+                    counts[key] = cached[0]
+                else:
+                    keys_to_fetch.append(key)
+            flushes = self._flushes
+
+        # Redis is read without holding the lock, so that other threads are
+        # not blocked on the round trip.
+        fetched = self.client.mget(keys_to_fetch) if keys_to_fetch else []
+
+        with self._lock:
+            for key, value in zip(keys_to_fetch, fetched):
+                counts[key] = int(value or 0)
+                # If quota was flushed in the meantime, the value read may or
+                # may not include it, so it is not cached.
+                if flushes == self._flushes:
+                    self._cached_counts.pop(key, None)
+                    self._cached_counts[key] = (counts[key], now)
+
+            # Redis does not know about the quota used locally yet.
+            for key, value in self._pending_incrs.items():
+                if key in counts:
+                    counts[key] += value
+
+        return counts
+
+    def _maybe_flush(self) -> None:
+        if self._pending_since is None:
+            return
+
+        now = monotonic()
+        if (
+            self._pending_total > self.local_error_budget
+            or now - self._pending_since >= self.local_flush_interval
+        ):
+            self._flush()
+
+    def _prune_cached_counts(self, now: float) -> None:
+        # Counts are cached in the order they were read, so the expired ones
+        # are at the front.
+        expired = []
+        for key, (_, fetched_at) in self._cached_counts.items():
+            if now - fetched_at < self.local_flush_interval:
+                break
+            expired.append(key)
+
+        for key in expired:
+            del self._cached_counts[key]
+
+    def _flush(self) -> None:
+        if not self._pending_incrs:
+            return
+
+        self._incr(self._pending_incrs, self._pending_ttls)
+
+        # Cached counts were read before the flush, so they need to include
+        # the quota that has just been written.
+        for key, value in self._pending_incrs.items():
+            cached = self._cached_counts.get(key)
+            if cached is not None:
+                self._cached_counts[key] = (cached[0] + value, cached[1])
+
+        self._pending_incrs = defaultdict(int)
+        self._pending_ttls = {}
+        self._pending_total = 0
+        self._pending_since = None
+        self._flushes += 1
+
+    def _incr(self, keys_to_incr: Mapping[str, int], keys_ttl: Mapping[str, int]) -> None:
         with self.client.pipeline(transaction=False) as pipeline:
             for key, value in keys_to_incr.items():
                 pipeline.incrby(key, value)
@@ -1,4 +1,7 @@
 import logging
+import threading
+import time
+from collections import OrderedDict
 
 import zstandard
 
@@ -20,6 +23,15 @@ class RedisProjectConfigCache(ProjectConfigCache):
         read_cluster_key = options.get("read_cluster", cluster_key)
         self.cluster_read = redis.redis_clusters.get(read_cluster_key)
 
+        # Serialized configs can additionally be kept in a short-lived LRU in
+        # the local process, which takes load off Redis when the same relays
+        # ask for the same keys over and over. Writes from other processes are
+        # only picked up once the entry expires, so keep the TTL short.
+        self.local_cache_size = options.get("local_cache_size", 0)
+        self.local_cache_ttl = options.get("local_cache_ttl", 5)
+        self._local_cache = OrderedDict()
+        self._local_cache_lock = threading.Lock()
+
         super().__init__(**options)
 
     def validate(self):
@@ -42,8 +54,11 @@ class RedisProjectConfigCache(ProjectConfigCache):
             p.setex(self.__get_redis_key(public_key), REDIS_CACHE_TIMEOUT, compressed)
 
         p.execute()
+        self.__delete_local(configs.keys())
 
     def delete_many(self, public_keys):
+        self.__delete_local(public_keys)
+
         # Note: Those are multiple pipelines, one per cluster node
         with self.cluster.pipeline() as p:
             for public_key in public_keys:
@@ -54,13 +69,83 @@ class RedisProjectConfigCache(ProjectConfigCache):
             "relay.projectconfig_cache.write", amount=sum(return_values), tags={"action": "delete"}
         )
 
+    def __get_local(self, public_key):
+        if not self.local_cache_size:
+            return None
+
+        with self._local_cache_lock:
+            entry = self._local_cache.get(public_key)
+            if entry is not None:
+                expires, serialized = entry
+                if expires > time.monotonic():
+                    self._local_cache.move_to_end(public_key)
+                    return serialized
+                del self._local_cache[public_key]
+        return None
+
+    def __set_local(self, public_key, serialized):
+        if not self.local_cache_size:
+            return
+
+        with self._local_cache_lock:
+            self._local_cache[public_key] = (time.monotonic() + self.local_cache_ttl, serialized)
+            self._local_cache.move_to_end(public_key)
+            while len(self._local_cache) > self.local_cache_size:
+                self._local_cache.popitem(last=False)
+
+    def __delete_local(self, public_keys):
+        if not self.local_cache_size:
+            return
+
+        with self._local_cache_lock:
+            for public_key in public_keys:
+                self._local_cache.pop(public_key, None)
+
+    def __decode(self, public_key, rv):
+        try:
+            rv = zstandard.decompress(rv).decode()
+        except (TypeError, zstandard.ZstdError):
+            # assume raw json
+            pass
+        self.__set_local(public_key, rv)
+        return json.loads(rv)
+
     def get(self, public_key):
+        serialized = self.__get_local(public_key)
+        if serialized is not None:
+            metrics.incr("relay.projectconfig_cache.local", tags={"result": "hit"})
+            return json.loads(serialized)
+
         rv = self.cluster_read.get(self.__get_redis_key(public_key))
         if rv is not None:
-            try:
-                rv = zstandard.decompress(rv).decode()
-            except (TypeError, zstandard.ZstdError):
-                # assume raw json
-                pass
-            return json.loads(rv)
+            return self.__decode(public_key, rv)
         return None
+
+    def get_many(self, public_keys):
+        configs = {}
+        missing = []
+        for public_key in public_keys:
+            serialized = self.__get_local(public_key)
+            if serialized is not None:
+                configs[public_key] = json.loads(serialized)
+            else:
+                missing.append(public_key)
+
+        if self.local_cache_size:
+            metrics.incr(
+                "relay.projectconfig_cache.local",
+                amount=len(configs),
+                tags={"result": "hit"},
+            )
+
+        if missing:
+            # Note: Those are multiple pipelines, one per cluster node
+            with self.cluster_read.pipeline() as p:
+                for public_key in missing:
+                    p.get(self.__get_redis_key(public_key))
+                values = p.execute()
+
+            for public_key, rv in zip(missing, values):
+                configs[public_key] = self.__decode(public_key, rv) if rv is not None else None
+
+        return configs
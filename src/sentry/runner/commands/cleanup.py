@@ -1,10 +1,12 @@
 import os
 import time
+from collections import namedtuple
 from datetime import timedelta
 from uuid import uuid4
 
 import click
 from django.utils import timezone
+from django.utils.encoding import force_str
 
 from sentry.runner.decorators import log_options
 
@@ -34,6 +36,124 @@ _STOP_WORKER = "91650ec271ae4b3e8a67cdc909d80f8c"
 
 API_TOKEN_TTL_IN_DAYS = 30
 
+# Progress of interrupted key range deletions is kept this long
+KEY_RANGE_CHECKPOINT_TTL = 7 * 24 * 60 * 60
+
+# A range of primary keys `(start, end]` of `model` for a worker to delete, resuming
+# after `position`
+KeyRangeTask = namedtuple(
+    "KeyRangeTask",
+    [
+        "model",
+        "dtfield",
+        "days",
+        "project_id",
+        "start",
+        "end",
+        "position",
+        "batch_size",
+        "bulk",
+        "checkpoints",
+    ],
+)
+
+
+class KeyRangeCheckpoints:
+    """Positions reached in the key ranges of a model, stored in redis so that
+    an interrupted cleanup resumes where it stopped. The ranges are persisted
+    along with the positions to keep the partitioning stable until every range
+    is done.
+    """
+
+    def __init__(self, model, days, project_id):
+        self.key = "cleanup.key-ranges.{}.{}.{}".format(
+            model._meta.db_table, days, project_id or "*"
+        )
+
+    def _client(self):
+        from sentry.utils import redis
+
+        return redis.clusters.get("default").get_local_client_for_key(self.key)
+
+    def load(self):
+        """Returns a list of `(start, end, position)` of the persisted ranges."""
+        with self._client() as client:
+            checkpoints = client.hgetall(self.key)
+
+        ranges = []
+        for key_range, position in checkpoints.items():
+            start, end = map(int, force_str(key_range).split(":"))
+            ranges.append((start, end, int(position)))
+        return sorted(ranges)
+
+    def create(self, key_ranges):
+        with self._client() as client:
+            client.delete(self.key)
+            if key_ranges:
+                client.hmset(self.key, {f"{start}:{end}": start for start, end in key_ranges})
+                client.expire(self.key, KEY_RANGE_CHECKPOINT_TTL)
+
+    def save(self, start, end, position):
+        with self._client() as client:
+            client.hset(self.key, f"{start}:{end}", position)
+
+    def clear(self):
+        with self._client() as client:
+            client.delete(self.key)
+
+
+def delete_key_range(task, skip_models=()):
+    import logging
+
+    from sentry import deletions
+    from sentry.db.deletion import BulkDeleteQuery
+    from sentry.utils import metrics
+    from sentry.utils.imports import import_string
+
+    logger = logging.getLogger("sentry.cleanup")
+
+    model = import_string(task.model)
+    query = BulkDeleteQuery(
+        model=model, dtfield=task.dtfield, days=task.days, project_id=task.project_id
+    )
+
+    started = time.time()
+    rows = 0
+    if task.bulk:
+        for position, deleted in query.execute_key_range(task.position, task.end, task.batch_size):
+            rows += deleted
+            task.checkpoints.save(task.start, task.end, position)
+    else:
+        for position, chunk in query.iterator_key_range(task.position, task.end, task.batch_size):
+            if chunk:
+                deletion = deletions.get(
+                    model=model,
+                    query={"id__in": chunk},
+                    skip_models=skip_models,
+                    transaction_id=uuid4().hex,
+                )
+                while deletion.chunk():
+                    pass
+            rows += len(chunk)
+            task.checkpoints.save(task.start, task.end, position)
+
+    task.checkpoints.save(task.start, task.end, task.end)
+
+    duration = time.time() - started
+    metrics.incr("cleanup.key_range.rows", amount=rows, tags={"model": model.__name__})
+    metrics.timing("cleanup.key_range.duration", duration, tags={"model": model.__name__})
+    logger.info(
+        "cleanup.key_range.done",
+        extra={
+            "model": model.__name__,
+            "start": task.position,
+            "end": task.end,
+            "rows": rows,
+            "duration": duration,
+            "rows_per_second": rows / duration if duration else rows,
+        },
+    )
+
 
 def multiprocess_worker(task_queue):
     # Configure within each Process
@@ -73,6 +193,15 @@ def multiprocess_worker(task_queue):
                 similarity,
             ] + [b[0] for b in EXTRA_BULK_QUERY_DELETES]
 
+        if isinstance(j, KeyRangeTask):
+            try:
+                delete_key_range(j, skip_models=skip_models)
+            except Exception as e:
+                logger.exception(e)
+            finally:
+                task_queue.task_done()
+            continue
+
         model, chunk = j
         model = import_string(model)
 
@@ -115,8 +244,16 @@ def multiprocess_worker(task_queue):
     is_flag=True,
     help="Send the duration of this command to internal metrics.",
 )
+@click.option(
+    "--key-ranges",
+    type=int,
+    default=0,
+    show_default=True,
+    help="Split the primary keys of each model into this many ranges which are deleted by the "
+    "workers in keyset paginated batches. Interrupted runs resume from the last batch.",
+)
 @log_options()
-def cleanup(days, project, concurrency, silent, model, router, timed):
+def cleanup(days, project, concurrency, silent, model, router, timed, key_ranges):
     """Delete a portion of trailing data based on creation date.
 
     All data that is older than `--days` will be deleted.  The default for
@@ -129,6 +266,10 @@ def cleanup(days, project, concurrency, silent, model, router, timed):
         click.echo("Error: Minimum concurrency is 1", err=True)
         raise click.Abort()
 
+    if key_ranges < 0:
+        click.echo("Error: Number of key ranges cannot be negative", err=True)
+        raise click.Abort()
+
     os.environ["_SENTRY_CLEANUP"] = "1"
 
     # Make sure we fork off multiprocessing pool
@@ -173,6 +314,44 @@ def cleanup(days, project, concurrency, silent, model, router, timed):
                 return False
             return model.__name__.lower() not in model_list
 
+        def delete_by_key_ranges(model, dtfield, project_id, batch_size, bulk):
+            checkpoints = KeyRangeCheckpoints(model, days, project_id)
+            ranges = checkpoints.load()
+            if ranges:
+                if not silent:
+                    click.echo(f">> Resuming {len(ranges)} key ranges")
+            else:
+                query = BulkDeleteQuery(
+                    model=model, project_id=project_id, dtfield=dtfield, days=days
+                )
+                ranges = [(start, end, start) for start, end in query.get_key_ranges(key_ranges)]
+                checkpoints.create([(start, end) for start, end, _ in ranges])
+
+            imp = ".".join((model.__module__, model.__name__))
+            for start, end, position in ranges:
+                if position >= end:
+                    continue
+                task_queue.put(
+                    KeyRangeTask(
+                        model=imp,
+                        dtfield=dtfield,
+                        days=days,
+                        project_id=project_id,
+                        start=start,
+                        end=end,
+                        position=position,
+                        batch_size=batch_size,
+                        bulk=bulk,
+                        checkpoints=checkpoints,
+                    )
+                )
+
+            task_queue.join()
+
+            # Ranges of failed tasks are left unfinished for the next run.
+            if all(position >= end for _, end, position in checkpoints.load()):
+                checkpoints.clear()
+
         # Deletions that use `BulkDeleteQuery` (and don't need to worry about child relations)
         # (model, datetime_field, order_by)
         BULK_QUERY_DELETES = [
@@ -284,6 +463,8 @@ def cleanup(days, project, concurrency, silent, model, router, timed):
             if is_filtered(model):
                 if not silent:
                     click.echo(">> Skipping %s" % model.__name__)
+            elif key_ranges:
+                delete_by_key_ranges(model, dtfield, project_id, chunk_size, bulk=True)
             else:
                 BulkDeleteQuery(
                     model=model,
@@ -304,6 +485,8 @@ def cleanup(days, project, concurrency, silent, model, router, timed):
             if is_filtered(model):
                 if not silent:
                     click.echo(">> Skipping %s" % model.__name__)
+            elif key_ranges:
+                delete_by_key_ranges(model, dtfield, project_id, 100, bulk=False)
             else:
                 imp = ".".join((model.__module__, model.__name__))
 
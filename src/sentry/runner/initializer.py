@@ -541,6 +541,11 @@ def bind_cache_to_option_store() -> None:
 
     default_store.set_cache_impl(default_cache)
 
+    if settings.SENTRY_OPTIONS_SNAPSHOT_INTERVAL:
+        default_store.enable_snapshot(
+            settings.SENTRY_OPTIONS_SNAPSHOT_INTERVAL, settings.SENTRY_OPTIONS_SNAPSHOT_MAX_AGE
+        )
+
 
 def apply_legacy_settings(settings: Any) -> None:
     from sentry import options
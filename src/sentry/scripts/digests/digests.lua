@@ -84,6 +84,18 @@ local function variadic_argument_parser(argument_parser)
     end
 end
 
+local function counted_argument_parser(argument_parser)
+    return function (cursor, arguments)
+        local count = tonumber(arguments[cursor])
+        cursor = cursor + 1
+        local results = {}
+        for i = 1, count do
+            cursor, results[i] = argument_parser(cursor, arguments)
+        end
+        return cursor, results
+    end
+end
+
 local function multiple_argument_parser(...)
     local parsers = {...}
     return function (cursor, arguments)
@@ -338,6 +350,65 @@ local function close_digest(configuration, timeline_id, delay_minimum, record_id
     end
 end
 
+local function acquire_timeline_lock(configuration, timeline_id, lock)
+    local lock_key = lock.prefix .. configuration:get_timeline_key(timeline_id)
+    return redis.call('SET', lock_key, lock.value, 'EX', lock.duration, 'NX') ~= false
+end
+
+local function release_timeline_lock(configuration, timeline_id, lock)
+    -- Same semantics as the ``delete_lock`` script: only release the lock if
+    -- it is still held by us.
+    local lock_key = lock.prefix .. configuration:get_timeline_key(timeline_id)
+    if redis.call('GET', lock_key) == lock.value then
+        redis.call('DEL', lock_key)
+    end
+end
+
+local function digest_timelines(configuration, timeline_ids, timeline_capacity, lock)
+    -- Claims and opens every timeline that is in the ready state and not
+    -- currently locked, skipping the others.
+    local results = {}
+    local i = 0
+    for _, timeline_id in ipairs(timeline_ids) do
+        if acquire_timeline_lock(configuration, timeline_id, lock) then
+            if redis.call('ZSCORE', configuration:get_schedule_ready_key(), timeline_id) == false then
+                release_timeline_lock(configuration, timeline_id, lock)
+            else
+                i = i + 1
+                results[i] = {
+                    timeline_id,
+                    digest_timeline(configuration, timeline_id, timeline_capacity)
+                }
+            end
+        end
+    end
+    return results
+end
+
+local function close_digests(configuration, lock, digests)
+    -- Closes the digests whose timelines are still locked by us and returns
+    -- their timeline IDs. If the lock expired in the meantime, another worker
+    -- may already be digesting the timeline, so it is left alone.
+    local results = {}
+    local i = 0
+    for _, digest in ipairs(digests) do
+        local lock_key = lock.prefix .. configuration:get_timeline_key(digest.timeline_id)
+        if redis.call('GET', lock_key) == lock.value then
+            close_digest(configuration, digest.timeline_id, digest.delay_minimum, digest.record_ids)
+            redis.call('DEL', lock_key)
+            i = i + 1
+            results[i] = digest.timeline_id
+        end
+    end
+    return results
+end
+
+local function release_timelines(configuration, lock, timeline_ids)
+    for _, timeline_id in ipairs(timeline_ids) do
+        release_timeline_lock(configuration, timeline_id, lock)
+    end
+end
+
 local function delete_timeline(configuration, timeline_id)
     truncate_timeline(configuration, timeline_id, 0)
     truncate_digest(configuration, timeline_id, 0)
@@ -383,6 +454,12 @@ local configuration_argument_parser = object_argument_parser({
     return configuration
 end)
 
+local lock_argument_parser = object_argument_parser({
+    {"prefix", argument_parser()},
+    {"value", argument_parser()},
+    {"duration", argument_parser(tonumber)},
+})
+
 local commands = {
     SCHEDULE = function (cursor, arguments)
         local cursor, configuration, deadline = multiple_argument_parser(
@@ -448,6 +525,37 @@ local commands = {
         )(cursor, arguments)
         return close_digest(configuration, timeline_id, delay_minimum, record_ids)
     end,
+    DIGEST_OPEN_MANY = function (cursor, arguments)
+        local cursor, configuration, timeline_capacity, lock, timeline_ids = multiple_argument_parser(
+            configuration_argument_parser,
+            argument_parser(tonumber),
+            lock_argument_parser,
+            variadic_argument_parser(argument_parser())
+        )(cursor, arguments)
+        return digest_timelines(configuration, timeline_ids, timeline_capacity, lock)
+    end,
+    DIGEST_CLOSE_MANY = function (cursor, arguments)
+        local cursor, configuration, lock, digests = multiple_argument_parser(
+            configuration_argument_parser,
+            lock_argument_parser,
+            variadic_argument_parser(
+                object_argument_parser({
+                    {"timeline_id", argument_parser()},
+                    {"delay_minimum", argument_parser(tonumber)},
+                    {"record_ids", counted_argument_parser(argument_parser())},
+                })
+            )
+        )(cursor, arguments)
+        return close_digests(configuration, lock, digests)
+    end,
+    DIGEST_RELEASE_MANY = function (cursor, arguments)
+        local cursor, configuration, lock, timeline_ids = multiple_argument_parser(
+            configuration_argument_parser,
+            lock_argument_parser,
+            variadic_argument_parser(argument_parser())
+        )(cursor, arguments)
+        return release_timelines(configuration, lock, timeline_ids)
+    end,
 }
 
 local cursor, command = argument_parser(
@@ -457,16 +457,28 @@ local function set_frequencies(configuration, index, item, frequencies, expirati
 end
 
 local function merge_frequencies(configuration, index, source, destination)
+    --[[
+    Adds the frequencies of the source item to the destination item and
+    removes the source item. Returns the frequencies the source item had, so
+    callers do not need to read them a second time.
+    ]]--
     local source_key = get_frequency_key(configuration, index, source)
     local destination_key = get_frequency_key(configuration, index, destination)
 
+    local frequencies = {}
+    for i = 1, configuration.bands do
+        frequencies[i] = {}
+    end
+
     local response = redis.call('HGETALL', source_key)
     if #response == 0 then
-        return  -- nothing to do
+        return frequencies  -- nothing to do
     end
 
     for field, value in redis_hash_response_iterator(response) do
         redis.call('HINCRBY', destination_key, field, value)
+        local band, bucket = unpack_frequency_coordinate(field)
+        frequencies[band][bucket] = tonumber(value)
     end
 
     local source_ttl = redis.call('TTL', source_key)
@@ -474,6 +486,7 @@ local function merge_frequencies(configuration, index, source, destination)
     redis.call('EXPIRE', destination_key, math.max(source_ttl, redis.call('TTL', destination_key)))
 
     redis.call('DEL', source_key)
+    return frequencies
 end
 
 local function clear_frequencies(configuration, index, item)
@@ -481,6 +494,45 @@ local function clear_frequencies(configuration, index, item)
     redis.call('DEL', key)
 end
 
+local function delete_item(configuration, index, item)
+    local frequencies = get_frequencies(configuration, index, item)
+    clear_frequencies(configuration, index, item)
+
+    for band, buckets in ipairs(frequencies) do
+        for bucket in pairs(buckets) do
+            get_bucket_membership_set(configuration, index, band, bucket):remove(item)
+        end
+    end
+end
+
+local function export_item(configuration, index, item)
+    local frequency_key = get_frequency_key(configuration, index, item)
+    if redis.call('EXISTS', frequency_key) < 1 then
+        return cmsgpack.pack({})
+    end
+
+    local data = {}
+    local frequencies = get_frequencies(configuration, index, item)
+    for band = 1, #frequencies do
+        local result = {}
+        for bucket, count in pairs(frequencies[band]) do
+            result[bucket] = {
+                count,
+                get_bucket_membership_set(configuration, index, band, bucket):export(item)
+            }
+        end
+        data[band] = result
+    end
+
+    return cmsgpack.pack({
+        data,
+        configuration.timestamp + math.max(
+            redis.call('TTL', frequency_key),
+            0
+        )  -- the TTL should always exist, but this is just to be safe
+    })
+end
+
 local function is_empty(frequencies)
     for _ in pairs(frequencies[1]) do
         return false
@@ -688,8 +740,7 @@ local commands = {
         )(cursor, arguments)
 
         for _, source in ipairs(sources) do
-            local source_frequencies = get_frequencies(configuration, source.index, source.key)
-            merge_frequencies(configuration, source.index, source.key, destination_key)
+            local source_frequencies = merge_frequencies(configuration, source.index, source.key, destination_key)
 
             for band, buckets in ipairs(source_frequencies) do
                 for bucket in pairs(buckets) do
@@ -707,14 +758,7 @@ local commands = {
         )(cursor, arguments)
 
         for _, source in ipairs(sources) do
-            local frequencies = get_frequencies(configuration, source.index, source.key)
-            clear_frequencies(configuration, source.index, source.key)
-
-            for band, buckets in ipairs(frequencies) do
-                for bucket in pairs(buckets) do
-                    get_bucket_membership_set(configuration, source.index, band, bucket):remove(source.key)
-                end
-            end
+            delete_item(configuration, source.index, source.key)
         end
     end,
     IMPORT = function (configuration, cursor, arguments)
@@ -774,31 +818,28 @@ local commands = {
         return table_imap(
             entries,
             function (source)
-                local frequency_key = get_frequency_key(configuration, source.index, source.key)
-                if redis.call('EXISTS', frequency_key) < 1 then
-                    return cmsgpack.pack({})
-                end
-
-                local data = {}
-                local frequencies = get_frequencies(configuration, source.index, source.key)
-                for band = 1, #frequencies do
-                    local result = {}
-                    for bucket, count in pairs(frequencies[band]) do
-                        result[bucket] = {
-                            count,
-                            get_bucket_membership_set(configuration, source.index, band, bucket):export(source.key)
-                        }
-                    end
-                    data[band] = result
-                end
+                return export_item(configuration, source.index, source.key)
+            end
+        )
+    end,
+    EXTRACT = function (configuration, cursor, arguments)
+        --[[
+        Same as ``EXPORT`` followed by ``DELETE`` for the same entries, which
+        allows moving data to another scope with one call on each side.
+        ]]--
+        local cursor, entries = variadic_argument_parser(
+            object_argument_parser({
+                {'index', argument_parser(validate_value)},
+                {'key', argument_parser(validate_value)},
+            })
+        )(cursor, arguments)
 
-                return cmsgpack.pack({
-                    data,
-                    configuration.timestamp + math.max(
-                        redis.call('TTL', frequency_key),
-                        0
-                    )  -- the TTL should always exist, but this is just to be safe
-                })
+        return table_imap(
+            entries,
+            function (source)
+                local data = export_item(configuration, source.index, source.key)
+                delete_item(configuration, source.index, source.key)
+                return data
             end
         )
     end,
@@ -830,6 +871,46 @@ local commands = {
             end
         )
     end,
+    FLUSH = function (configuration, cursor, arguments)
+        --[[
+        Works like ``SCAN``, but deletes the matched keys right away instead of
+        returning them, so flushing an index does not need to transfer every
+        key to the client and back. Returns the next cursor for every entry.
+        ]]--
+        local cursor, entries = variadic_argument_parser(
+            object_argument_parser({
+                {'index', argument_parser(validate_value)},
+                {'cursor', argument_parser(validate_value)},
+                {'count', argument_parser(validate_integer)}
+            })
+        )(cursor, arguments)
+        return table_imap(
+            entries,
+            function (argument)
+                local response = redis.call(
+                    'SCAN',
+                    argument.cursor,
+                    'MATCH',
+                    string.format(
+                        '%s:*',
+                        get_key_prefix(
+                            configuration,
+                            argument.index
+                        )
+                    ),
+                    'COUNT',
+                    argument.count
+                )
+                local keys = response[2]
+                -- ``SCAN`` may return more keys than requested, delete them in
+                -- chunks to stay clear of the ``unpack`` stack limit.
+                for i = 1, #keys, 1000 do
+                    redis.call('DEL', unpack(table_slice(keys, i, math.min(i + 999, #keys))))
+                end
+                return response[1]
+            end
+        )
+    end,
 }
 
 local cursor, command, configuration = multiple_argument_parser(
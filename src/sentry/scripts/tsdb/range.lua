@@ -0,0 +1,52 @@
+--[[
+
+Counter Range Aggregation
+=========================
+
+Reads fields from the counter hashes used by ``RedisTSDB`` and sums them into
+result slots, so that a range of rollup buckets for many keys can be read (and
+optionally aggregated) with a single call per host rather than one ``HGET``
+per key and bucket.
+
+``KEYS`` are the counter hashes to read from, which must all be located on the
+host the script is executed on.
+
+The first item of ``ARGV`` is the number of result slots. It is followed by,
+for each key in ``KEYS``, the number of fields to read from that hash and a
+``(field, slot)`` pair for each of them. Slots are 1-indexed.
+
+The return value is a list containing the sum of the fields for every slot.
+Missing fields count as zero.
+
+]]--
+
+local results = {}
+for slot = 1, tonumber(ARGV[1]) do
+    results[slot] = 0
+end
+
+local cursor = 2
+for _, key in ipairs(KEYS) do
+    local count = tonumber(ARGV[cursor])
+    cursor = cursor + 1
+
+    if count > 0 then
+        local fields = {}
+        local slots = {}
+        for i = 1, count do
+            fields[i] = ARGV[cursor]
+            slots[i] = tonumber(ARGV[cursor + 1])
+            cursor = cursor + 2
+        end
+
+        local values = redis.call('HMGET', key, unpack(fields))
+        for i = 1, count do
+            local value = values[i]
+            if value then
+                results[slots[i]] = results[slots[i]] + tonumber(value)
+            end
+        end
+    end
+end
+
+return results
@@ -4,10 +4,11 @@ import functools
 import logging
 import time
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import replace
 from datetime import datetime, timedelta
 from hashlib import md5
-from typing import Any, List, Mapping, Optional, Sequence, Set, Tuple, cast
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Set, Tuple, cast
 
 import sentry_sdk
 from django.db.models import Q
@@ -50,8 +51,12 @@ from sentry.search.events.filter import convert_search_filter_to_snuba_query, fo
 from sentry.search.utils import validate_cdc_search_filters
 from sentry.utils import json, metrics, snuba
 from sentry.utils.cursors import Cursor, CursorResult
+from sentry.utils.iterators import chunked
 from sentry.utils.snuba import SnubaQueryParams, aliased_query_params, bulk_raw_query
 
+# Runs the Snuba query of the next chunk while the current one is post-filtered.
+_prefetch_thread_pool = ThreadPoolExecutor(max_workers=10)
+
 
 def get_search_filter(
     search_filters: Optional[Sequence[SearchFilter]], name: str, operator: str
@@ -225,7 +230,41 @@ class AbstractQueryExecutor(metaclass=ABCMeta):
         cursor: Optional[Cursor],
         get_sample: bool,
     ) -> SnubaQueryParams:
+        return self._prepare_params_for_category_chunks(
+            group_category,
+            query_partial,
+            organization_id,
+            project_ids,
+            environments,
+            [group_ids],
+            filters,
+            search_filters,
+            sort_field,
+            start,
+            end,
+            cursor,
+            get_sample,
+        )[0]
 
+    def _prepare_params_for_category_chunks(
+        self,
+        group_category: int,
+        query_partial: IntermediateSearchQueryPartial,
+        organization_id: int,
+        project_ids: Sequence[int],
+        environments: Optional[Sequence[str]],
+        group_id_chunks: Sequence[Optional[Sequence[int]]],
+        filters: Mapping[str, Sequence[int]],
+        search_filters: Sequence[SearchFilter],
+        sort_field: str,
+        start: datetime,
+        end: datetime,
+        cursor: Optional[Cursor],
+        get_sample: bool,
+    ) -> List[SnubaQueryParams]:
+        """Same as ``_prepare_params_for_category``, but returns the params of
+        one query per chunk of group ids. The search filters are only converted
+        once for all chunks."""
         if group_category in SEARCH_FILTER_UPDATERS:
             # remove filters not relevant to the group_category
             search_filters = SEARCH_FILTER_UPDATERS[group_category](search_filters)
@@ -272,17 +311,20 @@ class AbstractQueryExecutor(metaclass=ABCMeta):
         )
 
         strategy = SEARCH_STRATEGIES.get(group_category, _query_params_for_generic)
-        return strategy(
-            pinned_query_partial,
-            selected_columns,
-            aggregations,
-            organization_id,
-            project_ids,
-            environments,
-            group_ids,
-            filters,
-            conditions,
-        )
+        return [
+            strategy(
+                pinned_query_partial,
+                selected_columns,
+                aggregations,
+                organization_id,
+                project_ids,
+                environments,
+                group_ids,
+                filters,
+                conditions,
+            )
+            for group_ids in group_id_chunks
+        ]
 
     def snuba_search(
         self,
@@ -306,6 +348,41 @@ class AbstractQueryExecutor(metaclass=ABCMeta):
             * a sorted list of (group_id, group_score) tuples sorted descending by score,
             * the count of total results (rows) available for this query.
         """
+        query_params, referrer = self._prepare_snuba_search(
+            start=start,
+            end=end,
+            project_ids=project_ids,
+            environment_ids=environment_ids,
+            sort_field=sort_field,
+            organization=organization,
+            cursor=cursor,
+            group_ids=group_ids,
+            limit=limit,
+            offset=offset,
+            get_sample=get_sample,
+            search_filters=search_filters,
+            referrer=referrer,
+        )
+        return self._execute_snuba_search(query_params, referrer, sort_field, get_sample)
+
+    def _prepare_snuba_search(
+        self,
+        start: datetime,
+        end: datetime,
+        project_ids: Sequence[int],
+        environment_ids: Optional[Sequence[int]],
+        sort_field: str,
+        organization: Organization,
+        cursor: Optional[Cursor] = None,
+        group_ids: Optional[Sequence[int]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        get_sample: bool = False,
+        search_filters: Optional[Sequence[SearchFilter]] = None,
+        referrer: Optional[str] = None,
+    ) -> Tuple[List[SnubaQueryParams], str]:
+        """Builds the Snuba queries of ``snuba_search``. This may need to
+        access the database, unlike ``_execute_snuba_search``."""
         filters = {"project_id": project_ids}
 
         environments = None
@@ -356,14 +433,23 @@ class AbstractQueryExecutor(metaclass=ABCMeta):
         if not features.has("organizations:performance-issues-search", organization):
             group_categories.discard(GroupCategory.PERFORMANCE.value)
 
+        # Scores are computed per group, so a long list of candidates can be
+        # split into chunks that are scored by concurrent queries and merged.
+        group_id_chunks: List[Optional[Sequence[int]]] = [group_ids]
+        candidate_chunk_size = options.get("snuba.search.candidate-chunk-size")
+        if group_ids and candidate_chunk_size and len(group_ids) > candidate_chunk_size:
+            group_id_chunks = list(chunked(group_ids, candidate_chunk_size))
+
         query_params_for_categories = [
-            self._prepare_params_for_category(
+            query_params
+            for gc in group_categories
+            for query_params in self._prepare_params_for_category_chunks(
                 gc,
                 query_partial,
                 organization.id,
                 project_ids,
                 environments,
-                group_ids,
+                group_id_chunks,
                 filters,
                 snuba_search_filters,
                 sort_field,
@@ -372,13 +458,17 @@ class AbstractQueryExecutor(metaclass=ABCMeta):
                 cursor,
                 get_sample,
             )
-            for gc in group_categories
-        ]
-
-        query_params_for_categories = [
-            query_params for query_params in query_params_for_categories if query_params is not None
+            if query_params is not None
         ]
+        return query_params_for_categories, referrer
 
+    def _execute_snuba_search(
+        self,
+        query_params_for_categories: Sequence[SnubaQueryParams],
+        referrer: str,
+        sort_field: str,
+        get_sample: bool,
+    ) -> Tuple[List[Tuple[int, Any]], int]:
         bulk_query_results = bulk_raw_query(query_params_for_categories, referrer=referrer)
 
         rows: list[MergeableRow] = []
@@ -617,6 +707,23 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
         time_start = time.time()
         more_results = False
 
+        # When post-filtering, the Snuba query of the next chunk can be sent
+        # while the current chunk is filtered in Postgres.
+        prefetch_chunks = not group_ids and options.get("snuba.search.prefetch-chunks")
+        prefetched: Optional[Future[Tuple[List[Tuple[int, Any]], int]]] = None
+        snuba_search_kwargs: Dict[str, Any] = dict(
+            start=start,
+            end=end,
+            project_ids=[p.id for p in projects],
+            environment_ids=environments and [environment.id for environment in environments],
+            organization=projects[0].organization,
+            sort_field=sort_field,
+            cursor=cursor,
+            group_ids=group_ids,
+            search_filters=search_filters,
+            referrer=referrer,
+        )
+
         # Do smaller searches in chunks until we have enough results
         # to answer the query (or hit the end of possible results). We do
         # this because a common case for search is to return 100 groups
@@ -625,6 +732,7 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
         # when typically the first N results will do.
         while (time.time() - time_start) < max_time:
             num_chunks += 1
+            chunk_start = time.time()
 
             # grow the chunk size on each iteration to account for huge projects
             # and weird queries, up to a max size
@@ -633,20 +741,13 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             chunk_limit = max(chunk_limit, len(group_ids))
 
             # {group_id: group_score, ...}
-            snuba_groups, total = self.snuba_search(
-                start=start,
-                end=end,
-                project_ids=[p.id for p in projects],
-                environment_ids=environments and [environment.id for environment in environments],
-                organization=projects[0].organization,
-                sort_field=sort_field,
-                cursor=cursor,
-                group_ids=group_ids,
-                limit=chunk_limit,
-                offset=offset,
-                search_filters=search_filters,
-                referrer=referrer,
-            )
+            if prefetched is not None:
+                snuba_groups, total = prefetched.result()
+                prefetched = None
+            else:
+                snuba_groups, total = self.snuba_search(
+                    limit=chunk_limit, offset=offset, **snuba_search_kwargs
+                )
             metrics.timing("snuba.search.num_snuba_results", len(snuba_groups))
             count = len(snuba_groups)
             more_results = count >= limit and (offset + limit) < total
@@ -665,6 +766,20 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
                 if count_hits and hits is None:
                     hits = len(snuba_groups)
             else:
+                # Only prefetch if the next chunk can be expected to finish
+                # within the time budget, assuming it takes as long as this one.
+                now = time.time()
+                if (
+                    prefetch_chunks
+                    and more_results
+                    and (now - time_start) + (now - chunk_start) < max_time
+                ):
+                    prefetched = self._prefetch_snuba_search(
+                        limit=min(int(chunk_limit * chunk_growth), max_chunk_size),
+                        offset=offset,
+                        **snuba_search_kwargs,
+                    )
+
                 # pre-filtered candidates were *not* passed down to Snuba,
                 # so we need to do post-filtering to verify Sentry DB predicates
                 filtered_group_ids = group_queryset.filter(
@@ -697,6 +812,11 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             if group_ids or len(paginator_results.results) >= limit or not more_results:
                 break
 
+        if prefetched is not None:
+            # The results were sufficient without the prefetched chunk.
+            prefetched.cancel()
+            metrics.incr("snuba.search.prefetch_discarded", skip_internal=False)
+
         # HACK: We're using the SequencePaginator to mask the complexities of going
         # back and forth between two databases. This causes a problem with pagination
         # because we're 'lying' to the SequencePaginator (it thinks it has the entire
@@ -812,6 +932,20 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
                 return hits
         return None
 
+    def _prefetch_snuba_search(
+        self, sort_field: str, **kwargs: Any
+    ) -> Future[Tuple[List[Tuple[int, Any]], int]]:
+        """Starts ``snuba_search`` in the background. The queries are built
+        in the calling thread since that may need the database."""
+        query_params, referrer = self._prepare_snuba_search(sort_field=sort_field, **kwargs)
+        hub = sentry_sdk.Hub(sentry_sdk.Hub.current)
+
+        def execute() -> Tuple[List[Tuple[int, Any]], int]:
+            with hub:
+                return self._execute_snuba_search(query_params, referrer, sort_field, False)
+
+        return _prefetch_thread_pool.submit(execute)
+
 
 class InvalidQueryForExecutor(Exception):
     pass
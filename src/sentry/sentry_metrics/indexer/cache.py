@@ -1,6 +1,9 @@
 import logging
 import random
-from typing import Mapping, MutableMapping, Optional, Sequence, Set
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Mapping, MutableMapping, Optional, Sequence, Set, Tuple
 
 from django.conf import settings
 from django.core.cache import caches
@@ -21,13 +24,76 @@ logger = logging.getLogger(__name__)
 _INDEXER_CACHE_METRIC = "sentry_metrics.indexer.memcache"
 # only used to compare to the older version of the PGIndexer
 _INDEXER_CACHE_FETCH_METRIC = "sentry_metrics.indexer.memcache.fetch"
+_INDEXER_LOCAL_CACHE_METRIC = "sentry_metrics.indexer.local_cache"
+
+
+class LocalCache:
+    """
+    A bounded LRU mapping with per-entry expiry, kept in process memory. It is
+    shared by everything in the process that uses the same
+    ``StringIndexerCache``.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.__data: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    def get_many(self, keys: Iterable[str]) -> MutableMapping[str, Any]:
+        now = time.monotonic()
+        results = {}
+        with self.__lock:
+            for key in keys:
+                entry = self.__data.get(key)
+                if entry is None:
+                    continue
+                value, expires_at = entry
+                if expires_at <= now:
+                    del self.__data[key]
+                    continue
+                self.__data.move_to_end(key)
+                results[key] = value
+        return results
+
+    def set_many(self, key_values: Mapping[str, Any], timeout: int) -> None:
+        expires_at = time.monotonic() + timeout
+        with self.__lock:
+            for key, value in key_values.items():
+                self.__data[key] = (value, expires_at)
+                self.__data.move_to_end(key)
+            while len(self.__data) > self.max_size:
+                self.__data.popitem(last=False)
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        with self.__lock:
+            for key in keys:
+                self.__data.pop(key, None)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__data.clear()
 
 
 class StringIndexerCache:
-    def __init__(self, cache_name: str, partition_key: str):
+    """
+    Caches the results of the indexer in Django's cache (Redis in production).
+
+    If ``local_cache_size`` is set, up to that many entries are additionally
+    kept in a ``LocalCache`` in front of it, since a small set of strings
+    (metric names, common tag keys and values) makes up most lookups. Local
+    entries expire with the same randomized TTL as the ones in the shared
+    cache. The local tier also caches reverse lookups (see
+    ``get_reverse``).
+    """
+
+    def __init__(self, cache_name: str, partition_key: str, local_cache_size: int = 0):
         self.version = 1
         self.cache = caches[cache_name]
         self.partition_key = partition_key
+        self.local_cache = LocalCache(local_cache_size) if local_cache_size else None
 
     @property
     def randomized_ttl(self) -> int:
@@ -59,42 +125,101 @@ class StringIndexerCache:
 
         return formatted
 
-    def get(self, key: str, cache_namespace: str) -> int:
-        result: int = self.cache.get(
-            self.make_cache_key(key, cache_namespace), version=self.version
+    def make_reverse_cache_key(self, org_id: int, id: int, cache_namespace: str) -> str:
+        return f"indexer:{self.partition_key}:org:id:{cache_namespace}:{org_id}:{id}"
+
+    def _get_many_cache_keys(self, cache_keys: Sequence[str]) -> Mapping[str, Optional[int]]:
+        if self.local_cache is None:
+            results: Mapping[str, Optional[int]] = self.cache.get_many(
+                cache_keys, version=self.version
+            )
+            return results
+
+        local_results = self.local_cache.get_many(cache_keys)
+        metrics.incr(
+            _INDEXER_LOCAL_CACHE_METRIC,
+            tags={"cache_hit": "true", "caller": "forward"},
+            amount=len(local_results),
         )
-        return result
+        metrics.incr(
+            _INDEXER_LOCAL_CACHE_METRIC,
+            tags={"cache_hit": "false", "caller": "forward"},
+            amount=len(cache_keys) - len(local_results),
+        )
+        if len(local_results) == len(cache_keys):
+            return local_results
 
-    def set(self, key: str, value: int, cache_namespace: str) -> None:
-        self.cache.set(
-            key=self.make_cache_key(key, cache_namespace),
-            value=value,
-            timeout=self.randomized_ttl,
-            version=self.version,
+        remote_results = self.cache.get_many(
+            [key for key in cache_keys if key not in local_results], version=self.version
         )
+        # The remaining TTL of the remote entries is unknown, so the local
+        # ones get a new randomized TTL, just like on a write.
+        self.local_cache.set_many(remote_results, timeout=self.randomized_ttl)
+        local_results.update(remote_results)
+        return local_results
+
+    def _set_many_cache_keys(self, cache_key_values: Mapping[str, int]) -> None:
+        timeout = self.randomized_ttl
+        self.cache.set_many(cache_key_values, timeout=timeout, version=self.version)
+        if self.local_cache is not None:
+            self.local_cache.set_many(cache_key_values, timeout=timeout)
+
+    def _delete_many_cache_keys(self, cache_keys: Sequence[str]) -> None:
+        self.cache.delete_many(cache_keys, version=self.version)
+        if self.local_cache is not None:
+            self.local_cache.delete_many(cache_keys)
+
+    def get(self, key: str, cache_namespace: str) -> int:
+        cache_key = self.make_cache_key(key, cache_namespace)
+        if self.local_cache is None:
+            result: int = self.cache.get(cache_key, version=self.version)
+            return result
+        return self._get_many_cache_keys([cache_key]).get(cache_key)  # type: ignore
+
+    def set(self, key: str, value: int, cache_namespace: str) -> None:
+        self._set_many_cache_keys({self.make_cache_key(key, cache_namespace): value})
 
     def get_many(
         self, keys: Sequence[str], cache_namespace: str
     ) -> MutableMapping[str, Optional[int]]:
-        cache_keys = {self.make_cache_key(key, cache_namespace): key for key in keys}
-        results: Mapping[str, Optional[int]] = self.cache.get_many(
-            cache_keys.keys(), version=self.version
-        )
+        cache_keys = [self.make_cache_key(key, cache_namespace) for key in keys]
+        results = self._get_many_cache_keys(cache_keys)
         return self._format_results(keys, results, cache_namespace)
 
     def set_many(self, key_values: Mapping[str, int], cache_namespace: str) -> None:
         cache_key_values = {
             self.make_cache_key(k, cache_namespace): v for k, v in key_values.items()
         }
-        self.cache.set_many(cache_key_values, timeout=self.randomized_ttl, version=self.version)
+        self._set_many_cache_keys(cache_key_values)
 
     def delete(self, key: str, cache_namespace: str) -> None:
-        cache_key = self.make_cache_key(key, cache_namespace)
-        self.cache.delete(cache_key, version=self.version)
+        self._delete_many_cache_keys([self.make_cache_key(key, cache_namespace)])
 
     def delete_many(self, keys: Sequence[str], cache_namespace: str) -> None:
-        cache_keys = [self.make_cache_key(key, cache_namespace) for key in keys]
-        self.cache.delete_many(cache_keys, version=self.version)
+        self._delete_many_cache_keys([self.make_cache_key(key, cache_namespace) for key in keys])
+
+    def get_reverse(self, org_id: int, id: int, cache_namespace: str) -> Optional[str]:
+        """
+        Returns the string for an id from the local tier. Reverse lookups are
+        not stored in the shared cache.
+        """
+        if self.local_cache is None:
+            return None
+
+        cache_key = self.make_reverse_cache_key(org_id, id, cache_namespace)
+        result: Optional[str] = self.local_cache.get_many([cache_key]).get(cache_key)
+        metrics.incr(
+            _INDEXER_LOCAL_CACHE_METRIC,
+            tags={"cache_hit": "true" if result is not None else "false", "caller": "reverse"},
+        )
+        return result
+
+    def set_reverse(self, org_id: int, id: int, value: str, cache_namespace: str) -> None:
+        if self.local_cache is not None:
+            self.local_cache.set_many(
+                {self.make_reverse_cache_key(org_id, id, cache_namespace): value},
+                timeout=self.randomized_ttl,
+            )
 
 
 class CachingIndexer(StringIndexer):
@@ -166,4 +291,12 @@ class CachingIndexer(StringIndexer):
         return id
 
     def reverse_resolve(self, use_case_id: UseCaseKey, org_id: int, id: int) -> Optional[str]:
-        return self.indexer.reverse_resolve(use_case_id, org_id, id)
+        result = self.cache.get_reverse(org_id, id, use_case_id.value)
+        if result is not None:
+            return result
+
+        result = self.indexer.reverse_resolve(use_case_id, org_id, id)
+        if result is not None:
+            self.cache.set_reverse(org_id, id, result, use_case_id.value)
+
+        return result
@@ -31,7 +31,7 @@ class AbstractIndexBackend(metaclass=ABCMeta):
         pass
 
     @abstractmethod
-    def export(self, scope, items, timestamp=None):
+    def export(self, scope, items, timestamp=None, delete=False):
         pass
 
     @abstractmethod
@@ -25,7 +25,7 @@ class DummyIndexBackend(AbstractIndexBackend):
     def flush(self, scope, indices, batch=1000, timestamp=None):
         pass
 
-    def export(self, scope, items, timestamp=None):
+    def export(self, scope, items, timestamp=None, delete=False):
         return {}
 
     def import_(self, scope, items, timestamp=None):
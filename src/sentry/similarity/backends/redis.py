@@ -37,7 +37,7 @@ class RedisScriptMinHashIndexBackend(AbstractIndexBackend):
 
         arguments = []
         for bucket in band(self.bands, self.signature_builder(features)):
-            arguments.extend([1, ",".join(str(b) for b in bucket), 1])
+            arguments.extend([1, ",".join(map(str, bucket)), 1])
         return arguments
 
     def __index(self, scope, args):
@@ -216,16 +216,40 @@ class RedisScriptMinHashIndexBackend(AbstractIndexBackend):
                 yield idx, chunk
 
     def flush(self, scope, indices, batch=1000, timestamp=None):
-        for index, chunk in self.scan(scope, indices, batch, timestamp):
-            if chunk:
-                self.cluster.delete(*chunk)
+        if timestamp is None:
+            timestamp = int(time.time())
+
+        arguments = [
+            "FLUSH",
+            timestamp,
+            self.namespace,
+            self.bands,
+            self.interval,
+            self.retention,
+            self.candidate_set_limit,
+            scope,
+        ]
+
+        # Keys are deleted by the script as they are scanned, so every batch
+        # only takes one round trip for all indices.
+        cursors = {idx: 0 for idx in indices}
+        while cursors:
+            requests = [[idx, cursor, batch] for idx, cursor in cursors.items()]
+            responses = self.__index(scope, arguments + flatten(requests))
+
+            for (idx, _, _), cursor in zip(requests, responses):
+                cursor = int(cursor)
+                if cursor == 0:
+                    del cursors[idx]
+                else:
+                    cursors[idx] = cursor
 
-    def export(self, scope, items, timestamp=None):
+    def export(self, scope, items, timestamp=None, delete=False):
         if timestamp is None:
             timestamp = int(time.time())
 
         arguments = [
-            "EXPORT",
+            "EXTRACT" if delete else "EXPORT",
             timestamp,
             self.namespace,
             self.bands,
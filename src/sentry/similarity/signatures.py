@@ -1,13 +1,28 @@
 import mmh3
 
+# Upper bound of distinct features whose hashes are memoized per
+# ``MinHashSignatureBuilder`` instance.
+DEFAULT_CACHE_SIZE = 50000
+
 
 class MinHashSignatureBuilder:
-    def __init__(self, columns, rows):
+    def __init__(self, columns, rows, cache_size=DEFAULT_CACHE_SIZE):
         self.columns = columns
         self.rows = rows
+        self.cache_size = cache_size
+        # Features (encoded frames, shingles) repeat a lot between events, so
+        # the hashes of every feature for all columns are kept around. The
+        # signature is then the column-wise minimum of those rows.
+        self.__cache = {}
+
+    def get_hashes(self, feature):
+        hashes = self.__cache.get(feature)
+        if hashes is None:
+            hashes = tuple(mmh3.hash(feature, column) % self.rows for column in range(self.columns))
+            if len(self.__cache) >= self.cache_size:
+                self.__cache.clear()
+            self.__cache[feature] = hashes
+        return hashes
 
     def __call__(self, features):
-        return [
-            min(mmh3.hash(feature, column) % self.rows for feature in features)
-            for column in range(self.columns)
-        ]
+        return list(map(min, zip(*map(self.get_hashes, set(features)))))
@@ -1,12 +1,15 @@
 import logging
 import time
 
+from django.conf import settings
+
 from sentry.digests import get_option_key
 from sentry.digests.backends.base import InvalidState
-from sentry.digests.notifications import build_digest, split_key
+from sentry.digests.notifications import build_digest, fetch_state_many, split_key, split_keys
 from sentry.models import Project, ProjectOption
 from sentry.tasks.base import instrumented_task
-from sentry.utils import snuba
+from sentry.utils import metrics, snuba
+from sentry.utils.iterators import chunked
 
 logger = logging.getLogger(__name__)
 
@@ -28,14 +31,21 @@ def schedule_digests():
     timeout = 300
     digests.maintenance(deadline - timeout)
 
-    for entry in digests.schedule(deadline):
-        deliver_digest.delay(entry.key, entry.timestamp)
+    batch_size = settings.SENTRY_DIGESTS_DELIVERY_BATCH_SIZE
+    if batch_size <= 0:
+        for entry in digests.schedule(deadline):
+            deliver_digest.delay(entry.key, entry.timestamp)
+        return
+
+    # ``schedule`` yields the entries of one host after another, so most
+    # batches only contain timelines of a single host.
+    for entries in chunked(digests.schedule(deadline), batch_size):
+        deliver_digests.delay([entry.key for entry in entries])
 
 
 @instrumented_task(name="sentry.tasks.digests.deliver_digest", queue="digests.delivery")
 def deliver_digest(key, schedule_timestamp=None):
     from sentry import digests
-    from sentry.mail import mail_adapter
 
     try:
         project, target_type, target_identifier, fallthrough_choice = split_key(key)
@@ -56,22 +66,78 @@ def deliver_digest(key, schedule_timestamp=None):
             logger.info(f"Skipped digest delivery: {error}", exc_info=True)
             return
 
-        if digest:
-            mail_adapter.notify_digest(
-                project,
-                digest,
-                target_type,
-                target_identifier,
-                fallthrough_choice=fallthrough_choice,
-            )
-        else:
-            logger.info(
-                "Skipped digest delivery due to empty digest",
-                extra={
-                    "project": project.id,
-                    "target_type": target_type.value,
-                    "target_identifier": target_identifier,
-                    "build_digest_logs": logs,
-                    "fallthrough_choice": fallthrough_choice.value if fallthrough_choice else None,
-                },
+        _deliver(project, digest, logs, target_type, target_identifier, fallthrough_choice)
+
+
+@instrumented_task(name="sentry.tasks.digests.deliver_digests", queue="digests.delivery")
+def deliver_digests(keys):
+    """
+    Delivers the digests of many timelines. Timelines are claimed with one
+    backend call per host and their state is fetched in bulk, which is
+    considerably cheaper than one ``deliver_digest`` task per timeline when
+    many timelines become ready at the same time.
+    """
+    from sentry import digests
+
+    targets = split_keys(keys)
+    for key in keys:
+        if key not in targets:
+            logger.info(f"Cannot deliver digest {key} due to error: Project does not exist")
+            digests.delete(key)
+
+    minimum_delay_key = get_option_key("mail", "minimum_delay")
+    minimum_delays = {
+        key: ProjectOption.objects.get_value(project, minimum_delay_key)
+        for key, (project, _, _, _) in targets.items()
+    }
+
+    built = {}
+    with snuba.options_override({"consistent": True}):
+        with digests.digest_many(list(targets.keys()), minimum_delays=minimum_delays) as timelines:
+            states = fetch_state_many(
+                {key: (targets[key][0], records) for key, records in timelines.items()}
             )
+            for key, records in list(timelines.items()):
+                try:
+                    built[key] = build_digest(targets[key][0], records, state=states.get(key))
+                except Exception:
+                    # Leave the timeline in the ready state, it is retried
+                    # once maintenance reschedules it.
+                    logger.exception("Failed to build digest", extra={"key": key})
+                    del timelines[key]
+
+        # Timelines whose lock expired before they were closed were dropped
+        # from ``timelines``, they are delivered by whoever claimed them next.
+        built = {key: value for key, value in built.items() if key in timelines}
+
+        metrics.incr("digests.delivery.batch", amount=len(built))
+        for key, (digest, logs) in built.items():
+            project, target_type, target_identifier, fallthrough_choice = targets[key]
+            try:
+                _deliver(project, digest, logs, target_type, target_identifier, fallthrough_choice)
+            except Exception:
+                logger.exception("Failed to deliver digest", extra={"key": key})
+
+
+def _deliver(project, digest, logs, target_type, target_identifier, fallthrough_choice):
+    from sentry.mail import mail_adapter
+
+    if digest:
+        mail_adapter.notify_digest(
+            project,
+            digest,
+            target_type,
+            target_identifier,
+            fallthrough_choice=fallthrough_choice,
+        )
+    else:
+        logger.info(
+            "Skipped digest delivery due to empty digest",
+            extra={
+                "project": project.id,
+                "target_type": target_type.value,
+                "target_identifier": target_identifier,
+                "build_digest_logs": logs,
+                "fallthrough_choice": fallthrough_choice.value if fallthrough_choice else None,
+            },
+        )
@@ -121,38 +121,13 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
         # it could be possible that refrequent invalidations cause the task to take excessive time
         # to complete.
         for organization in Organization.objects.filter(id=organization_id):
-            for project in Project.objects.filter(organization_id=organization_id):
+            projects = list(Project.objects.filter(organization_id=organization_id))
+            for project in projects:
                 project.set_cached_field_value("organization", organization)
-                for key in ProjectKey.objects.filter(project_id=project.id):
-                    key.set_cached_field_value("project", project)
-                    # If we find the config in the cache it means it was active.  As such we want to
-                    # recalculate it.  If the config was not there at all, we leave it and avoid the
-                    # cost of re-computation.
-                    if projectconfig_cache.get(key.public_key) is not None:
-                        configs[key.public_key] = compute_projectkey_config(key)
-                        action = "recompute"
-                    else:
-                        action = "not-cached"
-                    metrics.incr(
-                        "relay.projectconfig_cache.invalidation.recompute",
-                        tags={"action": action, "scope": "organization"},
-                    )
+            configs.update(_compute_configs_for_projects(projects, scope="organization"))
     elif project_id:
-        for project in Project.objects.filter(id=project_id):
-            for key in ProjectKey.objects.filter(project_id=project_id):
-                key.set_cached_field_value("project", project)
-                # If we find the config in the cache it means it was active.  As such we want to
-                # recalculate it.  If the config was not there at all, we leave it and avoid the
-                # cost of re-computation.
-                if projectconfig_cache.get(key.public_key) is not None:
-                    configs[key.public_key] = compute_projectkey_config(key)
-                    action = "recompute"
-                else:
-                    action = "not-cached"
-                    metrics.incr(
-                        "relay.projectconfig_cache.invalidation.recompute",
-                        tags={"action": action, "scope": "project"},
-                    )
+        projects = list(Project.objects.filter(id=project_id))
+        configs.update(_compute_configs_for_projects(projects, scope="project"))
     elif public_key:
         try:
             key = ProjectKey.objects.get(public_key=public_key)
@@ -175,6 +150,45 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
     return configs
 
 
+def _compute_configs_for_projects(projects, scope):
+    """Recomputes the configs of all keys of the given projects that are
+    currently cached.
+
+    Keys are loaded with one query and checked against the cache in bulk, and
+    the options of all affected projects are prefetched before any config is
+    computed.  Projects should share the same organization instance, so that
+    organization-level state is only loaded once for all of them.
+    """
+    from sentry.models import ProjectKey, ProjectOption
+
+    projects_by_id = {project.id: project for project in projects}
+    keys = list(ProjectKey.objects.filter(project_id__in=list(projects_by_id.keys())))
+
+    # If we find the config in the cache it means it was active.  As such we want to
+    # recalculate it.  If the config was not there at all, we leave it and avoid the
+    # cost of re-computation.
+    cached = projectconfig_cache.get_many([key.public_key for key in keys])
+    active_keys = [key for key in keys if cached.get(key.public_key) is not None]
+    ProjectOption.objects.prefetch_all_values({key.project_id for key in active_keys})
+
+    metrics.incr(
+        "relay.projectconfig_cache.invalidation.recompute",
+        amount=len(keys) - len(active_keys),
+        tags={"action": "not-cached", "scope": scope},
+    )
+
+    configs = {}
+    for key in active_keys:
+        key.set_cached_field_value("project", projects_by_id[key.project_id])
+        configs[key.public_key] = compute_projectkey_config(key)
+        metrics.incr(
+            "relay.projectconfig_cache.invalidation.recompute",
+            tags={"action": "recompute", "scope": scope},
+        )
+
+    return configs
+
+
 def compute_projectkey_config(key):
     """Computes a single config for the given :class:`ProjectKey`.
 
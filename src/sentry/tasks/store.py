@@ -1,7 +1,8 @@
 import logging
+from collections import defaultdict
 from datetime import datetime
 from time import time
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
 
 import sentry_sdk
 from django.conf import settings
@@ -31,6 +32,10 @@ info_logger = logging.getLogger("sentry.store")
 # Is reprocessing on or off by default?
 REPROCESSING_DEFAULT = False
 
+# Upper bound for the number of events saved by one ``save_event_batch`` task,
+# which needs to fit into the time limit of that task.
+MAX_SAVE_EVENT_BATCH_SIZE = 20
+
 
 class RetryProcessing(Exception):
     pass
@@ -100,6 +105,23 @@ def submit_save_event(
     (save_event_attachments if has_attachments else save_event).delay(**task_kwargs)
 
 
+def submit_save_event_batch(events: Sequence[Mapping[str, Any]]) -> None:
+    """
+    Dispatches the events collected by ``preprocess_event`` to
+    ``save_event_batch`` tasks, so that every task saves events of a single
+    project.
+    """
+    batch_size = min(max(options.get("store.save-event-batch-size"), 1), MAX_SAVE_EVENT_BATCH_SIZE)
+
+    events_by_project: Dict[int, List[Mapping[str, Any]]] = defaultdict(list)
+    for event in events:
+        events_by_project[event["project_id"]].append(event)
+
+    for project_events in events_by_project.values():
+        for i in range(0, len(project_events), batch_size):
+            save_event_batch.delay(events=project_events[i : i + batch_size])
+
+
 def _do_preprocess_event(
     cache_key: str,
     data: Optional[Event],
@@ -108,6 +130,7 @@ def _do_preprocess_event(
     process_task: Callable[[Optional[str], Optional[int], Optional[str], bool], None],
     project: Optional[Project],
     has_attachments: bool = False,
+    save_event_batch: Optional[List[Mapping[str, Any]]] = None,
 ) -> None:
     from sentry.lang.native.processing import get_symbolication_function
     from sentry.tasks.symbolication import should_demote_symbolication, submit_symbolicate
@@ -176,6 +199,18 @@ def _do_preprocess_event(
         )
         return
 
+    if save_event_batch is not None and cache_key and not from_reprocessing and not has_attachments:
+        # The caller submits the collected events with `submit_save_event_batch`.
+        save_event_batch.append(
+            {
+                "cache_key": cache_key,
+                "start_time": start_time,
+                "event_id": event_id,
+                "project_id": project_id,
+            }
+        )
+        return
+
     submit_save_event(
         project_id=project_id,
         from_reprocessing=from_reprocessing,
@@ -200,6 +235,7 @@ def preprocess_event(
     event_id: Optional[str] = None,
     project: Optional[Project] = None,
     has_attachments: bool = False,
+    save_event_batch: Optional[List[Mapping[str, Any]]] = None,
     **kwargs: Any,
 ) -> None:
     return _do_preprocess_event(
@@ -210,6 +246,7 @@ def preprocess_event(
         process_task=process_event,
         project=project,
         has_attachments=has_attachments,
+        save_event_batch=save_event_batch,
     )
 
 
@@ -713,24 +750,136 @@ def _do_save_event(
             raise
 
         finally:
-            reprocessing2.mark_event_reprocessed(data)
-            if cache_key:
-                with metrics.timer("tasks.store.do_save_event.delete_attachment_cache"):
-                    attachment_cache.delete(cache_key)
-
-            if start_time:
-                metrics.timing(
-                    "events.time-to-process",
-                    time() - start_time,
-                    instance=data["platform"],
-                    tags={
-                        "is_reprocessing2": "true"
-                        if reprocessing2.is_reprocessed_event(data)
-                        else "false",
-                    },
+            _finish_save_event(data, cache_key, project_id, start_time)
+
+
+def _do_save_events(events: Sequence[Mapping[str, Any]]) -> None:
+    """
+    Saves a batch of error events to the database with one call to
+    `save_error_events` per project. Events that need special handling
+    (missing payloads, other event types, load shedding) go through
+    `_do_save_event` instead.
+    """
+
+    events_by_project: Dict[int, List[Mapping[str, Any]]] = defaultdict(list)
+    for event in events:
+        events_by_project[event["project_id"]].append(event)
+
+    for project_id, project_events in events_by_project.items():
+        set_current_event_project(project_id)
+        _do_save_project_events(project_id, project_events)
+
+
+def _do_save_project_events(project_id: int, events: Sequence[Mapping[str, Any]]) -> None:
+    from sentry.event_manager import save_error_events
+
+    jobs = []
+    batched_events = []
+    for event in events:
+        cache_key = event["cache_key"]
+
+        with metrics.timer("tasks.store.do_save_event.get_cache"):
+            data = processing.event_processing_store.get(cache_key)
+
+        if (
+            not data
+            or data.get("type") in ("transaction", "generic")
+            or killswitch_matches_context(
+                "store.load-shed-save-event-projects",
+                {
+                    "project_id": project_id,
+                    "event_type": data.get("type") or "none",
+                    "platform": data.get("platform") or "none",
+                },
+            )
+        ):
+            _do_save_event(**event)
+            continue
+
+        data = CanonicalKeyDict(data)
+        if reprocessing.event_supports_reprocessing(data):
+            with metrics.timer("tasks.store.do_save_event.delete_raw_event"):
+                delete_raw_event(
+                    project_id, event["event_id"] or data["event_id"], allow_hint_clear=True
                 )
 
-            time_synthetic_monitoring_event(data, project_id, start_time)
+        jobs.append(
+            {
+                "data": data,
+                "project_id": project_id,
+                "raw": False,
+                "start_time": event["start_time"],
+                "cache_key": cache_key,
+            }
+        )
+        batched_events.append(event)
+
+    if not jobs:
+        return
+
+    projects = {project_id: Project.objects.get_from_cache(id=project_id)}
+
+    try:
+        with metrics.timer("tasks.store.do_save_events.save_error_events"):
+            save_error_events(jobs, projects, auto_upgrade_grouping=True)
+    except Exception:
+        metrics.incr("events.save_event_batch.exception")
+        # Save the events one by one instead, so that a single bad event only
+        # fails itself. Their payloads are still in the processing store.
+        _do_save_events_individually(batched_events)
+        return
+
+    try:
+        for job in jobs:
+            if job.get("discarded") is not None:
+                # Delete the event payload from cache since it won't show up in post-processing.
+                with metrics.timer("tasks.store.do_save_event.delete_cache"):
+                    processing.event_processing_store.delete_by_key(job["cache_key"])
+                continue
+
+            # Put the updated event back into the cache so that post_process
+            # has the most recent data.
+            data = job["event"].data.data if job["groups"] else job["data"]
+            if isinstance(data, CANONICAL_TYPES):
+                data = dict(data.items())
+            with metrics.timer("tasks.store.do_save_event.write_processing_cache"):
+                processing.event_processing_store.store(data)
+    finally:
+        for job in jobs:
+            _finish_save_event(job["data"], job["cache_key"], job["project_id"], job["start_time"])
+
+
+def _do_save_events_individually(events: Sequence[Mapping[str, Any]]) -> None:
+    error = None
+    for event in events:
+        try:
+            _do_save_event(**event)
+        except Exception as e:
+            error = error or e
+
+    if error is not None:
+        raise error
+
+
+def _finish_save_event(
+    data: Event, cache_key: Optional[str], project_id: int, start_time: Optional[int]
+) -> None:
+    reprocessing2.mark_event_reprocessed(data)
+    if cache_key:
+        with metrics.timer("tasks.store.do_save_event.delete_attachment_cache"):
+            attachment_cache.delete(cache_key)
+
+    if start_time:
+        metrics.timing(
+            "events.time-to-process",
+            time() - start_time,
+            instance=data["platform"],
+            tags={
+                "is_reprocessing2": "true" if reprocessing2.is_reprocessed_event(data) else "false",
+            },
+        )
+
+    time_synthetic_monitoring_event(data, project_id, start_time)
 
 
 def time_synthetic_monitoring_event(
@@ -832,3 +981,13 @@ def save_event_attachments(
     **kwargs: Any,
 ) -> None:
     _do_save_event(cache_key, data, start_time, event_id, project_id, **kwargs)
+
+
+@instrumented_task(  # type: ignore
+    name="sentry.tasks.store.save_event_batch",
+    queue="events.save_event",
+    time_limit=(60 * 5) + 5,
+    soft_time_limit=60 * 5,
+)
+def save_event_batch(events: Sequence[Mapping[str, Any]], **kwargs: Any) -> None:
+    _do_save_events(events)
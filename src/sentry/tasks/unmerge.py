@@ -1,11 +1,11 @@
 import logging
 from collections import defaultdict
 from functools import reduce
-from typing import Any, Mapping, Optional, Tuple
+from typing import Any, List, Mapping, Optional, Sequence, Tuple
 
 from django.db import transaction
 
-from sentry import eventstore, similarity, tsdb
+from sentry import eventstore, options, similarity, tsdb
 from sentry.constants import DEFAULT_LOGGER_NAME, LOG_LEVELS_MAP
 from sentry.event_manager import generate_culprit
 from sentry.models import (
@@ -24,7 +24,7 @@ from sentry.models import (
 from sentry.tasks.base import instrumented_task
 from sentry.types.activity import ActivityType
 from sentry.unmerge import InitialUnmergeArgs, SuccessiveUnmergeArgs, UnmergeArgs, UnmergeArgsBase
-from sentry.utils.query import celery_run_batch_query
+from sentry.utils.query import celery_run_batch_query, celery_run_batch_query_multi
 from sentry.utils.safe import get_path
 
 logger = logging.getLogger(__name__)
@@ -164,6 +164,30 @@ def get_group_backfill_attributes(caches, group, events):
     }
 
 
+def get_group_merge_attributes(caches, group, events):
+    """
+    Like ``get_group_backfill_attributes``, but the events are not required to
+    be older than the ones the group attributes were derived from.
+    """
+    attributes = get_group_creation_attributes(caches, events)
+
+    rv = {}
+    if attributes["last_seen"] > group.last_seen:
+        rv.update({name: attributes[name] for name in initial_fields if name != "times_seen"})
+    if attributes["first_seen"] < group.first_seen:
+        rv.update(
+            {name: attributes[name] for name in ("platform", "logger", "first_seen", "active_at")}
+        )
+        if attributes["first_release"] is not None:
+            rv["first_release"] = attributes["first_release"]
+    elif group.first_release is None and attributes["first_release"] is not None:
+        rv["first_release"] = attributes["first_release"]
+
+    rv["times_seen"] = group.times_seen + attributes["times_seen"]
+    rv["score"] = Group.calculate_score(rv["times_seen"], rv.get("last_seen", group.last_seen))
+    return rv
+
+
 def get_fingerprint(event):
     # TODO: This *might* need to be protected from an IndexError?
     return event.get_primary_hash()
@@ -177,6 +201,7 @@ def migrate_events(
     locked_primary_hashes,
     opt_destination_id: Optional[int],
     opt_eventstream_state: Optional[Mapping[str, Any]],
+    merge_attributes: bool = False,
 ) -> Tuple[int, Mapping[str, Any]]:
     if opt_destination_id is None:
         # XXX: There is a race condition here between the (wall clock) time
@@ -201,7 +226,10 @@ def migrate_events(
         # Update the existing destination group.
         destination_id = opt_destination_id
         destination = Group.objects.get(id=destination_id)
-        destination.update(**get_group_backfill_attributes(caches, destination, events))
+        if merge_attributes:
+            destination.update(**get_group_merge_attributes(caches, destination, events))
+        else:
+            destination.update(**get_group_backfill_attributes(caches, destination, events))
 
     if isinstance(args, InitialUnmergeArgs) or opt_eventstream_state is None:
         eventstream_state = args.replacement.start_snuba_replacement(
@@ -357,8 +385,13 @@ def repair_group_release_data(caches, project, events):
             defaults={"first_seen": first_seen, "last_seen": last_seen},
         )
 
-        if not created:
-            instance.update(first_seen=first_seen)
+        # Batches of events are not necessarily processed in order when the
+        # source is split into shards.
+        if not created and (first_seen < instance.first_seen or last_seen > instance.last_seen):
+            instance.update(
+                first_seen=min(first_seen, instance.first_seen),
+                last_seen=max(last_seen, instance.last_seen),
+            )
 
 
 def get_event_user_from_interface(value):
@@ -436,6 +469,105 @@ def repair_denormalizations(caches, project, events):
         similarity.record(project, [event])
 
 
+def repair_first_releases(group_ids):
+    """
+    Sets the first release of the groups and their environments to the release
+    of their earliest ``GroupRelease``, once all events have been processed in
+    an arbitrary order.
+    """
+    for group_id in group_ids:
+        group_releases = GroupRelease.objects.filter(group_id=group_id).order_by("first_seen")
+
+        release_id = group_releases.values_list("release_id", flat=True).first()
+        if release_id is not None:
+            Group.objects.filter(id=group_id).update(first_release_id=release_id)
+
+        for group_environment in GroupEnvironment.objects.filter(group_id=group_id).select_related(
+            "environment"
+        ):
+            release_id = (
+                group_releases.filter(environment=group_environment.environment.name)
+                .values_list("release_id", flat=True)
+                .first()
+            )
+            if release_id is not None and release_id != group_environment.first_release_id:
+                GroupEnvironment.objects.filter(id=group_environment.id).update(
+                    first_release_id=release_id
+                )
+
+
+def get_shards(group, count) -> List[Mapping[str, Any]]:
+    """
+    Splits the time range of the events of ``group`` into at most ``count``
+    shards of about the same duration. The first and last shard are open ended
+    so that events outside of the range of the group are not missed.
+    """
+    start = group.first_seen.replace(microsecond=0)
+    step = (group.last_seen - start) / count
+    boundaries = sorted(
+        {(start + step * i).replace(microsecond=0) for i in range(1, count)} - {start}
+    )
+    boundaries = [None] + [boundary.isoformat() for boundary in boundaries] + [None]
+
+    return [
+        {"start": boundaries[i], "end": boundaries[i + 1], "last_event": None, "done": False}
+        for i in range(len(boundaries) - 1)
+    ]
+
+
+def fetch_shard_batches(
+    project_id, source_id, shards: Sequence[Mapping[str, Any]], batch_size
+) -> Tuple[List[Mapping[str, Any]], List[Any]]:
+    """
+    Queries the next batch of events of every unfinished shard at once.
+    Returns the new state of the shards and the events of all batches, latest
+    first.
+    """
+    pending = [shard for shard in shards if not shard["done"]]
+
+    filters = []
+    for shard in pending:
+        conditions = []
+        if shard["start"] is not None:
+            conditions.append(["timestamp", ">=", shard["start"]])
+        if shard["end"] is not None:
+            conditions.append(["timestamp", "<", shard["end"]])
+        filters.append(
+            eventstore.Filter(
+                project_ids=[project_id], group_ids=[source_id], conditions=conditions
+            )
+        )
+
+    batches = (
+        celery_run_batch_query_multi(
+            filters=filters,
+            states=[shard["last_event"] for shard in pending],
+            batch_size=batch_size,
+            referrer="unmerge",
+        )
+        if pending
+        else []
+    )
+
+    new_shards = []
+    events = []
+    batches = iter(batches)
+    for shard in shards:
+        if shard["done"]:
+            new_shards.append(shard)
+            continue
+
+        last_event, batch = next(batches)
+        # A short batch is the last one of the shard.
+        new_shards.append({**shard, "last_event": last_event, "done": len(batch) < batch_size})
+        events.extend(batch)
+
+    # Fetch the event payloads of all shards with a single nodestore request.
+    eventstore.bind_nodes(events, "data")
+    events.sort(key=lambda event: (event.datetime, event.event_id), reverse=True)
+    return new_shards, events
+
+
 def lock_hashes(project_id, source_id, fingerprints):
     with transaction.atomic():
         eligible_hashes = list(
@@ -480,19 +612,34 @@ def unmerge(*posargs, **kwargs):
         )
         truncate_denormalizations(project, source)
         last_event = None
+
+        # Splitting the events into time shards trades the order in which
+        # events are processed for fetching a batch of every shard at once.
+        shard_count = options.get("unmerge.shards")
+        shards = get_shards(source, shard_count) if shard_count > 1 else None
     else:
         last_event = args.last_event
         locked_primary_hashes = args.locked_primary_hashes
+        shards = args.shards
 
-    last_event, events = celery_run_batch_query(
-        filter=eventstore.Filter(project_ids=[args.project_id], group_ids=[source.id]),
-        batch_size=args.batch_size,
-        state=last_event,
-        referrer="unmerge",
-    )
+    if shards is not None:
+        shards, events = fetch_shard_batches(
+            args.project_id, source.id, shards, batch_size=args.batch_size
+        )
+    else:
+        last_event, events = celery_run_batch_query(
+            filter=eventstore.Filter(project_ids=[args.project_id], group_ids=[source.id]),
+            batch_size=args.batch_size,
+            state=last_event,
+            referrer="unmerge",
+        )
 
     # If there are no more events to process, we're done with the migration.
     if not events:
+        if shards is not None:
+            repair_first_releases(
+                [source.id] + [group_id for group_id, _ in args.destinations.values()]
+            )
         unlock_hashes(args.project_id, locked_primary_hashes)
         for unmerge_key, (group_id, eventstream_state) in args.destinations.items():
             logger.warning("Unmerge complete (eventstream state: %s)", eventstream_state)
@@ -516,6 +663,8 @@ def unmerge(*posargs, **kwargs):
         if not source_fields_reset:
             source.update(**get_group_creation_attributes(caches, source_events))
             source_fields_reset = True
+        elif shards is not None:
+            source.update(**get_group_merge_attributes(caches, source, source_events))
         else:
             source.update(**get_group_backfill_attributes(caches, source, source_events))
 
@@ -537,6 +686,7 @@ def unmerge(*posargs, **kwargs):
             locked_primary_hashes,
             destination_id,
             eventstream_state,
+            merge_attributes=shards is not None,
         )
         destinations[unmerge_key] = destination_id, eventstream_state
 
@@ -552,6 +702,7 @@ def unmerge(*posargs, **kwargs):
         destinations=destinations,
         locked_primary_hashes=locked_primary_hashes,
         source_fields_reset=source_fields_reset,
+        shards=shards,
     )
 
     unmerge.delay(**new_args.dump_arguments())
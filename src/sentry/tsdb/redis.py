@@ -25,6 +25,8 @@ SketchParameters = namedtuple("SketchParameters", "depth width capacity")
 
 CountMinScript = SentryScript(None, resource_string("sentry", "scripts/tsdb/cmsketch.lua"))
 
+RangeScript = SentryScript(None, resource_string("sentry", "scripts/tsdb/range.lua"))
+
 
 class SuppressionWrapper:
     """\
@@ -105,15 +107,28 @@ class RedisTSDB(BaseTSDB):
     frequency table can be displayed as percentages of the whole data set.
     (Additional documentation and the bulk of the logic for implementing the
     frequency table API can be found in the ``cmsketch.lua`` script.)
+
+    When ``enable_range_script`` is set, counter range reads (``get_range`` and
+    ``get_sums``) are performed by the ``range.lua`` script, which reads all
+    buckets of a batch of keys located on the same host in a single call. For
+    ``get_sums`` the buckets are also summed up on the server.
     """
 
     DEFAULT_SKETCH_PARAMETERS = SketchParameters(3, 128, 50)
 
+    # Maximum number of hash fields read by a single ``RangeScript`` call. This
+    # must stay below the number of arguments Lua's ``unpack`` can handle.
+    DEFAULT_RANGE_SCRIPT_BATCH_SIZE = 1000
+
     def __init__(self, prefix="ts:", vnodes=64, **options):
         self.cluster, options = get_cluster_from_options("SENTRY_TSDB_OPTIONS", options)
         self.prefix = prefix
         self.vnodes = vnodes
         self.enable_frequency_sketches = options.pop("enable_frequency_sketches", False)
+        self.enable_range_script = options.pop("enable_range_script", False)
+        self.range_script_batch_size = options.pop(
+            "range_script_batch_size", self.DEFAULT_RANGE_SCRIPT_BATCH_SIZE
+        )
         super().__init__(**options)
 
     def validate(self):
@@ -291,6 +306,15 @@ class RedisTSDB(BaseTSDB):
         rollup, series = self.get_optimal_rollup_series(start, end, rollup)
         series = [to_datetime(item) for item in series]
 
+        if self.enable_range_script:
+            results_by_key = defaultdict(dict)
+            for (key, epoch), count in self._read_counters(
+                model, keys, series, rollup, environment_id, lambda key, epoch: (key, epoch)
+            ).items():
+                results_by_key[key][epoch] = count
+
+            return {key: sorted(points.items()) for key, points in results_by_key.items()}
+
         results = []
         cluster, _ = self.get_cluster(environment_id)
         with cluster.map() as client:
@@ -311,6 +335,111 @@ class RedisTSDB(BaseTSDB):
             results_by_key[key] = sorted(points.items())
         return dict(results_by_key)
 
+    def get_sums(
+        self,
+        model,
+        keys,
+        start,
+        end,
+        rollup=None,
+        environment_id=None,
+        use_cache=False,
+        jitter_value=None,
+    ):
+        if not self.enable_range_script:
+            return super().get_sums(
+                model,
+                keys,
+                start,
+                end,
+                rollup,
+                environment_id=environment_id,
+                use_cache=use_cache,
+                jitter_value=jitter_value,
+            )
+
+        self.validate_arguments([model], [environment_id])
+
+        rollup, series = self.get_optimal_rollup_series(start, end, rollup)
+        series = [to_datetime(item) for item in series]
+
+        return self._read_counters(
+            model, keys, series, rollup, environment_id, lambda key, epoch: key
+        )
+
+    def _read_counters(self, model, keys, series, rollup, environment_id, get_slot_key):
+        """
+        Reads the counters of ``keys`` for every timestamp in ``series`` using
+        ``RangeScript``, issuing one script call per host and batch of
+        ``range_script_batch_size`` hash fields.
+
+        Every counter is added to the result under the slot key returned by
+        ``get_slot_key(key, epoch)``, so counters that share a slot key are
+        summed (on the server where possible.)
+        """
+        cluster, _ = self.get_cluster(environment_id)
+        router = cluster.get_router()
+
+        # slot key -> slot index
+        slots = {}
+        # host -> hash key -> [(hash field, slot index), ...]
+        reads = defaultdict(lambda: defaultdict(list))
+        for key in dict.fromkeys(keys):
+            for timestamp in series:
+                slot = slots.setdefault(get_slot_key(key, to_timestamp(timestamp)), len(slots))
+                hash_key, hash_field = self.make_counter_key(
+                    model, rollup, timestamp, key, environment_id
+                )
+                reads[router.get_host_for_key(hash_key)][hash_key].append((hash_field, slot))
+
+        commands = {}
+        command_slots = {}
+        for fields_by_hash_key in reads.values():
+            # Any of the host's hash keys routes the commands to that host.
+            routing_key = next(iter(fields_by_hash_key))
+            commands[routing_key] = []
+            command_slots[routing_key] = []
+            for hash_keys, arguments, local_slots in self._batch_counter_reads(fields_by_hash_key):
+                commands[routing_key].append(
+                    (RangeScript, hash_keys, [len(local_slots)] + arguments)
+                )
+                command_slots[routing_key].append(list(local_slots))
+
+        totals = [0] * len(slots)
+        for routing_key, responses in cluster.execute_commands(commands).items():
+            for response, global_slots in zip(responses, command_slots[routing_key]):
+                for slot, value in zip(global_slots, response.value):
+                    totals[slot] += int(value)
+
+        return {slot_key: totals[slot] for slot_key, slot in slots.items()}
+
+    def _batch_counter_reads(self, fields_by_hash_key):
+        """
+        Splits the reads of a host into batches of at most
+        ``range_script_batch_size`` hash fields, yielding the ``KEYS`` and
+        ``ARGV`` (without the leading slot count) of a ``RangeScript`` call and
+        a mapping of global slot index to the slot index used by that call.
+        """
+        batch_size = self.range_script_batch_size
+        hash_keys, arguments, local_slots, size = [], [], {}, 0
+        for hash_key, fields in fields_by_hash_key.items():
+            for i in range(0, len(fields), batch_size):
+                chunk = fields[i : i + batch_size]
+                if hash_keys and size + len(chunk) > batch_size:
+                    yield hash_keys, arguments, local_slots
+                    hash_keys, arguments, local_slots, size = [], [], {}, 0
+
+                hash_keys.append(hash_key)
+                arguments.append(len(chunk))
+                for hash_field, slot in chunk:
+                    # script slots are 1-indexed
+                    local_slot = local_slots.setdefault(slot, len(local_slots) + 1)
+                    arguments.extend((hash_field, local_slot))
+                size += len(chunk)
+
+        if hash_keys:
+            yield hash_keys, arguments, local_slots
+
     def merge(self, model, destination, sources, timestamp=None, environment_ids=None):
         environment_ids = (set(environment_ids) if environment_ids is not None else set()).union(
             [None]
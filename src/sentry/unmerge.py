@@ -167,6 +167,7 @@ class UnmergeArgsBase(abc.ABC):
         replacement: Optional[UnmergeReplacement] = None,
         locked_primary_hashes: Optional[Collection[str]] = None,
         destinations: Optional[Destinations] = None,
+        shards: Optional[Sequence[Mapping[str, Any]]] = None,
     ) -> "UnmergeArgs":
         if destinations is None:
             if destination_id is not None:
@@ -174,7 +175,7 @@ class UnmergeArgsBase(abc.ABC):
             else:
                 destinations = {}
 
-        if last_event is None:
+        if last_event is None and shards is None:
             assert eventstream_state is None
             assert not source_fields_reset
 
@@ -198,6 +199,7 @@ class UnmergeArgsBase(abc.ABC):
                 destinations=destinations,
                 locked_primary_hashes=locked_primary_hashes or fingerprints or [],
                 source_fields_reset=source_fields_reset,
+                shards=shards,
             )
 
     def dump_arguments(self) -> Mapping[str, Any]:
@@ -231,5 +233,10 @@ class SuccessiveUnmergeArgs(UnmergeArgsBase):
     # group attributes such as last_seen.
     source_fields_reset: bool
 
+    # If the events of the source are split into time shards, the pagination
+    # state of every shard. `last_event` is unused then.
+    # [{"start": ..., "end": ..., "last_event": ..., "done": bool}]
+    shards: Optional[Sequence[Mapping[str, Any]]] = None
+
 
 UnmergeArgs = Union[InitialUnmergeArgs, SuccessiveUnmergeArgs]
@@ -6,7 +6,7 @@ import re
 from abc import ABC, abstractmethod
 from datetime import timedelta
 from enum import Enum
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from urllib.parse import urlparse
 
 from sentry import options
@@ -75,6 +75,7 @@ class PerformanceDetector(ABC):
     def __init__(self, settings: Dict[DetectorType, Any], event: Event):
         self.settings = settings[self.settings_key]
         self._event = event
+        self._span_index: Optional[SpanIndex] = None
         self.init()
 
     @abstractmethod
@@ -93,7 +94,7 @@ class PerformanceDetector(ABC):
         if not op or not span_id:
             return None
 
-        span_duration = get_span_duration(span)
+        span_duration = self.span_index.get_duration(span)
         for setting in self.settings:
             op_prefix = self.find_span_prefix(setting, op)
             if op_prefix:
@@ -103,6 +104,16 @@ class PerformanceDetector(ABC):
     def event(self) -> Event:
         return self._event
 
+    @property
+    def span_index(self) -> SpanIndex:
+        if self._span_index is None:
+            self._span_index = SpanIndex(self._event)
+        return self._span_index
+
+    @span_index.setter
+    def span_index(self, span_index: SpanIndex) -> None:
+        self._span_index = span_index
+
     @property
     @abstractmethod
     def settings_key(self) -> DetectorType:
@@ -150,6 +161,46 @@ def get_span_duration(span: Span) -> timedelta:
     )
 
 
+class SpanIndex:
+    """
+    Lookups over the spans of an event, derived once and shared by all
+    detectors that run on the event.
+
+    ``spans`` keeps the order of the event payload, which is the order in
+    which detectors visit spans.
+    """
+
+    def __init__(self, event: Event):
+        self.spans: List[Span] = event.get("spans") or []
+        self.spans_by_id: Dict[str, Span] = {}
+        # Keyed by ``id(span)``, which is stable since the index references
+        # all of the spans.
+        self._durations: Dict[int, timedelta] = {}
+        self._fingerprints: Dict[int, Optional[str]] = {}
+
+        for span in self.spans:
+            span_id = span.get("span_id")
+            if span_id and span_id not in self.spans_by_id:
+                self.spans_by_id[span_id] = span
+            self._durations[id(span)] = get_span_duration(span)
+
+    def get_duration(self, span: Span) -> timedelta:
+        duration = self._durations.get(id(span))
+        if duration is None:
+            duration = get_span_duration(span)
+        return duration
+
+    def get_fingerprint(self, span: Span) -> Optional[str]:
+        key = id(span)
+        if key not in self._fingerprints:
+            fingerprint = fingerprint_span(span)
+            if key not in self._durations:
+                # not one of the indexed spans, so ``id(span)`` may be reused
+                return fingerprint
+            self._fingerprints[key] = fingerprint
+        return self._fingerprints[key]
+
+
 def get_url_from_span(span: Span) -> str:
     data = span.get("data") or {}
     url = data.get("url") or ""
@@ -10,7 +10,7 @@ from sentry.issues.grouptype import PerformanceConsecutiveDBQueriesGroupType
 from sentry.models import Organization, Project
 from sentry.utils.event_frames import get_sdk_name
 
-from ..base import DetectorType, PerformanceDetector, fingerprint_spans, get_span_duration
+from ..base import DetectorType, PerformanceDetector, fingerprint_spans
 from ..performance_problem import PerformanceProblem
 from ..types import Span
 
@@ -76,7 +76,7 @@ class ConsecutiveDBSpanDetector(PerformanceDetector):
             "consecutive_count_threshold"
         )
         exceeds_span_duration_threshold = all(
-            get_span_duration(span).total_seconds() * 1000
+            self.span_index.get_duration(span).total_seconds() * 1000
             > self.settings.get("span_duration_threshold")
             for span in self.independent_db_spans
         )
@@ -122,7 +122,7 @@ class ConsecutiveDBSpanDetector(PerformanceDetector):
         "Given a list of spans, find the sum of the span durations in milliseconds"
         sum = 0
         for span in spans:
-            sum += get_span_duration(span).total_seconds() * 1000
+            sum += self.span_index.get_duration(span).total_seconds() * 1000
         return sum
 
     def _set_independent_spans(self, spans: list[Span]):
@@ -153,13 +153,18 @@ class ConsecutiveDBSpanDetector(PerformanceDetector):
         total_duration = self._sum_span_duration(consecutive_spans)
 
         max_independent_span_duration = max(
-            [get_span_duration(span).total_seconds() * 1000 for span in independent_spans]
+            [
+                self.span_index.get_duration(span).total_seconds() * 1000
+                for span in independent_spans
+            ]
         )
 
         sum_of_dependent_span_durations = 0
         for span in consecutive_spans:
             if span not in independent_spans:
-                sum_of_dependent_span_durations += get_span_duration(span).total_seconds() * 1000
+                sum_of_dependent_span_durations += (
+                    self.span_index.get_duration(span).total_seconds() * 1000
+                )
 
         return total_duration - max(max_independent_span_duration, sum_of_dependent_span_durations)
 
@@ -16,7 +16,6 @@ from ..base import (
     DETECTOR_TYPE_TO_GROUP_TYPE,
     DetectorType,
     PerformanceDetector,
-    get_span_duration,
     get_url_from_span,
 )
 from ..performance_problem import PerformanceProblem
@@ -76,7 +75,7 @@ class NPlusOneAPICallsDetector(PerformanceDetector):
             return
 
         duration_threshold = timedelta(milliseconds=self.settings.get("duration_threshold"))
-        span_duration = get_span_duration(span)
+        span_duration = self.span_index.get_duration(span)
 
         if span_duration < duration_threshold:
             return
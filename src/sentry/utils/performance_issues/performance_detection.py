@@ -32,9 +32,8 @@ from .base import (
     DETECTOR_TYPE_TO_GROUP_TYPE,
     DetectorType,
     PerformanceDetector,
+    SpanIndex,
     fingerprint_resource_span,
-    fingerprint_span,
-    get_span_duration,
 )
 from .detectors import (
     ConsecutiveDBSpanDetector,
@@ -255,8 +254,7 @@ def _detect_performance_problems(
         UncompressedAssetSpanDetector(detection_settings, data),
     ]
 
-    for detector in detectors:
-        run_detector_on_data(detector, data)
+    run_detectors_on_data(detectors, data)
 
     # Metrics reporting only for detection, not created issues.
     report_metrics_for_detectors(data, event_id, detectors, sdk_span)
@@ -298,14 +296,29 @@ def _detect_performance_problems(
 
 
 def run_detector_on_data(detector, data):
-    if not detector.is_event_eligible(data):
+    run_detectors_on_data([detector], data)
+
+
+def run_detectors_on_data(detectors, data):
+    """
+    Visits the spans of ``data`` once, passing every span to all eligible
+    detectors in turn. The detectors share one ``SpanIndex`` of the event.
+    """
+    detectors = [detector for detector in detectors if detector.is_event_eligible(data)]
+    if not detectors:
         return
 
-    spans = data.get("spans", [])
-    for span in spans:
-        detector.visit_span(span)
+    span_index = SpanIndex(data)
+    for detector in detectors:
+        detector.span_index = span_index
+
+    visitors = [detector.visit_span for detector in detectors]
+    for span in span_index.spans:
+        for visit_span in visitors:
+            visit_span(span)
 
-    detector.on_complete()
+    for detector in detectors:
+        detector.on_complete()
 
 
 def contains_complete_query(span: Span, is_source: Optional[bool] = False) -> bool:
@@ -360,7 +373,7 @@ class SlowDBQueryDetector(PerformanceDetector):
         op, span_id, op_prefix, span_duration, settings = settings_for_span
         duration_threshold = settings.get("duration_threshold")
 
-        fingerprint = fingerprint_span(span)
+        fingerprint = self.span_index.get_fingerprint(span)
 
         if not fingerprint:
             return
@@ -497,7 +510,7 @@ class RenderBlockingAssetSpanDetector(PerformanceDetector):
         if encoded_body_size < minimum_size_bytes or encoded_body_size > self.MAX_SIZE_BYTES:
             return False
 
-        span_duration = get_span_duration(span)
+        span_duration = self.span_index.get_duration(span)
         fcp_ratio_threshold = self.settings.get("fcp_ratio_threshold")
         return span_duration / self.fcp > fcp_ratio_threshold
 
@@ -656,7 +669,7 @@ class NPlusOneDBSpanDetector(PerformanceDetector):
         # Do the spans take enough total time?
         total_duration = timedelta()
         for span in self.n_spans:
-            total_duration += get_span_duration(span)
+            total_duration += self.span_index.get_duration(span)
         if total_duration < duration_threshold:
             return
 
@@ -903,13 +916,16 @@ class SearchingForMNPlusOne(MNPlusOneState):
     it transitions to the ContinuingMNPlusOne state.
     """
 
-    __slots__ = ("settings", "event", "recent_spans")
+    __slots__ = ("settings", "span_index", "recent_spans")
 
     def __init__(
-        self, settings: Dict[str, Any], event: Event, initial_spans: Optional[Sequence[Span]] = None
+        self,
+        settings: Dict[str, Any],
+        span_index: SpanIndex,
+        initial_spans: Optional[Sequence[Span]] = None,
     ) -> None:
         self.settings = settings
-        self.event = event
+        self.span_index = span_index
         self.recent_spans = deque(initial_spans or [], self.settings["max_sequence_length"])
 
     def next(self, span: Span) -> Tuple[MNPlusOneState, Optional[PerformanceProblem]]:
@@ -927,7 +943,10 @@ class SearchingForMNPlusOne(MNPlusOneState):
             if self._equivalent(span, recent_span):
                 pattern = recent_span_list[i:]
                 if self._is_valid_pattern(pattern):
-                    return (ContinuingMNPlusOne(self.settings, self.event, pattern, span), None)
+                    return (
+                        ContinuingMNPlusOne(self.settings, self.span_index, pattern, span),
+                        None,
+                    )
 
         # We haven't found a pattern yet, so remember this span and keep
         # looking.
@@ -962,13 +981,17 @@ class ContinuingMNPlusOne(MNPlusOneState):
     PerformanceProblem if the detected sequence met our thresholds.
     """
 
-    __slots__ = ("settings", "event", "pattern", "spans", "pattern_index")
+    __slots__ = ("settings", "span_index", "pattern", "spans", "pattern_index")
 
     def __init__(
-        self, settings: Dict[str, Any], event: Event, pattern: Sequence[Span], first_span: Span
+        self,
+        settings: Dict[str, Any],
+        span_index: SpanIndex,
+        pattern: Sequence[Span],
+        first_span: Span,
     ) -> None:
         self.settings = settings
-        self.event = event
+        self.span_index = span_index
         self.pattern = pattern
 
         # The full list of spans involved in the MN pattern.
@@ -992,7 +1015,7 @@ class ContinuingMNPlusOne(MNPlusOneState):
         start_index = len(self.pattern) * times_occurred
         remaining_spans = self.spans[start_index:] + [span]
         return (
-            SearchingForMNPlusOne(self.settings, self.event, remaining_spans),
+            SearchingForMNPlusOne(self.settings, self.span_index, remaining_spans),
             self._maybe_performance_problem(),
         )
 
@@ -1042,11 +1065,7 @@ class ContinuingMNPlusOne(MNPlusOneState):
             if not id or id != parent_span_id:
                 return None
 
-        all_spans = self.event.get("spans") or []
-        for span in all_spans:
-            if span.get("span_id") == parent_span_id:
-                return span
-        return None
+        return self.span_index.spans_by_id.get(parent_span_id)
 
     def _fingerprint(self, db_hash: str, parent_span: Span) -> str:
         parent_op = parent_span.get("op") or ""
@@ -1076,7 +1095,7 @@ class MNPlusOneDBSpanDetector(PerformanceDetector):
 
     def init(self):
         self.stored_problems = {}
-        self.state = SearchingForMNPlusOne(self.settings, self.event())
+        self.state = None
 
     def is_creation_allowed_for_organization(self, organization: Optional[Organization]) -> bool:
         return features.has(
@@ -1089,11 +1108,18 @@ class MNPlusOneDBSpanDetector(PerformanceDetector):
         return True  # Detection always allowed by project for now
 
     def visit_span(self, span):
+        if self.state is None:
+            # Created on the first visit since the span index is only assigned
+            # to the detector after initialization.
+            self.state = SearchingForMNPlusOne(self.settings, self.span_index)
+
         self.state, performance_problem = self.state.next(span)
         if performance_problem:
             self.stored_problems[performance_problem.fingerprint] = performance_problem
 
     def on_complete(self) -> None:
+        if self.state is None:
+            return
         if performance_problem := self.state.finish():
             self.stored_problems[performance_problem.fingerprint] = performance_problem
 
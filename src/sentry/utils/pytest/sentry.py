@@ -306,6 +306,10 @@ def pytest_runtest_teardown(item):
     for model in (OrganizationOption, ProjectOption, UserOption):
         model.objects.clear_local_cache()
 
+    from sentry.lang.javascript.cache import artifact_cache
+
+    artifact_cache.clear()
+
     Hub.main.bind_client(None)
 
 
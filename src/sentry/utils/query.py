@@ -35,12 +35,7 @@ def celery_run_batch_query(filter, batch_size, referrer, state=None, fetch_event
     # state contains data about the last event ID and timestamp. Changing
     # the keys in here needs to be done carefully as the state object is
     # semi-persisted in celery queues.
-    if state is not None:
-        filter.conditions = filter.conditions or []
-        filter.conditions.append(["timestamp", "<=", state["timestamp"]])
-        filter.conditions.append(
-            [["timestamp", "<", state["timestamp"]], ["event_id", "<", state["event_id"]]]
-        )
+    _apply_batch_state(filter, state)
 
     method = eventstore.get_events if fetch_events else eventstore.get_unfetched_events
 
@@ -53,12 +48,41 @@ def celery_run_batch_query(filter, batch_size, referrer, state=None, fetch_event
         )
     )
 
-    if events:
-        state = {"timestamp": events[-1].timestamp, "event_id": events[-1].event_id}
-    else:
-        state = None
+    return _get_batch_state(events), events
+
+
+def celery_run_batch_query_multi(filters, states, batch_size, referrer):
+    """
+    Runs `celery_run_batch_query` for the next batch of several filters, each
+    with its own state, in one bulk Snuba query. Events are returned without
+    their node data so that it can be fetched for all batches at once.
+    """
+    for filter, state in zip(filters, states):
+        _apply_batch_state(filter, state)
+
+    batches = eventstore.get_unfetched_events_multi(
+        filters,
+        limit=batch_size,
+        referrer=referrer,
+        orderby=["-timestamp", "-event_id"],
+    )
 
-    return state, events
+    return [(_get_batch_state(events), events) for events in batches]
+
+
+def _apply_batch_state(filter, state):
+    if state is not None:
+        filter.conditions = filter.conditions or []
+        filter.conditions.append(["timestamp", "<=", state["timestamp"]])
+        filter.conditions.append(
+            [["timestamp", "<", state["timestamp"]], ["event_id", "<", state["event_id"]]]
+        )
+
+
+def _get_batch_state(events):
+    if events:
+        return {"timestamp": events[-1].timestamp, "event_id": events[-1].event_id}
+    return None
 
 
 class RangeQuerySetWrapper:
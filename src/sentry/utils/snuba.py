@@ -2,9 +2,10 @@ import functools
 import logging
 import os
 import re
+import threading
 import time
 from collections import namedtuple
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
 from copy import deepcopy
 from datetime import datetime, timedelta
@@ -22,6 +23,7 @@ from sentry_sdk import Hub
 from snuba_sdk import Request
 from snuba_sdk.legacy import json_to_snql
 
+from sentry import options
 from sentry.models import (
     Environment,
     Group,
@@ -365,6 +367,14 @@ _snuba_pool = connection_from_url(
 )
 _query_thread_pool = ThreadPoolExecutor(max_workers=10)
 
+# Queries (by cache key) that are currently being executed by this process.
+# Other threads wait for their result instead of sending the same query.
+_inflight_queries: MutableMapping[str, Future] = {}
+_inflight_queries_lock = threading.Lock()
+
+# Revalidates stale cache entries, see ``SENTRY_SNUBA_CACHE_STALE_SECONDS``.
+_cache_refresh_pool = ThreadPoolExecutor(max_workers=2)
+
 
 epoch_naive = datetime(1970, 1, 1, tzinfo=None)
 
@@ -763,14 +773,37 @@ def bulk_snql_query(
     return _apply_cache_and_build_results(params, referrer=referrer, use_cache=use_cache)
 
 
-def get_cache_key(query: SnubaQuery) -> str:
+# Datetime literals, as found in legacy queries (``from_date``, ``to_date``)
+# and in the conditions of SnQL queries.
+_DATETIME_LITERAL_RE = re.compile(
+    r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?"
+)
+
+
+def _floor_datetime_literal(match: "re.Match[str]", granularity: int) -> str:
+    value = parse_datetime(match.group(0))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=pytz.utc)
+    timestamp = int(to_timestamp(value))
+    return str(timestamp - timestamp % granularity)
+
+
+def get_cache_key(query: SnubaQuery, granularity: int = 0) -> str:
     if isinstance(query, Request):
         hashable = str(query)
     else:
         hashable = json.dumps(query, sort_keys=True)
 
+    # Floor all timestamps of the query, so that queries with a sliding time
+    # window (e.g. dashboards refreshing with ``end`` set to now) share cache
+    # entries.
+    if granularity:
+        hashable = _DATETIME_LITERAL_RE.sub(
+            functools.partial(_floor_datetime_literal, granularity=granularity), hashable
+        )
+
     # sqc - Snuba Query Cache
-    return f"sqc:{sha1(hashable.encode('utf-8')).hexdigest()}"
+    return f"sqc:2:{sha1(hashable.encode('utf-8')).hexdigest()}"
 
 
 def bulk_raw_query(
@@ -792,40 +825,126 @@ def _apply_cache_and_build_results(
     if referrer:
         headers["referer"] = referrer
 
+    if not use_cache and referrer in options.get("snuba.query-cache.referrers"):
+        use_cache = True
+
     # Store the original position of the query so that we can maintain the order
     query_param_list = list(enumerate(snuba_param_list))
 
     results = []
 
     if use_cache:
-        cache_keys = [get_cache_key(query_params[0]) for _, query_params in query_param_list]
+        metric_tags = {"referrer": referrer or "unknown"}
+        granularity = (
+            settings.SENTRY_SNUBA_CACHE_WINDOW_SECONDS
+            if referrer in options.get("snuba.query-cache.window-referrers")
+            else 0
+        )
+        cache_keys = [
+            get_cache_key(query_params[0], granularity) for _, query_params in query_param_list
+        ]
         cache_data = cache.get_many(cache_keys)
-        to_query: List[Tuple[int, SnubaQueryBody, Optional[str]]] = []
+        now = time.time()
+        to_query: List[Tuple[int, SnubaQueryBody, str]] = []
         for (query_pos, query_params), cache_key in zip(query_param_list, cache_keys):
             cached_result = cache_data.get(cache_key)
-            metric_tags = {"referrer": referrer} if referrer else None
             if cached_result is None:
                 metrics.incr("snuba.query_cache.miss", tags=metric_tags)
                 to_query.append((query_pos, query_params, cache_key))
+                continue
+
+            cached_result = json.loads(cached_result)
+            if cached_result["fresh_until"] < now:
+                metrics.incr("snuba.query_cache.stale", tags=metric_tags)
+                _revalidate_cached_query(query_params, headers, cache_key, metric_tags)
             else:
                 metrics.incr("snuba.query_cache.hit", tags=metric_tags)
-                results.append((query_pos, json.loads(cached_result)))
-    else:
-        to_query = [(query_pos, query_params, None) for query_pos, query_params in query_param_list]
+            results.append((query_pos, cached_result["result"]))
 
-    if to_query:
-        query_results = _bulk_snuba_query([item[1] for item in to_query], headers)
-        for result, (query_pos, _, cache_key) in zip(query_results, to_query):
-            if cache_key:
-                cache.set(cache_key, json.dumps(result), settings.SENTRY_SNUBA_CACHE_TTL_SECONDS)
-            results.append((query_pos, result))
+        if to_query:
+            results.extend(_cached_bulk_snuba_query(to_query, headers, metric_tags))
+    elif snuba_param_list:
+        results.extend(enumerate(_bulk_snuba_query(snuba_param_list, headers)))
 
     # Sort so that we get the results back in the original param list order
-    results.sort()
+    results.sort(key=lambda result: result[0])
     # Drop the sort order val
     return [result[1] for result in results]
 
 
+def _cached_bulk_snuba_query(
+    to_query: Sequence[Tuple[int, SnubaQueryBody, str]],
+    headers: Mapping[str, str],
+    metric_tags: Mapping[str, str],
+) -> List[Tuple[int, Mapping[str, Any]]]:
+    """
+    Runs ``(position, query, cache key)`` triples and stores their results in
+    the cache. Queries that are already running in another thread of this
+    process are not sent again, their result is awaited instead.
+    """
+    leaders = []
+    followers = []
+    with _inflight_queries_lock:
+        for query_pos, query_params, cache_key in to_query:
+            future = _inflight_queries.get(cache_key)
+            if future is None:
+                future = _inflight_queries[cache_key] = Future()
+                leaders.append((query_pos, query_params, cache_key, future))
+            else:
+                followers.append((query_pos, future))
+
+    results = []
+    if leaders:
+        try:
+            query_results = _bulk_snuba_query([leader[1] for leader in leaders], headers)
+            fresh_until = time.time() + settings.SENTRY_SNUBA_CACHE_TTL_SECONDS
+            for result, (query_pos, _, cache_key, future) in zip(query_results, leaders):
+                cached_result = json.dumps({"fresh_until": fresh_until, "result": result})
+                cache.set(
+                    cache_key,
+                    cached_result,
+                    settings.SENTRY_SNUBA_CACHE_TTL_SECONDS
+                    + settings.SENTRY_SNUBA_CACHE_STALE_SECONDS,
+                )
+                future.set_result(cached_result)
+                results.append((query_pos, result))
+        except BaseException as error:
+            for _, _, _, future in leaders:
+                if not future.done():
+                    future.set_exception(error)
+            raise
+        finally:
+            with _inflight_queries_lock:
+                for _, _, cache_key, _ in leaders:
+                    del _inflight_queries[cache_key]
+
+    for query_pos, future in followers:
+        metrics.incr("snuba.query_cache.coalesced", tags=metric_tags)
+        # Every follower decodes its own copy, since callers mutate results.
+        results.append((query_pos, json.loads(future.result())["result"]))
+
+    return results
+
+
+def _revalidate_cached_query(
+    query_params: SnubaQueryBody,
+    headers: Mapping[str, str],
+    cache_key: str,
+    metric_tags: Mapping[str, str],
+) -> None:
+    with _inflight_queries_lock:
+        if cache_key in _inflight_queries:
+            return
+
+    def revalidate():
+        try:
+            _cached_bulk_snuba_query([(0, query_params, cache_key)], headers, metric_tags)
+        except Exception:
+            logger.warning("snuba.query_cache.revalidate-failed", exc_info=True)
+
+    _cache_refresh_pool.submit(revalidate)
+
+
 def _bulk_snuba_query(
     snuba_param_list: Sequence[SnubaQueryBody],
     headers: Mapping[str, str],
@@ -69,6 +69,10 @@ def projectconfig_cache_get_mock_config(monkeypatch):
     monkeypatch.setattr(
         "sentry.relay.projectconfig_cache.get", lambda *args, **kwargs: {"is_mock_config": True}
     )
+    monkeypatch.setattr(
+        "sentry.relay.projectconfig_cache.get_many",
+        lambda public_keys: {public_key: {"is_mock_config": True} for public_key in public_keys},
+    )
 
 
 @pytest.fixture
@@ -79,6 +83,10 @@ def single_mock_proj_cached(monkeypatch):
         return None
 
     monkeypatch.setattr("sentry.relay.projectconfig_cache.get", cache_get)
+    monkeypatch.setattr(
+        "sentry.relay.projectconfig_cache.get_many",
+        lambda public_keys: {public_key: cache_get(public_key) for public_key in public_keys},
+    )
 
 
 @pytest.fixture
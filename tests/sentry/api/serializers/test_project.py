@@ -171,13 +171,14 @@ class ProjectSerializerTest(TestCase):
         assert "test-feature" in result["features"]
         assert "disabled-feature" not in result["features"]
 
+    @mock.patch("sentry.features.helpers.features")
     @mock.patch("sentry.api.serializers.project.features")
-    def test_project_features(self, mock_features):
+    def test_project_features(self, mock_features, mock_helper_features):
         test_features = features.FeatureManager()
         mock_features.all = test_features.all
         mock_features.has = test_features.has
-        mock_features.batch_has = test_features.batch_has
-        mock_features.has_for_batch = test_features.has_for_batch
+        mock_helper_features.batch_has = test_features.batch_has
+        mock_helper_features.has_for_batch = test_features.has_for_batch
 
         early_flag = "projects:TEST_early"
         red_flag = "projects:TEST_red"
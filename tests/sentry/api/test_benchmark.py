@@ -0,0 +1,26 @@
+import pytest
+
+from sentry.api.event_search import parse_search_query, parse_tree
+from sentry.testutils.skips import requires_pytest_benchmark
+
+QUERIES = [
+    "is:unresolved assigned:me browser.name:Chrome",
+    'user.email:foo@example.com release:[1.2.1,1.2.2] !transaction:"/api/0/foo" time:-24h',
+    "count():>100 p95(transaction.duration):>300ms (os.name:Linux OR os.name:Windows)",
+    "event.type:transaction http.method:GET has:user measurements.lcp:>2.5s",
+]
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("cached", [False, True], ids=["uncached", "cached"])
+def test_benchmark_parse_search_query(cached, benchmark, monkeypatch):
+    if not cached:
+        monkeypatch.setattr("sentry.api.event_search.parse_tree", parse_tree.__wrapped__)
+
+    def run():
+        return [parse_search_query(query) for query in QUERIES]
+
+    results = benchmark(run)
+
+    benchmark.extra_info["queries_per_second"] = len(QUERIES) / benchmark.stats.stats.mean
+    assert all(results)
@@ -16,6 +16,7 @@ from sentry.api.event_search import (
     SearchKey,
     SearchValue,
     parse_search_query,
+    parse_tree,
 )
 from sentry.constants import MODULE_ROOT
 from sentry.exceptions import InvalidSearchQuery
@@ -398,6 +399,26 @@ class ParseSearchQueryBackendTest(SimpleTestCase):
                 SearchFilter(key=SearchKey(name="random"), operator="=", value=SearchValue("-2w"))
             ]
 
+    def test_parse_tree_cached(self):
+        parse_tree.cache_clear()
+        query = "user.email:foo@example.com release:1.2.1"
+        expected = parse_search_query(query)
+        assert parse_search_query(query, config_overrides={"allowed_keys": set()}) == expected
+        assert parse_tree.cache_info().hits == 1
+        assert parse_tree.cache_info().misses == 1
+
+        for _ in range(2):
+            with pytest.raises(InvalidSearchQuery):
+                parse_search_query("release:a\nrelease")
+
+    def test_rel_time_filter_cached(self):
+        now = timezone.now()
+        with freeze_time(now):
+            assert parse_search_query("time:-2w")[0].value.raw_value == now - timedelta(days=14)
+        # The parse tree is reused, the relative date is resolved again.
+        with freeze_time(now + timedelta(days=1)):
+            assert parse_search_query("time:-2w")[0].value.raw_value == now - timedelta(days=13)
+
     def test_aggregate_rel_time_filter(self):
         now = timezone.now()
         with freeze_time(now):
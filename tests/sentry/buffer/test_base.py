@@ -69,3 +69,26 @@ class BufferTest(TestCase):
         self.buf.process(Group, columns, filters, {"last_seen": the_date}, signal_only=True)
         group.refresh_from_db()
         assert group.times_seen == prev_times_seen
+
+    def test_process_batch(self):
+        group = Group.objects.create(project=Project(id=1))
+        other_group = Group.objects.create(project=Project(id=1))
+        the_date = timezone.now() + timedelta(days=5)
+        self.buf.process_batch(
+            Group,
+            [
+                ({"times_seen": 1}, {"id": group.id}, {"last_seen": the_date}, None),
+                ({"times_seen": 3}, {"pk": other_group.id}, {"last_seen": the_date}, None),
+                ({"times_seen": 1}, {"id": 0}, {"last_seen": the_date}, None),
+            ],
+        )
+        group_ = Group.objects.get(id=group.id)
+        assert group_.times_seen == group.times_seen + 1
+        assert group_.last_seen == the_date
+        assert Group.objects.get(id=other_group.id).times_seen == other_group.times_seen + 3
+        assert not Group.objects.filter(id=0).exists()
+
+    def test_process_batch_falls_back_to_process(self):
+        filters = {"project_id": self.project.id, "release_id": self.release.id}
+        self.buf.process_batch(ReleaseProject, [({"new_groups": 1}, filters, None, None)])
+        assert ReleaseProject.objects.filter(new_groups=1, **filters).exists()
@@ -0,0 +1,39 @@
+from unittest import mock
+
+import pytest
+from django.utils import timezone
+
+from sentry.buffer.redis import RedisBuffer
+from sentry.models import Group
+from sentry.testutils.skips import requires_pytest_benchmark
+
+GROUP_COUNT = 200
+INCRS_PER_GROUP = 5
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("bulk_flush", [False, True], ids=["process_incr", "bulk_flush"])
+def test_benchmark_process_pending(bulk_flush, benchmark, factories, default_project):
+    buf = RedisBuffer(incr_batch_size=2, bulk_flush=bulk_flush)
+    groups = [factories.create_group(project=default_project) for _ in range(GROUP_COUNT)]
+    tasks = []
+
+    def fill():
+        now = timezone.now()
+        for group in groups:
+            for _ in range(INCRS_PER_GROUP):
+                buf.incr(Group, {"times_seen": 1}, {"id": group.id}, {"last_seen": now})
+        return (), {}
+
+    def run_task(kwargs):
+        tasks.append(kwargs)
+        buf.process(**kwargs)
+
+    with mock.patch("sentry.buffer.redis.process_incr") as process_incr:
+        process_incr.apply_async.side_effect = lambda kwargs: run_task(kwargs)
+        benchmark.pedantic(buf.process_pending, setup=fill, rounds=5)
+
+    benchmark.extra_info["rows_per_second"] = GROUP_COUNT / benchmark.stats.stats.mean
+    benchmark.extra_info["celery_tasks_per_flush"] = len(tasks) / 5
+    assert Group.objects.get(id=groups[0].id).times_seen == 1 + INCRS_PER_GROUP * 5
@@ -7,7 +7,7 @@ from django.utils.encoding import force_text
 from freezegun import freeze_time
 
 from sentry.buffer.redis import RedisBuffer
-from sentry.models import Group, Project
+from sentry.models import Group, Project, ReleaseProject
 from sentry.testutils import TestCase
 
 
@@ -195,6 +195,65 @@ class RedisBufferTest(TestCase):
         # Make sure we didn't queue up more
         assert len(process_pending.apply_async.mock_calls) == 2
 
+    @mock.patch("sentry.buffer.redis.process_incr")
+    def test_process_pending_bulk_flush(self, process_incr):
+        self.buf.bulk_flush = True
+        self.buf.bulk_batch_size = 2
+        other_group = self.create_group(project=self.project)
+        now = timezone.now()
+        for group in (self.group, other_group, self.group):
+            self.buf.incr(Group, {"times_seen": 2}, {"id": group.id}, {"last_seen": now})
+        times_seen = {
+            group.id: group.times_seen
+            for group in Group.objects.filter(id__in=[self.group.id, other_group.id])
+        }
+
+        self.buf.process_pending()
+
+        assert not process_incr.apply_async.called
+        self.group.refresh_from_db()
+        other_group.refresh_from_db()
+        assert self.group.times_seen == times_seen[self.group.id] + 4
+        assert other_group.times_seen == times_seen[other_group.id] + 2
+        assert self.group.last_seen == now
+        client = self.buf.cluster.get_routing_client()
+        assert client.zrange("b:p", 0, -1) == []
+
+    @mock.patch("sentry.buffer.redis.process_incr")
+    def test_process_pending_bulk_flush_non_pk_filters(self, process_incr):
+        self.buf.bulk_flush = True
+        release = self.create_release(project=self.project)
+        release_project = ReleaseProject.objects.get(release=release, project=self.project)
+        new_groups = release_project.new_groups or 0
+        times_seen = self.group.times_seen
+
+        self.buf.incr(Group, {"times_seen": 1}, {"id": self.group.id})
+        self.buf.incr(
+            ReleaseProject,
+            {"new_groups": 1},
+            {"release_id": release.id, "project_id": self.project.id},
+        )
+        self.buf.process_pending()
+
+        assert not process_incr.apply_async.called
+        release_project.refresh_from_db()
+        self.group.refresh_from_db()
+        assert release_project.new_groups == new_groups + 1
+        assert self.group.times_seen == times_seen + 1
+
+    @mock.patch("sentry.buffer.base.Buffer.process_batch")
+    def test_process_pending_bulk_flush_coalesces(self, process_batch):
+        self.buf.bulk_flush = True
+        self.buf.incr(Group, {"times_seen": 1}, {"id": self.group.id}, {"level": 1})
+        self.buf.incr(Group, {"times_seen": 3}, {"id": self.group.id}, {"level": 2})
+        self.buf.incr(Group, {"times_seen": 1}, {"id": self.group.id}, signal_only=True)
+
+        self.buf.process_pending()
+
+        process_batch.assert_called_once_with(
+            Group, [({"times_seen": 5}, {"id": self.group.id}, {"level": 2}, True)]
+        )
+
     @mock.patch("sentry.buffer.redis.RedisBuffer._make_key", mock.Mock(return_value="foo"))
     @mock.patch("sentry.buffer.base.Buffer.process")
     def test_process_uses_signal_only(self, process):
@@ -0,0 +1,54 @@
+import time
+from unittest import mock
+
+import pytest
+
+from sentry.data_export.base import ExportQueryType
+from sentry.data_export.models import ExportedData
+from sentry.data_export.tasks import assemble_download
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.helpers.task_runner import TaskRunner
+from sentry.testutils.skips import requires_pytest_benchmark
+
+ROW_COUNT = 20000
+BATCH_SIZE = 1000
+# Simulated latency of a Snuba query
+QUERY_LATENCY = 0.05
+
+ROWS = [
+    {"title": f"<unlabeled event {i}>", "project": "bar", "count": i, "p95": i / 3}
+    for i in range(ROW_COUNT)
+]
+
+
+def discover_query(offset, limit, **kwargs):
+    time.sleep(QUERY_LATENCY)
+    return {"data": [dict(row) for row in ROWS[offset : offset + limit]]}
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("stream_workers", [0, 4], ids=["batched", "streamed"])
+def test_benchmark_assemble_download(stream_workers, benchmark, default_user, default_project):
+    def setup():
+        data_export = ExportedData.objects.create(
+            user=default_user,
+            organization=default_project.organization,
+            query_type=ExportQueryType.DISCOVER,
+            query_info={
+                "project": [default_project.id],
+                "field": ["title", "project", "count()", "p95()"],
+                "query": "",
+            },
+        )
+        return (data_export.id,), {}
+
+    def export(data_export_id):
+        assemble_download(data_export_id, batch_size=BATCH_SIZE)
+
+    with override_options({"dataexport.stream-workers": stream_workers}), mock.patch(
+        "sentry.snuba.discover.query", side_effect=discover_query
+    ), mock.patch("sentry.data_export.models.ExportedData.email_success"), TaskRunner():
+        benchmark.pedantic(export, setup=setup, rounds=3)
+
+    benchmark.extra_info["rows_per_second"] = ROW_COUNT / benchmark.stats.stats.mean
@@ -1,10 +1,18 @@
+import csv
+import io
 from unittest.mock import patch
 
 from django.db import IntegrityError
 
 from sentry.data_export.base import ExportQueryType
-from sentry.data_export.models import ExportedData
-from sentry.data_export.tasks import assemble_download, merge_export_blobs
+from sentry.data_export.models import ExportedData, ExportedDataBlob
+from sentry.data_export.tasks import (
+    CsvRowEncoder,
+    assemble_download,
+    get_processor,
+    merge_export_blobs,
+    stream_export_batch,
+)
 from sentry.exceptions import InvalidSearchQuery
 from sentry.models import File
 from sentry.search.events.constants import TIMEOUT_ERROR_MESSAGE
@@ -654,6 +662,134 @@ class AssembleDownloadLargeTest(TestCase, SnubaTestCase):
         assert emailer.called
 
 
+def fake_discover_query(rows):
+    def query(offset, limit, **kwargs):
+        return {"data": [dict(row) for row in rows[offset : offset + limit]]}
+
+    return query
+
+
+class StreamExportTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user()
+        self.org = self.create_organization()
+        self.project = self.create_project(organization=self.org)
+        self.rows = [{"title": f"title {i}", "count": i} for i in range(10)]
+        self.data_export = ExportedData.objects.create(
+            user=self.user,
+            organization=self.org,
+            query_type=ExportQueryType.DISCOVER,
+            query_info={"project": [self.project.id], "field": ["title", "count()"], "query": ""},
+        )
+
+    def expected_contents(self, rows):
+        return b"title,count\r\n" + b"".join(
+            f"{row['title']},{row['count']}\r\n".encode() for row in rows
+        )
+
+    def stream(self, **kwargs):
+        processor = get_processor(self.data_export, None)
+        with patch("sentry.snuba.discover.query", side_effect=fake_discover_query(self.rows)):
+            return stream_export_batch(processor, self.data_export, **kwargs)
+
+    @patch("sentry.data_export.models.ExportedData.email_success")
+    def test_assemble_download(self, emailer):
+        with self.options({"dataexport.stream-workers": 3}), patch(
+            "sentry.snuba.discover.query", side_effect=fake_discover_query(self.rows)
+        ), self.tasks():
+            assemble_download(self.data_export.id, batch_size=3)
+
+        de = ExportedData.objects.get(id=self.data_export.id)
+        assert de.date_finished is not None
+        with de._get_file().getfile() as f:
+            assert f.read() == self.expected_contents(self.rows)
+        assert emailer.called
+
+    def test_stream_export_batch(self):
+        rows, next_offset, bytes_written = self.stream(
+            export_limit=100,
+            batch_size=3,
+            offset=0,
+            bytes_written=0,
+            workers=2,
+            write_header=True,
+            blob_size=16,
+        )
+        contents = self.expected_contents(self.rows)
+        assert len(rows) == 1
+        assert next_offset == 10
+        assert bytes_written == len(contents)
+
+        blobs = ExportedDataBlob.objects.filter(data_export=self.data_export).order_by("offset")
+        assert [blob.offset for blob in blobs] == list(range(0, len(contents), 16))
+
+        merge_export_blobs(self.data_export.id)
+        with ExportedData.objects.get(id=self.data_export.id)._get_file().getfile() as f:
+            assert f.read() == contents
+
+    def test_stream_export_batch_export_limit(self):
+        rows, next_offset, bytes_written = self.stream(
+            export_limit=6, batch_size=3, offset=3, bytes_written=100, workers=4
+        )
+        assert rows == self.rows[3:6]
+        assert next_offset == 6
+        assert bytes_written == len(self.expected_contents(self.rows[3:6])) - len(
+            b"title,count\r\n"
+        )
+
+    def test_stream_export_batch_retry(self):
+        kwargs = dict(
+            export_limit=100, batch_size=3, offset=0, bytes_written=0, workers=2, blob_size=16
+        )
+        self.stream(**kwargs)
+        self.stream(**kwargs)
+
+        offsets = ExportedDataBlob.objects.filter(data_export=self.data_export).values_list(
+            "offset", flat=True
+        )
+        assert len(offsets) == len(set(offsets))
+
+    @patch("sentry.data_export.tasks.MAX_FILE_SIZE", 40)
+    def test_stream_export_batch_file_too_big(self):
+        _, _, bytes_written = self.stream(
+            export_limit=100, batch_size=3, offset=0, bytes_written=0, workers=2, blob_size=16
+        )
+        assert bytes_written == 0
+        assert not ExportedDataBlob.objects.filter(data_export=self.data_export).exists()
+
+    @patch("sentry.data_export.tasks.MAX_FILE_SIZE", 100)
+    def test_stream_export_batch_file_too_big_mid_batch(self):
+        kwargs = dict(batch_size=3, workers=2, blob_size=16)
+        _, _, bytes_written = self.stream(
+            export_limit=3, offset=0, bytes_written=0, write_header=True, **kwargs
+        )
+        assert bytes_written == len(self.expected_contents(self.rows[:3]))
+
+        # The next batch stores two blobs before reaching the file size limit.
+        _, _, new_bytes_written = self.stream(
+            export_limit=100, offset=3, bytes_written=bytes_written, **kwargs
+        )
+        assert new_bytes_written == 0
+
+        merge_export_blobs(self.data_export.id)
+        with ExportedData.objects.get(id=self.data_export.id)._get_file().getfile() as f:
+            assert f.read() == self.expected_contents(self.rows[:3])
+
+
+def test_csv_row_encoder():
+    fields = ["a", "b", "c"]
+    rows = [{"a": 1, "b": "x,y", "d": "ignored"}, {"c": 'say "hi"'}, {}]
+
+    expected = io.StringIO()
+    writer = csv.DictWriter(expected, fields, extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(rows)
+
+    encoder = CsvRowEncoder(fields)
+    assert encoder.encode_header() + encoder.encode(rows) == expected.getvalue().encode()
+
+
 class MergeExportBlobsTest(TestCase, SnubaTestCase):
     def test_task_persistent_name(self):
         assert merge_export_blobs.name == "sentry.data_export.tasks.merge_blobs"
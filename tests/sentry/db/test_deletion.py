@@ -57,3 +57,76 @@ class BulkDeleteQueryIteratorTestCase(TransactionTestCase):
             results.update(chunk)
 
         assert results == expected_group_ids
+
+
+class BulkDeleteQueryKeyRangeTest(TestCase):
+    def test_get_key_ranges(self):
+        groups = [self.create_group() for _ in range(5)]
+        first, last = groups[0].id, groups[-1].id
+
+        key_ranges = BulkDeleteQuery(model=Group).get_key_ranges(2)
+        assert len(key_ranges) == 2
+        assert key_ranges[0][0] == first - 1
+        assert key_ranges[0][1] == key_ranges[1][0]
+        assert key_ranges[1][1] == last
+
+        assert BulkDeleteQuery(model=Group).get_key_ranges(100)[-1][1] == last
+
+    def test_get_key_ranges_cutoff(self):
+        now = timezone.now()
+        groups = [
+            self.create_group(last_seen=now - timedelta(days=2 if i < 2 else 0)) for i in range(6)
+        ]
+
+        # Rows newer than the cutoff are not part of any range.
+        key_ranges = BulkDeleteQuery(model=Group, dtfield="last_seen", days=1).get_key_ranges(4)
+        assert key_ranges[0][0] == groups[0].id - 1
+        assert key_ranges[-1][1] == groups[1].id
+
+        other_project = self.create_project()
+        assert (
+            BulkDeleteQuery(
+                model=Group, dtfield="last_seen", days=1, project_id=other_project.id
+            ).get_key_ranges(4)
+            == []
+        )
+
+    def test_get_key_ranges_empty(self):
+        assert BulkDeleteQuery(model=Group).get_key_ranges(4) == []
+
+    def test_iterator_key_range(self):
+        now = timezone.now()
+        groups = [
+            self.create_group(last_seen=now - timedelta(days=2 if i % 2 else 0)) for i in range(5)
+        ]
+        start, end = groups[0].id - 1, groups[-1].id
+
+        pages = list(
+            BulkDeleteQuery(model=Group, dtfield="last_seen", days=1).iterator_key_range(
+                start, end, batch_size=2
+            )
+        )
+        assert pages == [
+            (groups[1].id, (groups[1].id,)),
+            (groups[3].id, (groups[3].id,)),
+            (groups[4].id, ()),
+        ]
+
+    def test_execute_key_range(self):
+        now = timezone.now()
+        groups = [
+            self.create_group(last_seen=now - timedelta(days=2 if i < 4 else 0)) for i in range(6)
+        ]
+
+        # only rows inside of the range are deleted
+        pages = list(
+            BulkDeleteQuery(model=Group, dtfield="last_seen", days=1).execute_key_range(
+                groups[0].id, groups[-1].id, batch_size=2
+            )
+        )
+        assert pages == [(groups[2].id, 2), (groups[4].id, 1), (groups[5].id, 0)]
+        assert list(Group.objects.values_list("id", flat=True).order_by("id")) == [
+            groups[0].id,
+            groups[4].id,
+            groups[5].id,
+        ]
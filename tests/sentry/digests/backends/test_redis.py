@@ -151,3 +151,93 @@ class RedisBackendTestCase(TestCase):
 
         with backend.digest("timeline", 0) as records:
             assert len(set(records)) == n
+
+    def test_digest_many(self):
+        backend = RedisBackend()
+
+        record_1 = Record("record:1", "value", time.time())
+        record_2 = Record("record:2", "value", time.time())
+        backend.add("timeline:1", record_1)
+        backend.add("timeline:2", record_2)
+
+        with backend.digest_many(
+            ["timeline:1", "timeline:2", "timeline:missing"], {"timeline:1": 0, "timeline:2": 0}
+        ) as timelines:
+            assert timelines == {"timeline:1": [record_1], "timeline:2": [record_2]}
+
+        # Both timelines were closed and moved back to the waiting state.
+        assert {entry.key for entry in backend.schedule(time.time())} == {
+            "timeline:1",
+            "timeline:2",
+        }
+        with backend.digest_many(["timeline:1", "timeline:2"]) as timelines:
+            assert timelines == {"timeline:1": [], "timeline:2": []}
+
+        # Empty timelines were deleted when closed.
+        assert set(backend.schedule(time.time())) == set()
+        assert len(backend._get_connection("timeline:1").keys("d:*")) == 0
+
+    def test_digest_many_skips_locked_timelines(self):
+        backend = RedisBackend()
+
+        record_1 = Record("record:1", "value", time.time())
+        record_2 = Record("record:2", "value", time.time())
+        backend.add("timeline:1", record_1)
+        backend.add("timeline:2", record_2)
+
+        with backend.digest("timeline:1", 0):
+            with backend.digest_many(["timeline:1", "timeline:2"]) as timelines:
+                assert timelines == {"timeline:2": [record_2]}
+
+        with pytest.raises(InvalidState):
+            with backend.digest("timeline:2", 0):
+                pass
+
+    def test_digest_many_lock_expired(self):
+        backend = RedisBackend()
+
+        record_1 = Record("record:1", "value", time.time())
+        record_2 = Record("record:2", "value", time.time())
+        backend.add("timeline:1", record_1)
+        backend.add("timeline:2", record_2)
+
+        connection = backend._get_connection("timeline:1")
+        lock_key = f"{backend.lock_backend.prefix}{backend.namespace}:t:timeline:1"
+        with backend.digest_many(
+            ["timeline:1", "timeline:2"], {"timeline:1": 0, "timeline:2": 0}
+        ) as timelines:
+            assert timelines == {"timeline:1": [record_1], "timeline:2": [record_2]}
+            # The lock expires and the timeline is claimed by another worker.
+            connection.set(lock_key, "other")
+
+        # The timeline whose lock was lost is neither closed nor delivered.
+        assert timelines == {"timeline:2": [record_2]}
+        assert connection.get(lock_key) == b"other"
+
+        connection.delete(lock_key)
+        with backend.digest("timeline:1", 0) as records:
+            assert records == [record_1]
+
+    def test_digest_many_failure_recovery(self):
+        backend = RedisBackend()
+
+        record_1 = Record("record:1", "value", time.time())
+        record_2 = Record("record:2", "value", time.time())
+        backend.add("timeline:1", record_1)
+        backend.add("timeline:2", record_2)
+
+        with pytest.raises(Exception):
+            with backend.digest_many(["timeline:1"]) as timelines:
+                raise Exception("This causes the digests to not be closed.")
+
+        # Removed timelines are released but not closed.
+        with backend.digest_many(["timeline:1", "timeline:2"], {"timeline:2": 0}) as timelines:
+            assert timelines == {"timeline:1": [record_1], "timeline:2": [record_2]}
+            del timelines["timeline:1"]
+
+        # Only the first timeline is still ready and can be digested again.
+        with backend.digest("timeline:1", 0) as records:
+            assert records == [record_1]
+        with pytest.raises(InvalidState):
+            with backend.digest("timeline:2", 0):
+                pass
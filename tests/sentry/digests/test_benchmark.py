@@ -0,0 +1,53 @@
+from unittest import mock
+
+import pytest
+
+import sentry
+from sentry.digests.backends.redis import RedisBackend
+from sentry.digests.notifications import event_to_record
+from sentry.models import Rule
+from sentry.tasks.digests import deliver_digest, deliver_digests
+from sentry.testutils.helpers.datetime import before_now, iso_format
+from sentry.testutils.skips import requires_pytest_benchmark
+
+TIMELINE_COUNT = 100
+EVENTS_PER_TIMELINE = 5
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("batch", [False, True], ids=["deliver_digest", "deliver_digests"])
+def test_benchmark_deliver_digests(batch, benchmark, factories, default_project):
+    backend = RedisBackend()
+    rule = Rule.objects.create(project=default_project, label="Test Rule", data={})
+    events = [
+        factories.store_event(
+            data={"timestamp": iso_format(before_now(days=1)), "fingerprint": [f"group-{i}"]},
+            project_id=default_project.id,
+        )
+        for i in range(EVENTS_PER_TIMELINE)
+    ]
+    keys = [f"mail:p:{default_project.id}:Member:{i}" for i in range(TIMELINE_COUNT)]
+
+    def fill():
+        for key in keys:
+            for event in events:
+                backend.add(key, event_to_record(event, [rule]), increment_delay=0, maximum_delay=0)
+        # Timelines closed by the previous round are waiting, make them ready.
+        list(backend.schedule(float("inf")))
+        return (), {}
+
+    def deliver():
+        if batch:
+            deliver_digests(keys)
+        else:
+            for key in keys:
+                deliver_digest(key)
+
+    with mock.patch.object(sentry, "digests", backend), mock.patch(
+        "sentry.mail.mail_adapter.notify_digest"
+    ) as notify_digest:
+        benchmark.pedantic(deliver, setup=fill, rounds=5)
+
+    benchmark.extra_info["digests_per_second"] = TIMELINE_COUNT / benchmark.stats.stats.mean
+    assert notify_digest.call_count == TIMELINE_COUNT * 5
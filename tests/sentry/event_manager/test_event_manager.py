@@ -34,8 +34,10 @@ from sentry.event_manager import (
     EventUser,
     HashDiscarded,
     _get_event_instance,
+    _save_aggregate,
     _save_grouphash_and_group,
     has_pending_commit_resolution,
+    save_error_events,
 )
 from sentry.eventstore.models import Event
 from sentry.grouping.utils import hash_from_values
@@ -3601,6 +3603,64 @@ class DSLatestReleaseBoostTest(TestCase):
             ]
 
 
+@region_silo_test
+class SaveErrorEventsTest(TestCase, SnubaTestCase):
+    def make_job(self, project, **kwargs):
+        manager = EventManager(make_event(**kwargs))
+        manager.normalize()
+        return {
+            "data": manager.get_data(),
+            "project_id": project.id,
+            "raw": False,
+            "start_time": None,
+            "cache_key": None,
+        }
+
+    def test_batch(self):
+        other_project = self.create_project(organization=self.organization)
+        jobs = [
+            self.make_job(self.project, message="foo", release="1.0", environment="prod"),
+            self.make_job(self.project, message="foo", release="1.0", environment="prod"),
+            self.make_job(other_project, message="foo", release="1.0", environment="prod"),
+        ]
+        projects = {self.project.id: self.project, other_project.id: other_project}
+
+        with mock.patch(
+            "sentry.event_manager.Environment.get_or_create", wraps=Environment.get_or_create
+        ) as get_or_create_environment:
+            save_error_events(jobs, projects)
+
+        assert get_or_create_environment.call_count == 2
+        first, second, third = (job["groups"][0] for job in jobs)
+        assert first.group.id == second.group.id != third.group.id
+        assert first.is_new_group_environment
+        assert not second.is_new_group_environment
+        assert third.is_new_group_environment
+        assert first.group_release.id == second.group_release.id
+        assert GroupRelease.objects.filter(group_id=first.group.id).count() == 1
+        for job in jobs:
+            assert job["event"].group_id == job["groups"][0].group.id
+
+    def test_discarded(self):
+        jobs = [
+            self.make_job(self.project, message="foo"),
+            self.make_job(self.project, message="bar"),
+        ]
+        projects = {self.project.id: self.project}
+
+        with mock.patch(
+            "sentry.event_manager._save_aggregate",
+            side_effect=[HashDiscarded("discarded"), mock.DEFAULT],
+            wraps=_save_aggregate,
+        ):
+            save_error_events(jobs, projects)
+
+        discarded, saved = jobs
+        assert isinstance(discarded["discarded"], HashDiscarded)
+        assert discarded["groups"] == []
+        assert saved["groups"][0].group.message.startswith("bar")
+
+
 class TestSaveGroupHashAndGroup(TransactionTestCase):
     def test(self):
         perf_data = load_data("transaction-n-plus-one", timestamp=before_now(minutes=10))
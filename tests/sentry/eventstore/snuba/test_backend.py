@@ -133,6 +133,18 @@ class SnubaEventStorageTest(TestCase, SnubaTestCase):
         assert len(events) == 1
         assert get_multi.call_count == 0
 
+    @mock.patch("sentry.nodestore.get_multi")
+    def test_get_unfetched_events_multi(self, get_multi):
+        events1, events2 = self.eventstore.get_unfetched_events_multi(
+            [
+                Filter(project_ids=[self.project1.id]),
+                Filter(project_ids=[self.project2.id], conditions=[["type", "!=", "transaction"]]),
+            ]
+        )
+        assert [event.event_id for event in events1] == ["a" * 32]
+        assert [event.event_id for event in events2] == ["c" * 32, "b" * 32]
+        assert get_multi.call_count == 0
+
     @mock.patch("sentry.nodestore.get_multi")
     def test_get_unfetched_transactions(self, get_multi):
         transactions_proj1 = self.eventstore.get_unfetched_transactions(
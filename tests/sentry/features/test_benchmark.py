@@ -0,0 +1,19 @@
+import pytest
+
+from sentry.api.serializers.models.project import get_features_for_projects
+from sentry.testutils.skips import requires_pytest_benchmark
+
+PROJECT_COUNT = 1000
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db
+def test_benchmark_get_features_for_projects(benchmark, factories, default_organization):
+    projects = [
+        factories.create_project(organization=default_organization) for _ in range(PROJECT_COUNT)
+    ]
+
+    result = benchmark(get_features_for_projects, projects, None)
+
+    benchmark.extra_info["projects_per_second"] = PROJECT_COUNT / benchmark.stats.stats.mean
+    assert len(result) == PROJECT_COUNT
@@ -5,8 +5,12 @@ from django.http import HttpRequest
 from rest_framework.response import Response
 
 from sentry import features
-from sentry.features import OrganizationFeature
-from sentry.features.helpers import any_organization_has_feature, requires_feature
+from sentry.features import OrganizationFeature, ProjectFeature
+from sentry.features.helpers import (
+    any_organization_has_feature,
+    batch_has_for_projects,
+    requires_feature,
+)
 from sentry.testutils import TestCase
 
 
@@ -80,3 +84,63 @@ def org_with_feature(org, feature):
     with patch("sentry.features.has") as has:
         has.side_effect = lambda f, _org, *a, **k: f == feature and org == _org
         yield
+
+
+class BatchHasForProjectsTest(TestCase):
+    def setUp(self):
+        self.projects = [self.create_project(organization=self.organization) for _ in range(3)]
+        self.other_project = self.create_project(organization=self.create_organization())
+        features.add("projects:batch-test-a", ProjectFeature)
+        features.add("projects:batch-test-b", ProjectFeature)
+
+    def test_entity_and_registered_handlers(self):
+        all_projects = self.projects + [self.other_project]
+        names = ["projects:batch-test-a", "projects:batch-test-b"]
+
+        def batch_has(feature_names, actor=None, projects=None, organization=None):
+            # The entity handler only knows about feature "a".
+            return {
+                f"project:{project.id}": {"projects:batch-test-a": project.id % 2 == 0}
+                for project in projects
+            }
+
+        def has_for_batch(name, organization, objects, actor=None):
+            assert name == "projects:batch-test-b"
+            return {obj: organization == self.organization for obj in objects}
+
+        with patch("sentry.features.batch_has", side_effect=batch_has) as mock_batch_has, patch(
+            "sentry.features.has_for_batch", side_effect=has_for_batch
+        ) as mock_has_for_batch:
+            result = batch_has_for_projects(names, all_projects, actor=self.user)
+
+        assert result == {
+            project: {
+                "projects:batch-test-a": project.id % 2 == 0,
+                "projects:batch-test-b": project in self.projects,
+            }
+            for project in all_projects
+        }
+        # One call per organization
+        assert mock_batch_has.call_count == 2
+        assert mock_has_for_batch.call_count == 2
+
+    def test_memoized_per_request(self):
+        names = ["projects:batch-test-a"]
+        request = HttpRequest()
+
+        with patch("sentry.features.batch_has", return_value=None), patch(
+            "sentry.features.has_for_batch",
+            side_effect=lambda name, organization, objects, actor=None: {
+                obj: True for obj in objects
+            },
+        ) as mock_has_for_batch:
+            with patch("sentry.app.env.request", request):
+                for _ in range(2):
+                    assert batch_has_for_projects(names, self.projects) == {
+                        project: {"projects:batch-test-a": True} for project in self.projects
+                    }
+            assert mock_has_for_batch.call_count == 1
+
+            # Without a request, nothing is memoized.
+            batch_has_for_projects(names, self.projects)
+            assert mock_has_for_batch.call_count == 2
@@ -1,22 +1,15 @@
 import pytest
 
 from sentry.grouping.api import get_default_grouping_config_dict
+from sentry.grouping.enhancer import ENHANCEMENT_BASES, Enhancements, create_match_frame
 from sentry.grouping.strategies.configurations import CONFIGURATIONS
+from sentry.testutils.skips import requires_pytest_benchmark
 from tests.sentry.grouping import grouping_input as grouping_inputs
 
 CONFIGS = {key: get_default_grouping_config_dict(key) for key in sorted(CONFIGURATIONS.keys())}
 
 
-def benchmark_available():
-    try:
-        import pytest_benchmark  # NOQA
-    except ModuleNotFoundError:
-        return False
-    else:
-        return True
-
-
-@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@requires_pytest_benchmark
 @pytest.mark.parametrize(
     "config_name", sorted(CONFIGURATIONS.keys()), ids=lambda x: x.replace("-", "_")
 )
@@ -37,3 +30,50 @@ def run_configuration(grouping_input, config):
     event.project = None
 
     event.get_hashes()
+
+
+def _custom_enhancements(rule_count):
+    rules = [
+        f"path:**/vendor/lib{i}/** -app\nfunction:handle_{i}_* +group\nmodule:com.example.m{i}.* -group"
+        for i in range(rule_count // 3)
+    ]
+    return Enhancements.from_config_string("\n".join(rules), bases=["newstyle:2023-01-11"])
+
+
+def _enhancement_frames(frame_count):
+    return [
+        {
+            "abs_path": f"/app/vendor/lib{i % 50}/src/file{i}.js",
+            "function": f"handle_{i % 70}_request",
+            "module": f"com.example.m{i % 40}.Foo",
+            "platform": "javascript",
+        }
+        for i in range(frame_count)
+    ]
+
+
+def _apply_uncompiled(enhancements, frames, platform):
+    cache = {}
+    match_frames = [create_match_frame(frame, platform) for frame in frames]
+    for rule in enhancements._updater_rules:
+        rule.get_matching_frame_actions(match_frames, platform, None, cache)
+
+
+def _apply_compiled(enhancements, frames, platform):
+    cache = {}
+    match_frames = [create_match_frame(frame, platform) for frame in frames]
+    compiled = enhancements.compiled_updater_rules
+    matched = compiled.match_frames(match_frames, cache)
+    for rule_idx in range(len(enhancements._updater_rules)):
+        compiled.get_matching_frame_actions(rule_idx, match_frames, matched, platform, None, cache)
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("apply", [_apply_uncompiled, _apply_compiled], ids=["rules", "compiled"])
+@pytest.mark.parametrize("rule_count", [0, 300, 3000])
+def test_benchmark_enhancements(apply, rule_count, benchmark):
+    assert "newstyle:2023-01-11" in ENHANCEMENT_BASES
+    enhancements = _custom_enhancements(rule_count)
+    frames = _enhancement_frames(100)
+
+    benchmark(apply, enhancements, frames, "javascript")
@@ -1,7 +1,15 @@
+import re
+
 import pytest
 
 from sentry.grouping.component import GroupingComponent
-from sentry.grouping.enhancer import Enhancements, InvalidEnhancerConfig, create_match_frame
+from sentry.grouping.enhancer import (
+    Enhancements,
+    InvalidEnhancerConfig,
+    create_match_frame,
+    dispatch,
+)
+from sentry.grouping.enhancer.dispatch import glob_to_prefilter
 
 
 def dump_obj(obj):
@@ -442,3 +450,85 @@ def test_app_no_matches(frame):
     enhancements = Enhancements.from_config_string("app:no +app")
     enhancements.apply_modifications_to_frame([frame], "native", None)
     assert frame.get("in_app")
+
+
+def test_compiled_rules_match_uncompiled():
+    enhancement = Enhancements.from_config_string(
+        """
+        path:**/node_modules/**         -app
+        !path:**/src/**                 -group
+        [ function:handler ] | module:std::* +app
+        function:foo* | [ function:bar ]  category=foo
+        category:foo                    -group
+        family:native function:?alloc   ^-group
+        module:[ab]*                    -app
+        error.type:Foo path:*.js        +group
+        """,
+        bases=["common:v1"],
+    )
+    frames = [
+        {"abs_path": "/app/node_modules/react/index.js", "function": "render"},
+        {"abs_path": "/app/src/index.js", "function": "handler"},
+        {"module": "std::vec", "function": "foo_bar", "platform": "native"},
+        {"function": "bar", "platform": "native"},
+        {"function": "malloc", "platform": "native"},
+        {"module": "abc", "filename": "C:\\src\\app.js"},
+    ]
+
+    for rules, compiled in (
+        (enhancement._modifier_rules, enhancement.compiled_modifier_rules),
+        (enhancement._updater_rules, enhancement.compiled_updater_rules),
+    ):
+        for exception_data in (None, {"type": "Foo"}):
+            match_frames = [create_match_frame(frame, "native") for frame in frames]
+            matched = compiled.match_frames(match_frames, {})
+            for rule_idx, rule in enumerate(rules):
+                assert compiled.get_matching_frame_actions(
+                    rule_idx, match_frames, matched, "native", exception_data, {}
+                ) == rule.get_matching_frame_actions(match_frames, "native", exception_data, {})
+
+
+def test_compiled_rules_see_modifications():
+    enhancement = Enhancements.from_config_string(
+        """
+        function:foo                    category=bar
+        category:bar                    +app
+        """
+    )
+    frames = [{"function": "foo"}, {"function": "baz"}]
+    enhancement.apply_modifications_to_frame(frames, "native", None)
+    assert frames[0]["in_app"] is True
+    assert "in_app" not in frames[1]
+
+
+def test_compiled_rules_share_bounded_frame_cache(monkeypatch):
+    monkeypatch.setattr(dispatch, "FRAME_CACHE_SIZE", 3)
+    monkeypatch.setattr(dispatch, "_frame_cache", {})
+
+    match_frames = [create_match_frame({"function": "foo"}, "native")]
+    for i in range(5):
+        compiled = Enhancements.from_config_string(f"function:foo{i}* -app").compiled_modifier_rules
+        compiled.match_frames(match_frames, {})
+        assert len(dispatch._frame_cache) <= 3
+
+    # Instances do not see each other's results.
+    assert compiled.match_frames(match_frames, {}) == [frozenset()]
+    foo = Enhancements.from_config_string("function:foo -app").compiled_modifier_rules
+    assert foo.match_frames(match_frames, {}) != [frozenset()]
+
+
+@pytest.mark.parametrize(
+    "pattern,path_like,values",
+    [
+        (b"**/test.js", True, [b"test.js", b"/foo/test.js", b"foo\\test.js"]),
+        (b"/foo/*", True, [b"foo/bar", b"/foo/bar"]),
+        (b"std::*", False, [b"std::vec", b"std::"]),
+        (b"?lloc", False, [b"malloc"]),
+    ],
+)
+def test_glob_to_prefilter(pattern, path_like, values):
+    regex = re.compile(glob_to_prefilter(pattern, path_like=path_like), re.DOTALL)
+    for value in values:
+        assert regex.fullmatch(value)
+    assert not regex.fullmatch(b"unrelated")
+    assert glob_to_prefilter(b"[ab]*") is None
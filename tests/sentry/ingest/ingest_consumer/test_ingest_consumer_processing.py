@@ -3,19 +3,20 @@ import time
 import uuid
 import zipfile
 from io import BytesIO
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 
 from sentry.event_manager import EventManager
 from sentry.ingest.ingest_consumer import (
+    IngestConsumerWorker,
     process_attachment_chunk,
     process_event,
     process_individual_attachment,
     process_userreport,
 )
 from sentry.models import EventAttachment, EventUser, File, UserReport, create_files_from_dif_zip
-from sentry.testutils.helpers import Feature
+from sentry.testutils.helpers import Feature, override_options
 from sentry.utils import json
 
 PROGUARD_UUID = "467ade76-6d0b-11ed-a1eb-0242ac120002"
@@ -79,9 +80,37 @@ def test_deduplication_works(default_project, task_runner, preprocess_event):
         "project": default_project,
         "start_time": start_time,
         "has_attachments": False,
+        "save_event_batch": None,
     }
 
 
+@pytest.mark.django_db
+def test_flush_batch_saves_events_in_batches(default_project, django_cache):
+    messages = []
+    for i in range(3):
+        payload = get_normalized_event({"message": f"hello {i}"}, default_project)
+        messages.append(
+            {
+                "type": "event",
+                "payload": json.dumps(payload),
+                "start_time": time.time(),
+                "event_id": payload["event_id"],
+                "project_id": default_project.id,
+                "remote_addr": "127.0.0.1",
+            }
+        )
+
+    with override_options({"store.save-event-batch-size": 10}), patch(
+        "sentry.tasks.store.save_event_batch"
+    ) as save_event_batch:
+        IngestConsumerWorker().flush_batch(messages)
+
+    (call,) = save_event_batch.delay.call_args_list
+    assert [event["event_id"] for event in call.kwargs["events"]] == [
+        message["event_id"] for message in messages
+    ]
+
+
 @pytest.mark.django_db
 def test_transactions_spawn_save_event_transaction(
     default_project,
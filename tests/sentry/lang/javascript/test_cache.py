@@ -1,6 +1,6 @@
-from unittest import TestCase
+from unittest import TestCase, mock
 
-from sentry.lang.javascript.cache import SourceCache
+from sentry.lang.javascript.cache import ArtifactCache, SourceCache
 
 
 class BasicCacheTest(TestCase):
@@ -34,3 +34,43 @@ class BasicCacheTest(TestCase):
         # fall back to utf-8
         cache.add(url, "foobar".encode("utf-32"), encoding="utf-32")
         assert cache.get(url)[0] == "foobar"
+
+
+class ArtifactCacheTest(TestCase):
+    def test_lru_eviction(self):
+        cache = ArtifactCache(max_size=100, max_age=60)
+
+        cache.set(("source", 1, None, "a.js"), "a", 25)
+        cache.set(("source", 1, None, "b.js"), "b", 25)
+        cache.set(("source", 1, None, "c.js"), "c", 25)
+        assert cache.get(("source", 1, None, "a.js")) == "a"
+
+        cache.set(("source", 1, None, "d.js"), "d", 50)
+        assert cache.size == 100
+        assert cache.get(("source", 1, None, "b.js")) is None
+        assert cache.get(("source", 1, None, "a.js")) == "a"
+        assert cache.get(("source", 1, None, "c.js")) == "c"
+
+        # replacing an entry does not count its old size
+        cache.set(("source", 1, None, "d.js"), "d2", 25)
+        assert cache.size == 75
+        assert len(cache) == 3
+
+    def test_too_large(self):
+        cache = ArtifactCache(max_size=100, max_age=60)
+        cache.set(("source", 1, None, "a.js"), "a", 26)
+        assert cache.get(("source", 1, None, "a.js")) is None
+
+    def test_disabled(self):
+        cache = ArtifactCache(max_size=0, max_age=60)
+        cache.set(("source", 1, None, "a.js"), "a", 1)
+        assert cache.get(("source", 1, None, "a.js")) is None
+
+    def test_expiry(self):
+        cache = ArtifactCache(max_size=100, max_age=60)
+        with mock.patch("time.monotonic", return_value=1000):
+            cache.set(("source", 1, None, "a.js"), "a", 1)
+            assert cache.get(("source", 1, None, "a.js")) == "a"
+        with mock.patch("time.monotonic", return_value=1060):
+            assert cache.get(("source", 1, None, "a.js")) is None
+        assert cache.size == 0
@@ -1505,6 +1505,52 @@ class CacheSourceTest(TestCase):
         assert processor.cache.get(abs_path)
         assert len(processor.cache.get_errors(abs_path)) == 0
 
+    def test_artifact_cache_is_shared_between_processors(self):
+        project = self.create_project()
+        release = self.create_release(project=project, version="12.31.12")
+
+        abs_path = "app:///dist/index.js"
+        self.create_release_file(release_id=release.id, name=abs_path)
+
+        def cache_source():
+            processor = JavaScriptStacktraceProcessor(
+                data={"release": release.version}, stacktrace_infos=None, project=project
+            )
+            processor.release = release
+            processor.cache_source(abs_path)
+            return processor
+
+        with patch(
+            "sentry.lang.javascript.processor.fetch_file", wraps=fetch_file
+        ) as mock_fetch_file:
+            first = cache_source()
+            second = cache_source()
+
+        assert mock_fetch_file.call_count == 1
+        assert list(second.cache.get(abs_path)) == list(first.cache.get(abs_path))
+        assert len(second.cache.get_errors(abs_path)) == 0
+
+    def test_artifact_cache_is_not_shared_between_projects(self):
+        project = self.create_project()
+        other_project = self.create_project(organization=project.organization)
+        release = self.create_release(project=project, version="12.31.12")
+        release.add_project(other_project)
+
+        abs_path = "app:///dist/index.js"
+        self.create_release_file(release_id=release.id, name=abs_path)
+
+        with patch(
+            "sentry.lang.javascript.processor.fetch_file", wraps=fetch_file
+        ) as mock_fetch_file:
+            for p in (project, other_project):
+                processor = JavaScriptStacktraceProcessor(
+                    data={"release": release.version}, stacktrace_infos=None, project=p
+                )
+                processor.release = release
+                processor.cache_source(abs_path)
+
+        assert mock_fetch_file.call_count == 2
+
     @patch("sentry.lang.javascript.processor.discover_sourcemap")
     def test_node_modules_file_with_source_but_no_map_records_error(self, mock_discover_sourcemap):
         """
@@ -6,7 +6,7 @@ import pytest
 from django.core.files.base import ContentFile
 from django.db import DatabaseError
 
-from sentry.models import File, FileBlob, FileBlobIndex
+from sentry.models import File, FileBlob, FileBlobIndex, FileBlobOwner
 from sentry.testutils import TestCase
 from sentry.testutils.silo import region_silo_test
 
@@ -28,6 +28,47 @@ class FileBlobTest(TestCase):
         assert my_file1.checksum == my_file2.checksum
         assert my_file1.path == my_file2.path
 
+    def test_from_files_bulk(self):
+        existing = FileBlob.from_file(ContentFile(b"foo"))
+        files = [ContentFile(b"foo"), ContentFile(b"bar"), ContentFile(b"bar")]
+
+        with self.options({"filestore.bulk-blob-upload": True}), patch(
+            "sentry.models.file._locked_blob"
+        ) as mock_locked_blob:
+            FileBlob.from_files(files, organization=self.organization)
+        assert not mock_locked_blob.called
+
+        assert FileBlob.objects.count() == 2
+        assert FileBlob.objects.get(checksum=existing.checksum).path == existing.path
+        blob = FileBlob.objects.exclude(id=existing.id).get()
+        with blob.getfile() as f:
+            assert f.read() == b"bar"
+        assert sorted(
+            FileBlobOwner.objects.filter(organization_id=self.organization.id).values_list(
+                "blob_id", flat=True
+            )
+        ) == sorted([existing.id, blob.id])
+
+        # uploading the same blobs again only adds the missing owners
+        for fileobj in files:
+            fileobj.seek(0)
+        with self.options({"filestore.bulk-blob-upload": True}):
+            FileBlob.from_files(files, organization=self.organization)
+        assert FileBlob.objects.count() == 2
+        assert FileBlobOwner.objects.count() == 2
+
+    def test_from_files_bulk_checksum_mismatch(self):
+        files = [(ContentFile(b"foo"), None), (ContentFile(b"bar"), "0" * 40)]
+
+        with self.options({"filestore.bulk-blob-upload": True}), patch(
+            "sentry.models.file.get_storage"
+        ) as mock_get_storage:
+            with pytest.raises(OSError):
+                FileBlob.from_files(files)
+        # nothing is stored if any of the checksums do not match
+        assert not mock_get_storage.called
+        assert FileBlob.objects.count() == 0
+
     def test_generate_unique_path(self):
         path = FileBlob.generate_unique_path()
         assert path
@@ -157,6 +198,44 @@ class FileTest(TestCase):
             with pytest.raises(ValueError):
                 fp.seek(0, 666)
 
+    def test_readahead(self):
+        bytes = BytesIO(b"abcdefghijklmnopqrstuvwxyz")
+        file1 = File.objects.create(name="baz.js", type="default", size=26)
+        results = file1.putfile(bytes, 5)
+        assert len(results) == 6
+
+        with file1.getfile(readahead=2) as fp:
+            impl = fp.file
+            assert fp.read(3) == b"abc"
+            # the current blob is not buffered, the next two are
+            assert sorted(impl._pending) == [1, 2]
+
+            assert fp.read(9) == b"defghijkl"
+            assert sorted(impl._pending) == [3, 4]
+
+            fp.seek(-1, 2)
+            assert fp.tell() == 25
+            assert fp.read() == b"z"
+            assert impl._pending == {}
+
+            fp.seek(6)
+            assert sorted(impl._pending) == [2, 3]
+            assert fp.read() == b"ghijklmnopqrstuvwxyz"
+
+            fp.seek(0)
+            assert fp.read() == b"abcdefghijklmnopqrstuvwxyz"
+
+        assert impl._pending == {}
+
+    def test_readahead_option(self):
+        file1 = File.objects.create(name="baz.js", type="default", size=26)
+        file1.putfile(BytesIO(b"abcdefghijklmnopqrstuvwxyz"), 5)
+
+        with self.options({"filestore.readahead-blobs": 3}):
+            with file1.getfile() as fp:
+                assert fp.file._readahead == 3
+                assert fp.read() == b"abcdefghijklmnopqrstuvwxyz"
+
     def test_multi_chunk_prefetch(self):
         random_data = os.urandom(1 << 25)
 
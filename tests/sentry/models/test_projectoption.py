@@ -1,6 +1,7 @@
 from sentry.models import ProjectOption
 from sentry.testutils import TestCase
 from sentry.testutils.silo import region_silo_test
+from sentry.utils.cache import cache
 
 
 @region_silo_test(stable=True)
@@ -30,3 +31,23 @@ class ProjectOptionManagerTest(TestCase):
         ProjectOption.objects.create(project=self.project, key="foo", value="bar")
         result = ProjectOption.objects.get_value_bulk([self.project], "foo")
         assert result == {self.project: "bar"}
+
+    def test_prefetch_all_values(self):
+        other_project = self.create_project()
+        ProjectOption.objects.create(project=self.project, key="foo", value="bar")
+        ProjectOption.objects.clear_local_cache()
+        cache.delete_many(
+            [ProjectOption.objects._make_key(p.id) for p in (self.project, other_project)]
+        )
+
+        with self.assertNumQueries(1):
+            ProjectOption.objects.prefetch_all_values([self.project.id, other_project.id])
+        with self.assertNumQueries(0):
+            assert ProjectOption.objects.get_value(self.project, "foo") == "bar"
+            assert ProjectOption.objects.get_value(other_project, "foo") is None
+
+        # Values are also written to the shared cache.
+        ProjectOption.objects.clear_local_cache()
+        with self.assertNumQueries(0):
+            ProjectOption.objects.prefetch_all_values([self.project.id, other_project.id])
+            assert ProjectOption.objects.get_value(self.project, "foo") == "bar"
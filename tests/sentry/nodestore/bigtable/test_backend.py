@@ -95,6 +95,14 @@ def ns(request):
         yield MockedBigtableNodeStorage(project="test")
 
 
+def test_envelope_disables_store_compression():
+    ns = MockedBigtableNodeStorage(project="test", compression=True, encoding="envelope")
+    assert ns.store.compression is None
+
+    ns = MockedBigtableNodeStorage(project="test", compression=True)
+    assert ns.store.compression == "zlib"
+
+
 def test_cache(ns):
     node_1 = ("a" * 32, {"foo": "a"})
     node_2 = ("b" * 32, {"foo": "b"})
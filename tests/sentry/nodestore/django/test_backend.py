@@ -1,3 +1,4 @@
+import base64
 import pickle
 from datetime import timedelta
 from unittest import mock
@@ -5,6 +6,7 @@ from unittest import mock
 import pytest
 from django.utils import timezone
 
+from sentry.nodestore import envelope
 from sentry.nodestore.base import json_dumps
 from sentry.nodestore.django.backend import DjangoNodeStorage
 from sentry.nodestore.django.models import Node
@@ -53,6 +55,16 @@ class TestDjangoNodeStorage:
             b'{"foo":"bar"}'
         )
 
+    def test_set_envelope(self):
+        ns = DjangoNodeStorage(encoding="envelope")
+        ns.set_subkeys("d2502ebbd7df41ceba8d3275595cac33", {None: {"foo": "bar"}, "other": {}})
+        data = Node.objects.get(id="d2502ebbd7df41ceba8d3275595cac33").data
+        assert envelope.is_envelope(base64.b64decode(data))
+
+        assert ns.get("d2502ebbd7df41ceba8d3275595cac33") == {"foo": "bar"}
+        assert ns.get("d2502ebbd7df41ceba8d3275595cac33", subkey="other") == {}
+        assert self.ns.get("d2502ebbd7df41ceba8d3275595cac33") == {"foo": "bar"}
+
     def test_delete(self):
         node = Node.objects.create(id="d2502ebbd7df41ceba8d3275595cac33", data=b'{"foo": "bar"}')
 
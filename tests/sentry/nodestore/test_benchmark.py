@@ -0,0 +1,43 @@
+import pytest
+
+from sentry.testutils.skips import requires_pytest_benchmark
+from tests.sentry.nodestore.bigtable.test_backend import MockedBigtableNodeStorage
+
+
+def make_event(frame_count=200):
+    frames = [
+        {
+            "function": f"function_{i}",
+            "module": f"app.module_{i % 20}",
+            "filename": f"app/module_{i % 20}.py",
+            "abs_path": f"/srv/app/module_{i % 20}.py",
+            "lineno": i,
+            "in_app": i % 3 == 0,
+            "context_line": f"    result = function_{i + 1}(value)",
+            "vars": {"value": i, "name": f"frame {i}"},
+        }
+        for i in range(frame_count)
+    ]
+    return {
+        "event_id": "a" * 32,
+        "platform": "python",
+        "exception": {"values": [{"type": "ValueError", "stacktrace": {"frames": frames}}]},
+    }
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("encoding", ["json", "envelope"])
+@pytest.mark.parametrize("subkey", [None, "unprocessed"])
+def test_benchmark_get_subkey(encoding, subkey, benchmark):
+    ns = MockedBigtableNodeStorage(project="test", compression="zstd", encoding=encoding)
+    ns.set_subkeys("node_1", {None: make_event(), "unprocessed": make_event(frame_count=150)})
+
+    def read():
+        # bypasses the node cache, which only applies to the main payload
+        return ns._decode(ns._get_bytes("node_1"), subkey=subkey)
+
+    result = benchmark(read)
+
+    row = ns.store._get_table().read_row("node_1")
+    benchmark.extra_info["stored_bytes"] = len(row.cells["x"][ns.store.data_column][0].value)
+    assert result["event_id"] == "a" * 32
@@ -97,3 +97,31 @@ def test_set_subkeys(ns):
     ns.delete("node_1")
     assert ns.get("node_1") is None
     assert ns.get("node_1", subkey="other") is None
+
+
+@region_silo_test(stable=True)
+def test_set_subkeys_envelope(ns):
+    ns.set_subkeys("node_1", {None: {"foo": "a"}, "other": {"foo": "b"}})
+
+    ns.encoding = "envelope"
+    # values written in the legacy format are still readable
+    assert ns.get("node_1", subkey="other") == {"foo": "b"}
+
+    ns.set_subkeys("node_2", {None: {"foo": "a"}, "other": {"foo": "b"}})
+    assert ns.get("node_2") == {"foo": "a"}
+    assert ns.get("node_2", subkey="other") == {"foo": "b"}
+    assert ns.get("node_2", subkey="missing") is None
+    assert ns.get_multi(["node_1", "node_2"]) == {"node_1": {"foo": "a"}, "node_2": {"foo": "a"}}
+
+    ns.encoding = "json"
+    assert ns.get("node_2", subkey="other") == {"foo": "b"}
+
+
+@region_silo_test(stable=True)
+def test_set_subkeys_envelope_long_subkey(ns):
+    ns.encoding = "envelope"
+    with pytest.raises(ValueError):
+        ns.set_subkeys("node_1", {None: {"foo": "a"}, "x" * 256: {"foo": "b"}})
+
+    ns.set_subkeys("node_1", {None: {"foo": "a"}, "x" * 255: {"foo": "b"}})
+    assert ns.get("node_1", subkey="x" * 255) == {"foo": "b"}
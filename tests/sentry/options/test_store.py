@@ -156,3 +156,66 @@ class OptionsStoreTest(TestCase):
         mocked_time.return_value = 26
         store.clean_local_cache()
         assert not store._local_cache
+
+    @patch("sentry.options.store.threading.Thread")
+    def test_snapshot(self, mock_thread):
+        store, key = self.store, self.key
+        store.set(key, "bar")
+
+        store.enable_snapshot(interval=10, max_age=60)
+        assert store.get(key) == "bar"
+        assert mock_thread.return_value.start.call_count == 1
+
+        # Reads never leave the process.
+        with patch.object(Option.objects, "get_queryset", side_effect=RuntimeError()):
+            with patch.object(store.cache, "get", side_effect=RuntimeError()):
+                assert store.get(key) == "bar"
+                assert store.get(self.make_key()) is None
+
+        Option.objects.filter(key=key.name).update(value="lol")
+        assert not store.maybe_reload_snapshot()
+        assert store.get(key) == "bar"
+
+        # Another process changes an option.
+        other_store = OptionsStore(cache=store.cache)
+        other_key = self.make_key()
+        other_store.set(other_key, "baz")
+        assert store.maybe_reload_snapshot()
+        assert store.get(key) == "lol"
+        assert store.get(other_key) == "baz"
+
+        # Changes made by this process are visible right away.
+        store.delete(other_key)
+        assert store.get(other_key) is None
+        store.set(other_key, "qux")
+        assert store.get(other_key) == "qux"
+
+    @patch("sentry.options.store.threading.Thread")
+    @patch("sentry.options.store.time")
+    def test_snapshot_max_age(self, mocked_time, mock_thread):
+        store, key = self.store, self.key
+        mocked_time.return_value = 0
+        store.set(key, "bar")
+        store.enable_snapshot(interval=10, max_age=60)
+        assert store.get(key) == "bar"
+
+        Option.objects.filter(key=key.name).update(value="lol")
+        mocked_time.return_value = 59
+        assert not store.maybe_reload_snapshot()
+        mocked_time.return_value = 60
+        assert store.maybe_reload_snapshot()
+        assert store.get(key) == "lol"
+
+    @patch("sentry.options.store.threading.Thread")
+    def test_snapshot_unavailable(self, mock_thread):
+        store, key = self.store, self.key
+        store.set(key, "bar")
+        store.enable_snapshot(interval=10, max_age=60)
+
+        # Falls back to the caches if the snapshot can't be loaded.
+        with patch.object(Option.objects, "values_list", side_effect=RuntimeError()):
+            assert store.get(key) == "bar"
+        assert store.get_snapshot() is None
+
+        store.reload_snapshot()
+        assert store.get_snapshot()[key.name] == "bar"
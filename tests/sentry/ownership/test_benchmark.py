@@ -0,0 +1,47 @@
+import pytest
+
+from sentry.ownership.grammar import Matcher, Owner, Rule
+from sentry.ownership.index import RuleIndex
+from sentry.testutils.skips import requires_pytest_benchmark
+
+CODEOWNERS_LINES = 5000
+FRAME_COUNT = 30
+
+RULES = [
+    Rule(Matcher("codeowners", f"/src/app/module{i}/"), [Owner("team", f"team-{i % 50}")])
+    for i in range(CODEOWNERS_LINES)
+] + [Rule(Matcher("codeowners", "*.md"), [Owner("team", "docs")])]
+
+EVENT = {
+    "platform": "python",
+    "exception": {
+        "values": [
+            {
+                "stacktrace": {
+                    "frames": [
+                        {
+                            "filename": f"src/app/module{i * 97}/views.py",
+                            "abs_path": f"/src/app/module{i * 97}/views.py",
+                            "module": f"app.module{i * 97}.views",
+                        }
+                        for i in range(FRAME_COUNT)
+                    ]
+                }
+            }
+        ]
+    },
+}
+
+
+def match_all(data):
+    return [rule for rule in RULES if rule.test(data)]
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("indexed", [False, True], ids=["linear", "indexed"])
+def test_benchmark_matching_rules(indexed, benchmark):
+    match = RuleIndex(RULES).matching_rules if indexed else match_all
+
+    rules = benchmark(match, EVENT)
+
+    assert len(rules) == FRAME_COUNT
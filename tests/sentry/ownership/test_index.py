@@ -0,0 +1,128 @@
+import pytest
+
+from sentry.ownership.grammar import Matcher, Rule, dump_schema, load_schema, parse_rules
+from sentry.ownership.index import RuleIndex, get_rule_index, pattern_tokens
+
+fixture_data = """
+*.js                            #frontend
+url:http://google.com/*         #backend
+url:*example.com*               #backend
+path:src/sentry/*               david@sentry.io
+path:/usr/local/src/*/app.py    david@sentry.io
+path:[ab]/*.py                  david@sentry.io
+tags.foo:bar                    tagperson@sentry.io
+tags.user.email:*@sentry.io     tagperson@sentry.io
+module:foo.bar                  #workflow
+module:com.android*             #mobile
+codeowners:/src/components/     githubuser@sentry.io
+codeowners:frontend/*.ts        githubmod@sentry.io
+codeowners:test.?y              githubmod@sentry.io
+codeowners:foo/**/test.py       githubmod@sentry.io
+codeowners:\\filename           githubmod@sentry.io
+"""
+
+
+@pytest.mark.parametrize(
+    "pattern, expected",
+    [
+        ("src/*", ["src"]),
+        ("/src/sentry/api/", ["src", "sentry", "api"]),
+        ("*.py", ["py"]),
+        ("foo/**/test.py", ["foo", "test", "py"]),
+        ("http://*.com/foo.js", ["http:", "com", "foo", "js"]),
+        ("sentry.api.*", ["sentry", "api"]),
+        ("Foo.Bar", ["foo", "bar"]),
+        ("*example.com*", []),
+        ("test.?y", ["test"]),
+        ("[ab]/*.py", []),
+        ("\\filename", []),
+        ("*", []),
+        ("/", []),
+    ],
+)
+def test_pattern_tokens(pattern, expected):
+    assert pattern_tokens(pattern) == expected
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {},
+        {"request": {"url": "http://google.com/foo.js"}},
+        {"request": {"url": "https://www.example.com/"}},
+        {"stacktrace": {"frames": [{"filename": "src/sentry/api.py"}]}},
+        {"stacktrace": {"frames": [{"filename": "SRC\\Sentry\\api.py"}]}},
+        {"stacktrace": {"frames": [{"abs_path": "/usr/local/src/other/app.py"}]}},
+        {"stacktrace": {"frames": [{"filename": "a/test.py"}]}},
+        {"stacktrace": {"frames": [{"filename": "b/src/components/button.tsx"}]}},
+        {"stacktrace": {"frames": [{"filename": "frontend/index.ts"}]}},
+        {"stacktrace": {"frames": [{"filename": "foo/test.jy"}]}},
+        {"stacktrace": {"frames": [{"filename": "foo/bar/baz/test.py"}]}},
+        {"stacktrace": {"frames": [{"filename": "foo/subdir/\\/backslash_dir"}]}},
+        {"stacktrace": {"frames": [{"module": "foo.bar"}, {"module": "com.android.os.Init"}]}},
+        {"tags": [["foo", "bar"], ["baz", "qux"]]},
+        {"user": {"email": "someone@sentry.io", "id": 1}},
+        {"user": {"data": {"email": "someone@sentry.io", "count": 2}}},
+        {
+            "platform": "java",
+            "exception": {
+                "values": [
+                    {
+                        "stacktrace": {
+                            "frames": [
+                                {"module": "foo.bar.Baz", "filename": "Baz.java"},
+                                {"filename": "index.js"},
+                            ]
+                        }
+                    }
+                ]
+            },
+        },
+    ],
+)
+def test_matching_rules(data):
+    rules = parse_rules(fixture_data)
+    index = RuleIndex(rules)
+
+    assert index.matching_rules(data) == [rule for rule in rules if rule.test(data)]
+
+
+def test_matching_rules_order():
+    rules = [
+        Rule(Matcher("path", "src/*"), []),
+        Rule(Matcher("path", "*.py"), []),
+        Rule(Matcher("codeowners", "/src/"), []),
+    ]
+    data = {"stacktrace": {"frames": [{"filename": "src/app.py"}]}}
+
+    assert RuleIndex(rules).matching_rules(data) == rules
+
+
+def test_candidates():
+    rules = parse_rules(fixture_data)
+    index = RuleIndex(rules)
+
+    candidates = index.candidates({"stacktrace": {"frames": [{"filename": "docs/index.md"}]}})
+    assert [str(rules[idx].matcher) for idx in candidates] == [
+        "url:*example.com*",
+        "path:[ab]/*.py",
+        "codeowners:\\filename",
+    ]
+
+    # values that cannot be tokenized make all rules candidates
+    assert list(index.candidates({"stacktrace": {"frames": [{"filename": 1}]}})) == list(
+        range(len(rules))
+    )
+
+
+def test_get_rule_index_cached():
+    schema = dump_schema(parse_rules(fixture_data))
+
+    index = get_rule_index(schema)
+    assert index.rules == load_schema(schema)
+    assert get_rule_index(dump_schema(parse_rules(fixture_data))) is index
+
+    schema["rules"] = schema["rules"][1:]
+    changed = get_rule_index(schema)
+    assert changed is not index
+    assert changed.rules == index.rules[1:]
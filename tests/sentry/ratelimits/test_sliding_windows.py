@@ -1,3 +1,5 @@
+from unittest import mock
+
 import pytest
 
 from sentry.ratelimits.sliding_windows import (
@@ -121,3 +123,117 @@ def test_conflicting_quotas(limiter):
         GrantedQuota(prefix="foo", granted=6, reached_quotas=[]),
         GrantedQuota(prefix="bar", granted=4, reached_quotas=quotas),
     ]
+
+
+def test_shared_window_keys_fetched_once(limiter):
+    quotas = [
+        Quota(window_seconds=10, granularity_seconds=1, limit=10, prefix_override="global"),
+    ]
+    requests = [RequestedQuota(prefix=f"p{i}", requested=1, quotas=quotas) for i in range(20)]
+
+    with mock.patch.object(limiter.client, "mget", wraps=limiter.client.mget) as mget:
+        resp = limiter.check_within_quotas(requests, timestamp=TIMESTAMP_OFFSET)
+
+    assert mget.call_count == 1
+    (keys,) = mget.call_args[0]
+    assert len(keys) == 10
+    assert [grant.granted for grant in resp[1]] == [1] * 10 + [0] * 10
+
+
+def test_local_counters():
+    limiter = RedisSlidingWindowRateLimiter(local_flush_interval=60, local_error_budget=5)
+    remote = RedisSlidingWindowRateLimiter()
+    quotas = [Quota(window_seconds=10, granularity_seconds=1, limit=10)]
+
+    resp = limiter.check_and_use_quotas(
+        [RequestedQuota(prefix="foo", requested=4, quotas=quotas)], timestamp=TIMESTAMP_OFFSET
+    )
+    assert resp == [GrantedQuota(prefix="foo", granted=4, reached_quotas=[])]
+
+    # Within the error budget, usage is only known to the local process.
+    _, resp = remote.check_within_quotas(
+        [RequestedQuota(prefix="foo", requested=10, quotas=quotas)], timestamp=TIMESTAMP_OFFSET
+    )
+    assert resp[0].granted == 10
+
+    with mock.patch.object(limiter.client, "mget") as mget:
+        resp = limiter.check_and_use_quotas(
+            [RequestedQuota(prefix="foo", requested=4, quotas=quotas)], timestamp=TIMESTAMP_OFFSET
+        )
+    assert not mget.called
+    assert resp == [GrantedQuota(prefix="foo", granted=4, reached_quotas=[])]
+
+    # Exceeding the error budget flushes to Redis.
+    _, resp = remote.check_within_quotas(
+        [RequestedQuota(prefix="foo", requested=10, quotas=quotas)], timestamp=TIMESTAMP_OFFSET
+    )
+    assert resp[0].granted == 2
+
+    resp = limiter.check_and_use_quotas(
+        [RequestedQuota(prefix="foo", requested=4, quotas=quotas)], timestamp=TIMESTAMP_OFFSET
+    )
+    assert resp == [GrantedQuota(prefix="foo", granted=2, reached_quotas=quotas)]
+
+    limiter.flush()
+    _, resp = remote.check_within_quotas(
+        [RequestedQuota(prefix="foo", requested=10, quotas=quotas)], timestamp=TIMESTAMP_OFFSET
+    )
+    assert resp[0].granted == 0
+
+
+def test_local_counters_flush_interval():
+    limiter = RedisSlidingWindowRateLimiter(local_flush_interval=60, local_error_budget=100)
+    remote = RedisSlidingWindowRateLimiter()
+    quotas = [Quota(window_seconds=10, granularity_seconds=1, limit=10)]
+
+    with mock.patch("sentry.ratelimits.sliding_windows.monotonic", return_value=0):
+        limiter.check_and_use_quotas(
+            [RequestedQuota(prefix="foo", requested=3, quotas=quotas)], timestamp=TIMESTAMP_OFFSET
+        )
+
+    # Another process uses quota, which we only see once the cached counts
+    # expire.
+    remote.check_and_use_quotas(
+        [RequestedQuota(prefix="foo", requested=5, quotas=quotas)], timestamp=TIMESTAMP_OFFSET
+    )
+
+    with mock.patch("sentry.ratelimits.sliding_windows.monotonic", return_value=30):
+        _, resp = limiter.check_within_quotas(
+            [RequestedQuota(prefix="foo", requested=10, quotas=quotas)],
+            timestamp=TIMESTAMP_OFFSET,
+        )
+    assert resp[0].granted == 7
+
+    with mock.patch("sentry.ratelimits.sliding_windows.monotonic", return_value=60):
+        _, resp = limiter.check_within_quotas(
+            [RequestedQuota(prefix="foo", requested=10, quotas=quotas)],
+            timestamp=TIMESTAMP_OFFSET,
+        )
+    assert resp[0].granted == 2
+
+    _, resp = remote.check_within_quotas(
+        [RequestedQuota(prefix="foo", requested=10, quotas=quotas)], timestamp=TIMESTAMP_OFFSET
+    )
+    assert resp[0].granted == 2
+
+
+def test_local_counters_cache_pruned():
+    limiter = RedisSlidingWindowRateLimiter(local_flush_interval=60, local_error_budget=100)
+    quotas = [Quota(window_seconds=10, granularity_seconds=1, limit=10)]
+
+    # Only reading quotas never flushes, but still expires cached counts.
+    with mock.patch("sentry.ratelimits.sliding_windows.monotonic", return_value=0):
+        for prefix in ("foo", "bar"):
+            limiter.check_within_quotas(
+                [RequestedQuota(prefix=prefix, requested=1, quotas=quotas)],
+                timestamp=TIMESTAMP_OFFSET,
+            )
+    assert len(limiter._cached_counts) == 20
+
+    with mock.patch("sentry.ratelimits.sliding_windows.monotonic", return_value=60):
+        limiter.check_within_quotas(
+            [RequestedQuota(prefix="baz", requested=1, quotas=quotas)],
+            timestamp=TIMESTAMP_OFFSET,
+        )
+    assert len(limiter._cached_counts) == 10
+    assert all("baz" in key for key in limiter._cached_counts)
@@ -24,3 +24,53 @@ def test_read_write():
     my_key = "fake-dsn-1"
     cache.set_many({my_key: "my-value"})
     assert cache.get(my_key) == "my-value"
+
+
+@pytest.mark.django_db
+def test_get_many():
+    cache = redis.RedisProjectConfigCache()
+    cache.set_many({"fake-dsn-1": {"a": 1}, "fake-dsn-2": {"b": 2}})
+    assert cache.get_many(["fake-dsn-1", "fake-dsn-2", "fake-dsn-3"]) == {
+        "fake-dsn-1": {"a": 1},
+        "fake-dsn-2": {"b": 2},
+        "fake-dsn-3": None,
+    }
+
+
+@pytest.mark.django_db
+def test_local_cache():
+    cache = redis.RedisProjectConfigCache(local_cache_size=1, local_cache_ttl=60)
+    cache.set_many({"fake-dsn-1": {"a": 1}, "fake-dsn-2": {"b": 2}})
+
+    assert cache.get("fake-dsn-1") == {"a": 1}
+    with mock.patch.object(cache.cluster_read, "get") as redis_get:
+        # Every read returns a new copy of the config.
+        config = cache.get("fake-dsn-1")
+        config["a"] = 2
+        assert cache.get("fake-dsn-1") == {"a": 1}
+    assert redis_get.call_count == 0
+
+    # Reading another key evicts the first one.
+    assert cache.get_many(["fake-dsn-2"]) == {"fake-dsn-2": {"b": 2}}
+    assert list(cache._local_cache) == ["fake-dsn-2"]
+
+    # Local writes replace the local copy.
+    cache.set_many({"fake-dsn-2": {"b": 3}})
+    assert cache.get("fake-dsn-2") == {"b": 3}
+    cache.delete_many(["fake-dsn-2"])
+    assert cache.get("fake-dsn-2") is None
+
+
+@pytest.mark.django_db
+def test_local_cache_expiry():
+    cache = redis.RedisProjectConfigCache(local_cache_size=10, local_cache_ttl=5)
+    with mock.patch.object(redis.time, "monotonic", return_value=100):
+        cache.set_many({"fake-dsn-1": {"a": 1}})
+        assert cache.get("fake-dsn-1") == {"a": 1}
+
+    # Another process changed the config, which is picked up after the TTL.
+    redis.RedisProjectConfigCache().set_many({"fake-dsn-1": {"a": 2}})
+    with mock.patch.object(redis.time, "monotonic", return_value=104):
+        assert cache.get("fake-dsn-1") == {"a": 1}
+    with mock.patch.object(redis.time, "monotonic", return_value=106):
+        assert cache.get("fake-dsn-1") == {"a": 2}
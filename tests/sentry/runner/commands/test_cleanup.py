@@ -0,0 +1,69 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.utils import timezone
+
+from sentry.models import Group
+from sentry.runner.commands.cleanup import KeyRangeCheckpoints, KeyRangeTask, delete_key_range
+from sentry.testutils import TestCase
+
+
+class KeyRangeCleanupTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.checkpoints = KeyRangeCheckpoints(Group, 1, None)
+        self.addCleanup(self.checkpoints.clear)
+
+    def create_task(self, start, end, position, **kwargs):
+        return KeyRangeTask(
+            model="sentry.models.Group",
+            dtfield="last_seen",
+            days=1,
+            project_id=None,
+            start=start,
+            end=end,
+            position=position,
+            batch_size=2,
+            bulk=kwargs.get("bulk", True),
+            checkpoints=self.checkpoints,
+        )
+
+    def test_checkpoints(self):
+        assert self.checkpoints.load() == []
+
+        self.checkpoints.create([(0, 10), (10, 20)])
+        assert self.checkpoints.load() == [(0, 10, 0), (10, 20, 10)]
+
+        self.checkpoints.save(10, 20, 15)
+        assert self.checkpoints.load() == [(0, 10, 0), (10, 20, 15)]
+
+        self.checkpoints.clear()
+        assert self.checkpoints.load() == []
+
+    def test_delete_key_range_resumes(self):
+        old = timezone.now() - timedelta(days=2)
+        groups = [self.create_group(last_seen=old) for _ in range(5)]
+        start, end = groups[0].id - 1, groups[-1].id
+        self.checkpoints.create([(start, end)])
+
+        # a previous run got as far as the second group
+        delete_key_range(self.create_task(start, end, groups[1].id))
+
+        assert list(Group.objects.values_list("id", flat=True).order_by("id")) == [
+            groups[0].id,
+            groups[1].id,
+        ]
+        assert self.checkpoints.load() == [(start, end, end)]
+
+    @mock.patch("sentry.runner.commands.cleanup.KeyRangeCheckpoints.save")
+    def test_delete_key_range_with_deletions(self, mock_save):
+        old = timezone.now() - timedelta(days=2)
+        groups = [self.create_group(last_seen=old) for _ in range(3)]
+        recent = self.create_group()
+        start, end = groups[0].id - 1, recent.id
+
+        with self.tasks():
+            delete_key_range(self.create_task(start, end, start, bulk=False))
+
+        assert list(Group.objects.values_list("id", flat=True)) == [recent.id]
+        assert [c[0][2] for c in mock_save.call_args_list] == [groups[1].id, recent.id, end]
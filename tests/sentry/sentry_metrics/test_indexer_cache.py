@@ -1,3 +1,5 @@
+from unittest import mock
+
 import pytest
 from django.conf import settings
 
@@ -71,3 +73,65 @@ def test_separate_namespacing() -> None:
     indexer_cache.set("a", 2, UseCaseKey.PERFORMANCE.value)
     assert indexer_cache.get("a", UseCaseKey.RELEASE_HEALTH.value) == 1
     assert indexer_cache.get("a", UseCaseKey.PERFORMANCE.value) == 2
+
+
+def test_local_cache(use_case_id: str) -> None:
+    cache.clear()
+    two_tier_cache = StringIndexerCache(
+        **settings.SENTRY_STRING_INDEXER_CACHE_OPTIONS,
+        partition_key=_PARTITION_KEY,
+        local_cache_size=2,
+    )
+
+    two_tier_cache.set_many({"hello": 2, "bye": 3}, use_case_id)
+    assert len(two_tier_cache.local_cache) == 2
+
+    # Reads are served by the local tier...
+    cache.clear()
+    assert two_tier_cache.get_many(["hello", "bye"], use_case_id) == {"hello": 2, "bye": 3}
+    assert two_tier_cache.get("hello", use_case_id) == 2
+
+    # ...and populate it from the shared cache.
+    indexer_cache.set("blah", 1, use_case_id)
+    assert two_tier_cache.get_many(["blah", "bye"], use_case_id) == {"blah": 1, "bye": 3}
+    cache.clear()
+    assert two_tier_cache.get("blah", use_case_id) == 1
+    # "hello" was the least recently used entry
+    assert two_tier_cache.get("hello", use_case_id) is None
+
+    two_tier_cache.delete("blah", use_case_id)
+    assert two_tier_cache.get("blah", use_case_id) is None
+
+
+def test_local_cache_expiry(use_case_id: str) -> None:
+    two_tier_cache = StringIndexerCache(
+        **settings.SENTRY_STRING_INDEXER_CACHE_OPTIONS,
+        partition_key=_PARTITION_KEY,
+        local_cache_size=10,
+    )
+
+    with mock.patch("time.monotonic", return_value=0):
+        two_tier_cache.set("hello", 2, use_case_id)
+
+    cache.clear()
+    ttl = settings.SENTRY_METRICS_INDEXER_CACHE_TTL
+    with mock.patch("time.monotonic", return_value=ttl - 1):
+        assert two_tier_cache.get("hello", use_case_id) == 2
+    with mock.patch("time.monotonic", return_value=ttl * 1.25 + 1):
+        assert two_tier_cache.get("hello", use_case_id) is None
+
+
+def test_local_cache_reverse(use_case_id: str) -> None:
+    assert indexer_cache.get_reverse(1, 2, use_case_id) is None
+    indexer_cache.set_reverse(1, 2, "hello", use_case_id)
+    assert indexer_cache.get_reverse(1, 2, use_case_id) is None
+
+    two_tier_cache = StringIndexerCache(
+        **settings.SENTRY_STRING_INDEXER_CACHE_OPTIONS,
+        partition_key=_PARTITION_KEY,
+        local_cache_size=10,
+    )
+    two_tier_cache.set_reverse(1, 2, "hello", use_case_id)
+    assert two_tier_cache.get_reverse(1, 2, use_case_id) == "hello"
+    assert two_tier_cache.get_reverse(2, 2, use_case_id) is None
+    assert two_tier_cache.get_reverse(1, 2, UseCaseKey.PERFORMANCE.value) is None
@@ -45,6 +45,23 @@ class RedisScriptMinHashIndexBackendTestCase(TestCase):
         result = self.index.export("example", [("index", 2)], timestamp=timestamp)
         assert len(result) == 1
 
+    def test_export_delete(self):
+        self.index.record("example", "1", [("index", "hello world")])
+
+        timestamp = int(time.time())
+        exported = self.index.export("example", [("index", 1)], timestamp=timestamp)
+        extracted = self.index.export("example", [("index", 1)], timestamp=timestamp, delete=True)
+        assert extracted == exported
+
+        # The data was deleted after exporting it.
+        assert self.index.export("example", [("index", 1)], timestamp=timestamp) == [
+            msgpack.packb([])
+        ]
+        assert self.index.classify("example", [("index", 0, "hello world")]) == []
+
+        self.index.import_("other", [("index", 1, extracted[0])], timestamp=timestamp)
+        assert self.index.classify("other", [("index", 0, "hello world")]) == [("1", [1.0])]
+
     def test_basic(self):
         self.index.record("example", "1", [("index", "hello world")])
         self.index.record("example", "2", [("index", "hello world")])
@@ -222,3 +239,13 @@ class RedisScriptMinHashIndexBackendTestCase(TestCase):
 
         self.index.flush("*", ["index"])
         assert self.index.classify("example", [("index", 0, ["foo", "bar"])]) == []
+
+    def test_flush_many_batches(self):
+        for i in range(10):
+            self.index.record("example", str(i), [("index", ["foo", "bar"])])
+        self.index.record("other", "1", [("index", ["foo", "bar"])])
+
+        self.index.flush("example", ["index"], batch=2)
+        assert self.index.classify("example", [("index", 0, ["foo", "bar"])]) == []
+        assert not any(chunk for _, chunk in self.index.scan("example", ["index"]))
+        assert self.index.classify("other", [("index", 0, ["foo", "bar"])]) == [("1", [1.0])]
@@ -0,0 +1,67 @@
+import random
+
+import mmh3
+import pytest
+
+from sentry.similarity.backends.redis import RedisScriptMinHashIndexBackend
+from sentry.similarity.signatures import MinHashSignatureBuilder
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils import redis
+
+COLUMNS = 16
+ROWS = 0xFFFF
+EVENT_COUNT = 200
+FEATURES_PER_EVENT = 100
+
+
+def reference_signature(features):
+    return [
+        min(mmh3.hash(feature, column) % ROWS for feature in features) for column in range(COLUMNS)
+    ]
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("builder", ["reference", "cached"])
+def test_benchmark_signatures(builder, benchmark):
+    rng = random.Random(0)
+    # Similar events share most of their features.
+    vocabulary = [f"frame-{i}".encode() for i in range(FEATURES_PER_EVENT * 5)]
+    events = [rng.sample(vocabulary, FEATURES_PER_EVENT) for _ in range(EVENT_COUNT)]
+
+    get_signature = (
+        reference_signature if builder == "reference" else MinHashSignatureBuilder(COLUMNS, ROWS)
+    )
+
+    def run():
+        return [get_signature(features) for features in events]
+
+    signatures = benchmark(run)
+
+    benchmark.extra_info["events_per_second"] = EVENT_COUNT / benchmark.stats.stats.mean
+    assert signatures == [reference_signature(features) for features in events]
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db
+def test_benchmark_flush(benchmark):
+    index = RedisScriptMinHashIndexBackend(
+        redis.clusters.get("default").get_local_client(0),
+        "sim",
+        MinHashSignatureBuilder(COLUMNS, ROWS),
+        8,
+        60 * 60,
+        12,
+        10,
+    )
+    rng = random.Random(0)
+    vocabulary = [f"frame-{i}" for i in range(FEATURES_PER_EVENT * 5)]
+
+    def setup():
+        for i in range(EVENT_COUNT):
+            index.record("example", str(i), [("index", rng.sample(vocabulary, FEATURES_PER_EVENT))])
+        return ("example", ["index"]), {"batch": 100}
+
+    benchmark.pedantic(index.flush, setup=setup, rounds=5)
+
+    benchmark.extra_info["groups_per_second"] = EVENT_COUNT / benchmark.stats.stats.mean
+    assert index.classify("example", [("index", 0, vocabulary[:FEATURES_PER_EVENT])]) == []
@@ -1,6 +1,8 @@
 from collections import Counter
 from unittest import TestCase
 
+import mmh3
+
 from sentry.similarity.signatures import MinHashSignatureBuilder
 
 
@@ -28,3 +30,13 @@ class MinHashSignatureBuilderTestCase(TestCase):
         self.assertAlmostEqual(
             similarity, estimation, delta=0.1  # totally made up constant, seems reasonable
         )
+
+    def test_matches_reference(self):
+        n = 16
+        r = 0xFFFF
+        get_signature = MinHashSignatureBuilder(n, r, cache_size=4)
+
+        for features in [{"foo"}, {"foo", "bar", "baz"}, [b"a", b"b", b"a", b"c", b"d", b"e"]]:
+            assert get_signature(features) == [
+                min(mmh3.hash(feature, column) % r for feature in features) for column in range(n)
+            ]
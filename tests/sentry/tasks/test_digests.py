@@ -6,7 +6,7 @@ import sentry
 from sentry.digests.backends.redis import RedisBackend
 from sentry.digests.notifications import event_to_record
 from sentry.models import ProjectOwnership, Rule
-from sentry.tasks.digests import deliver_digest
+from sentry.tasks.digests import deliver_digest, deliver_digests
 from sentry.testutils import TestCase
 from sentry.testutils.helpers.datetime import before_now, iso_format
 from sentry.testutils.helpers.features import with_feature
@@ -14,10 +14,11 @@ from sentry.testutils.helpers.features import with_feature
 
 class DeliverDigestTest(TestCase):
     @patch.object(sentry, "digests")
-    def run_test(self, key: str, digests):
+    def run_test(self, key: str, digests, batch: bool = False):
         """Simple integration test to make sure that digests are firing as expected."""
         backend = RedisBackend()
         digests.digest = backend.digest
+        digests.digest_many = backend.digest_many
 
         rule = Rule.objects.create(project=self.project, label="Test Rule", data={})
         ProjectOwnership.objects.create(project_id=self.project.id, fallthrough=True)
@@ -32,7 +33,10 @@ class DeliverDigestTest(TestCase):
         backend.add(key, event_to_record(event, [rule]), increment_delay=0, maximum_delay=0)
         backend.add(key, event_to_record(event_2, [rule]), increment_delay=0, maximum_delay=0)
         with self.tasks():
-            deliver_digest(key)
+            if batch:
+                deliver_digests([key])
+            else:
+                deliver_digest(key)
         assert "2 new alerts since" in mail.outbox[0].subject
 
     def test_old_key(self):
@@ -48,6 +52,33 @@ class DeliverDigestTest(TestCase):
     def test_member_key(self):
         self.run_test(f"mail:p:{self.project.id}:Member:{self.user.id}")
 
+    def test_batch(self):
+        self.run_test(f"mail:p:{self.project.id}:IssueOwners:", batch=True)
+
+    def test_batch_many_timelines(self):
+        backend = RedisBackend()
+        rule = Rule.objects.create(project=self.project, label="Test Rule", data={})
+        member_keys = []
+        for i in range(3):
+            user = self.create_user()
+            self.create_member(user=user, organization=self.organization, teams=[self.team])
+            key = f"mail:p:{self.project.id}:Member:{user.id}"
+            event = self.store_event(
+                data={"timestamp": iso_format(before_now(days=1)), "fingerprint": [f"group-{i}"]},
+                project_id=self.project.id,
+            )
+            backend.add(key, event_to_record(event, [rule]), increment_delay=0, maximum_delay=0)
+            member_keys.append(key)
+
+        missing_key = "mail:p:0:IssueOwners:"
+        with patch.object(sentry, "digests") as digests:
+            digests.digest_many = backend.digest_many
+            with self.tasks():
+                deliver_digests(member_keys + [missing_key])
+            digests.delete.assert_called_once_with(missing_key)
+
+        assert len(mail.outbox) == 3
+
     def test_no_records(self):
         # This shouldn't error if no records are present
         deliver_digest(f"mail:p:{self.project.id}:IssueOwners:")
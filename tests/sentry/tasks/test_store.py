@@ -5,14 +5,19 @@ import pytest
 from django.test.utils import override_settings
 
 from sentry import quotas
-from sentry.event_manager import EventManager, HashDiscarded
+from sentry.event_manager import EventManager, HashDiscarded, save_error_events
+from sentry.eventstore.processing import event_processing_store
+from sentry.models import Group
 from sentry.plugins.base.v2 import Plugin2
 from sentry.tasks.store import (
     preprocess_event,
     process_event,
     save_event,
+    save_event_batch,
+    submit_save_event_batch,
     time_synthetic_monitoring_event,
 )
+from sentry.testutils.helpers import override_options
 
 EVENT_ID = "cc3e6c2bb6b6498097f336d1e6979f4b"
 
@@ -130,6 +135,106 @@ def test_move_to_save_event(
     assert mock_save_event.delay.call_count == 1
 
 
+@pytest.mark.django_db
+def test_move_to_save_event_batch(
+    default_project, mock_process_event, mock_save_event, mock_symbolicate_event, register_plugin
+):
+    register_plugin(globals(), BasicPreprocessorPlugin)
+    data = {
+        "project": default_project.id,
+        "platform": "NOTMATTLANG",
+        "logentry": {"formatted": "test"},
+        "event_id": EVENT_ID,
+        "extra": {"foo": "bar"},
+    }
+
+    batch = []
+    preprocess_event(cache_key="e:1", data=data, event_id=EVENT_ID, save_event_batch=batch)
+
+    assert mock_process_event.delay.call_count == 0
+    assert mock_save_event.delay.call_count == 0
+    assert batch == [
+        {
+            "cache_key": "e:1",
+            "start_time": None,
+            "event_id": EVENT_ID,
+            "project_id": default_project.id,
+        }
+    ]
+
+    # Events with attachments keep going through their own task.
+    preprocess_event(
+        cache_key="e:2", data=data, event_id=EVENT_ID, has_attachments=True, save_event_batch=batch
+    )
+    assert len(batch) == 1
+
+
+@pytest.mark.django_db
+def test_submit_save_event_batch():
+    events = [{"cache_key": f"e:{i}", "project_id": 1 if i < 3 else 2} for i in range(4)]
+
+    with override_options({"store.save-event-batch-size": 2}), mock.patch(
+        "sentry.tasks.store.save_event_batch"
+    ) as mock_save_event_batch:
+        submit_save_event_batch(events)
+
+    assert mock_save_event_batch.delay.call_args_list == [
+        mock.call(events=events[0:2]),
+        mock.call(events=events[2:3]),
+        mock.call(events=events[3:4]),
+    ]
+
+
+def store_events(project, count):
+    events = []
+    for i in range(count):
+        manager = EventManager({"message": f"hello {i}"})
+        manager.normalize(project_id=project.id)
+        data = dict(manager.get_data())
+        events.append(
+            {
+                "cache_key": event_processing_store.store(data),
+                "start_time": time(),
+                "event_id": data["event_id"],
+                "project_id": project.id,
+            }
+        )
+    return events
+
+
+@pytest.mark.django_db
+def test_save_event_batch(default_project):
+    events = store_events(default_project, 3)
+
+    with mock.patch(
+        "sentry.event_manager.save_error_events", wraps=save_error_events
+    ) as mock_save_error_events:
+        save_event_batch(events=events)
+
+    assert mock_save_error_events.call_count == 1
+    assert len(mock_save_error_events.call_args[0][0]) == 3
+    assert Group.objects.filter(project=default_project).count() == 3
+    for event in events:
+        assert event_processing_store.get(event["cache_key"]) is not None
+
+
+@pytest.mark.django_db
+def test_save_event_batch_falls_back_to_single_saves(default_project):
+    events = store_events(default_project, 3)
+
+    def fail_batches(jobs, *args, **kwargs):
+        if len(jobs) > 1:
+            raise ValueError("bad event")
+        return save_error_events(jobs, *args, **kwargs)
+
+    with mock.patch("sentry.event_manager.save_error_events", side_effect=fail_batches):
+        save_event_batch(events=events)
+
+    assert Group.objects.filter(project=default_project).count() == 3
+    for event in events:
+        assert event_processing_store.get(event["cache_key"]) is not None
+
+
 @pytest.mark.django_db
 def test_process_event_mutate_and_save(
     default_project, mock_event_processing_store, mock_save_event, register_plugin
@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.tsdb.base import ONE_DAY, ONE_HOUR, TSDBModel
+from sentry.tsdb.redis import RedisTSDB
+
+KEY_COUNT = 200
+DAYS = 7
+
+
+@pytest.fixture
+def tsdb():
+    with override_settings(
+        SENTRY_OPTIONS={
+            "redis.clusters": {"tsdb": {"hosts": {i - 6: {"db": i} for i in range(6, 9)}}}
+        }
+    ):
+        db = RedisTSDB(rollups=((ONE_HOUR, 24 * DAYS), (ONE_DAY, 30)), cluster="tsdb")
+
+    yield db
+
+    with db.cluster.all() as client:
+        client.flushdb()
+
+
+def count_commands(cluster):
+    total = 0
+    for host_id in cluster.hosts:
+        stats = cluster.get_local_client(host_id).info("commandstats")
+        total += sum(
+            stats[command]["calls"]
+            for command in ("cmdstat_hget", "cmdstat_evalsha", "cmdstat_eval")
+            if command in stats
+        )
+    return total
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("enable_range_script", [False, True], ids=["hget", "range_script"])
+@pytest.mark.parametrize("method", ["get_range", "get_sums"])
+def test_benchmark_range_reads(method, enable_range_script, benchmark, tsdb):
+    end = timezone.now()
+    start = end - timedelta(days=DAYS)
+    keys = list(range(KEY_COUNT))
+    for hours in range(0, 24 * DAYS, 6):
+        tsdb.incr_multi([(TSDBModel.group, key) for key in keys], end - timedelta(hours=hours))
+
+    expected = getattr(tsdb, method)(TSDBModel.group, keys, start, end, rollup=ONE_HOUR)
+    tsdb.enable_range_script = enable_range_script
+
+    for host_id in tsdb.cluster.hosts:
+        tsdb.cluster.get_local_client(host_id).config_resetstat()
+
+    result = benchmark.pedantic(
+        getattr(tsdb, method), (TSDBModel.group, keys, start, end), {"rollup": ONE_HOUR}, rounds=5
+    )
+
+    benchmark.extra_info["commands_per_call"] = count_commands(tsdb.cluster) / 5
+    assert result == expected
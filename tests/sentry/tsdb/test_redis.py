@@ -188,6 +188,43 @@ class RedisTSDBTest(TestCase):
         results = self.db.get_sums(TSDBModel.project, [1, 2], dts[0], dts[-1], environment_id=1)
         assert results == {1: 0, 2: 0}
 
+    def test_range_script(self):
+        now = datetime.utcnow().replace(tzinfo=pytz.UTC) - timedelta(hours=4)
+        dts = [now + timedelta(hours=i) for i in range(4)]
+        keys = list(range(1, 20))
+
+        for i, dt in enumerate(dts):
+            self.db.incr_multi([(TSDBModel.group, key) for key in keys], dt, count=i + 1)
+            self.db.incr_multi(
+                [(TSDBModel.group, key) for key in keys[::2]], dt, count=2, environment_id=1
+            )
+
+        expected_range = self.db.get_range(TSDBModel.group, keys + [100], dts[0], dts[-1])
+        expected_env_range = self.db.get_range(
+            TSDBModel.group, keys, dts[0], dts[-1], environment_ids=[1]
+        )
+        expected_sums = self.db.get_sums(TSDBModel.group, keys + [100], dts[0], dts[-1])
+        expected_env_sums = self.db.get_sums(
+            TSDBModel.group, keys, dts[0], dts[-1], environment_id=1
+        )
+        assert expected_sums[1] == 18
+        assert expected_env_sums == {key: 8 if key % 2 else 0 for key in keys}
+
+        self.db.enable_range_script = True
+        # force batches to be split, including the fields of a single hash
+        self.db.range_script_batch_size = 3
+
+        assert self.db.get_range(TSDBModel.group, keys + [100], dts[0], dts[-1]) == expected_range
+        assert (
+            self.db.get_range(TSDBModel.group, keys, dts[0], dts[-1], environment_ids=[1])
+            == expected_env_range
+        )
+        assert self.db.get_sums(TSDBModel.group, keys + [100], dts[0], dts[-1]) == expected_sums
+        assert (
+            self.db.get_sums(TSDBModel.group, keys, dts[0], dts[-1], environment_id=1)
+            == expected_env_sums
+        )
+
     def test_count_distinct(self):
         now = datetime.utcnow().replace(tzinfo=pytz.UTC) - timedelta(hours=4)
         dts = [now + timedelta(hours=i) for i in range(4)]
@@ -8,15 +8,30 @@ from sentry.eventstore.models import Event
 from sentry.issues.grouptype import PerformanceNPlusOneGroupType, PerformanceSlowDBQueryGroupType
 from sentry.testutils import TestCase
 from sentry.testutils.helpers import override_options
-from sentry.testutils.performance_issues.event_generators import get_event
+from sentry.testutils.performance_issues.event_generators import EVENTS, create_span, get_event
 from sentry.testutils.silo import region_silo_test
-from sentry.utils.performance_issues.base import DETECTOR_TYPE_TO_GROUP_TYPE, DetectorType
+from sentry.utils.performance_issues.base import (
+    DETECTOR_TYPE_TO_GROUP_TYPE,
+    DetectorType,
+    SpanIndex,
+)
 from sentry.utils.performance_issues.performance_detection import (
+    ConsecutiveDBSpanDetector,
     EventPerformanceProblem,
+    FileIOMainThreadDetector,
+    MNPlusOneDBSpanDetector,
+    NPlusOneAPICallsDetector,
     NPlusOneDBSpanDetector,
+    NPlusOneDBSpanDetectorExtended,
     PerformanceProblem,
+    RenderBlockingAssetSpanDetector,
+    SlowDBQueryDetector,
+    UncompressedAssetSpanDetector,
     _detect_performance_problems,
     detect_performance_problems,
+    get_detection_settings,
+    run_detector_on_data,
+    run_detectors_on_data,
     total_span_time,
 )
 
@@ -534,3 +549,61 @@ class EventPerformanceProblemTest(TestCase):
 )
 def test_total_span_time(spans, duration):
     assert total_span_time(spans) == pytest.approx(duration, 0.01)
+
+
+class SpanIndexTest(unittest.TestCase):
+    def test_index(self):
+        parent = create_span("http.server", duration=300, hash="a")
+        parent["span_id"] = "a" * 16
+        first = create_span("db", duration=100, hash="b")
+        first.update(span_id="b" * 16, parent_span_id="a" * 16, start_timestamp=0.2)
+        second = create_span("db", duration=50, hash="b")
+        second.update(span_id="c" * 16, parent_span_id="a" * 16)
+        event = {
+            "contexts": {"trace": {"span_id": "r" * 16, "op": "http.server"}},
+            "spans": [parent, first, second],
+        }
+
+        index = SpanIndex(event)
+        assert index.spans == [parent, first, second]
+        assert index.spans_by_id["b" * 16] is first
+        assert index.get_duration(second).total_seconds() == pytest.approx(0.05)
+        assert index.get_fingerprint(first) == index.get_fingerprint(second)
+
+
+@region_silo_test
+@pytest.mark.django_db
+class RunDetectorsOnDataTest(TestCase):
+    DETECTOR_CLASSES = [
+        ConsecutiveDBSpanDetector,
+        SlowDBQueryDetector,
+        RenderBlockingAssetSpanDetector,
+        NPlusOneDBSpanDetector,
+        NPlusOneDBSpanDetectorExtended,
+        FileIOMainThreadDetector,
+        NPlusOneAPICallsDetector,
+        MNPlusOneDBSpanDetector,
+        UncompressedAssetSpanDetector,
+    ]
+
+    def test_matches_running_detectors_separately(self):
+        settings = get_detection_settings()
+
+        def get_project_event(event_name):
+            event = get_event(event_name)
+            event["project"] = self.project.id
+            return event
+
+        for event_name in EVENTS:
+            separately = [
+                cls(settings, get_project_event(event_name)) for cls in self.DETECTOR_CLASSES
+            ]
+            for detector in separately:
+                run_detector_on_data(detector, detector.event())
+
+            event = get_project_event(event_name)
+            together = [cls(settings, event) for cls in self.DETECTOR_CLASSES]
+            run_detectors_on_data(together, event)
+
+            for a, b in zip(separately, together):
+                assert a.stored_problems == b.stored_problems, event_name
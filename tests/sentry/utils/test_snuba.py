@@ -1,3 +1,4 @@
+import threading
 import unittest
 from datetime import datetime, timedelta
 from unittest import mock
@@ -10,9 +11,12 @@ from sentry.models import GroupRelease, Project, Release
 from sentry.testutils import TestCase
 from sentry.utils.snuba import (
     Dataset,
+    QueryExecutionError,
     SnubaQueryParams,
     UnqualifiedQueryError,
+    _apply_cache_and_build_results,
     _prepare_query_params,
+    get_cache_key,
     get_json_type,
     get_query_params_to_update_for_projects,
     get_snuba_column_name,
@@ -374,3 +378,166 @@ class QuantizeTimeTest(unittest.TestCase):
                 break
 
         assert i != j
+
+
+class QueryCacheTest(TestCase):
+    referrer = "api.dashboards.bignumberwidget"
+
+    def query(self, from_date="2022-01-01T12:00:01", to_date="2022-01-02T12:00:01"):
+        return (
+            {
+                "dataset": "events",
+                "from_date": from_date,
+                "to_date": to_date,
+                # Do not share cache entries between tests
+                "test": self._testMethodName,
+            },
+            lambda x: x,
+            lambda x: x,
+        )
+
+    def test_cache_key_floors_time_window(self):
+        query = self.query()[0]
+        assert get_cache_key(query, 10) == get_cache_key(
+            self.query("2022-01-01T12:00:09.5", "2022-01-02T12:00:05+00:00")[0], 10
+        )
+        assert get_cache_key(query, 10) != get_cache_key(
+            self.query("2022-01-01T12:00:11", "2022-01-02T12:00:11")[0], 10
+        )
+        assert get_cache_key(query) != get_cache_key(
+            self.query("2022-01-01T12:00:09", "2022-01-02T12:00:09")[0]
+        )
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_cache_window_referrers(self, mock_query):
+        mock_query.side_effect = lambda params, headers: [{"data": [{"count": 1}]} for _ in params]
+        other_window = self.query("2022-01-01T12:00:09", "2022-01-02T12:00:09")
+
+        # Without opting in, queries for a different window are never shared.
+        for query in (self.query(), other_window):
+            _apply_cache_and_build_results([query], referrer=self.referrer, use_cache=True)
+        assert mock_query.call_count == 2
+
+        mock_query.reset_mock()
+        with self.options({"snuba.query-cache.window-referrers": [self.referrer]}):
+            for query in (
+                self.query("2022-01-01T12:01:01", "2022-01-02T12:01:01"),
+                self.query("2022-01-01T12:01:09", "2022-01-02T12:01:09"),
+            ):
+                _apply_cache_and_build_results([query], referrer=self.referrer, use_cache=True)
+        assert mock_query.call_count == 1
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_cache_hit(self, mock_query):
+        mock_query.side_effect = lambda params, headers: [{"data": [{"count": 1}]} for _ in params]
+
+        for _ in range(2):
+            assert _apply_cache_and_build_results(
+                [self.query()], referrer=self.referrer, use_cache=True
+            ) == [{"data": [{"count": 1}]}]
+        assert mock_query.call_count == 1
+
+        _apply_cache_and_build_results([self.query()], referrer=self.referrer)
+        assert mock_query.call_count == 2
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_cache_referrers_option(self, mock_query):
+        mock_query.side_effect = lambda params, headers: [{"data": []} for _ in params]
+
+        with self.options({"snuba.query-cache.referrers": [self.referrer]}):
+            for _ in range(2):
+                _apply_cache_and_build_results([self.query()], referrer=self.referrer)
+        assert mock_query.call_count == 1
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_coalesces_inflight_queries(self, mock_query):
+        started = threading.Event()
+        release = threading.Event()
+
+        def query(params, headers):
+            started.set()
+            release.wait(5)
+            return [{"data": [{"count": 1}]} for _ in params]
+
+        mock_query.side_effect = query
+
+        results = []
+
+        def run():
+            results.append(
+                _apply_cache_and_build_results(
+                    [self.query()], referrer=self.referrer, use_cache=True
+                )
+            )
+
+        leader = threading.Thread(target=run)
+        leader.start()
+        started.wait(5)
+
+        # The cache is still empty, but the identical query is in flight.
+        coalesced = threading.Event()
+        with mock.patch("sentry.utils.snuba.metrics.incr") as incr:
+            incr.side_effect = lambda key, **kwargs: (
+                coalesced.set() if key == "snuba.query_cache.coalesced" else None
+            )
+            follower = threading.Thread(target=run)
+            follower.start()
+            coalesced.wait(5)
+            release.set()
+            leader.join(5)
+            follower.join(5)
+
+        assert mock_query.call_count == 1
+        assert results == [[{"data": [{"count": 1}]}]] * 2
+        # Followers get their own copy of the result.
+        assert results[0][0] is not results[1][0]
+
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_coalesced_query_errors(self, mock_query):
+        mock_query.side_effect = lambda params, headers: [{"data": []} for _ in params]
+
+        # Identical queries within one call are only sent once.
+        assert _apply_cache_and_build_results(
+            [self.query(), self.query()], referrer=self.referrer, use_cache=True
+        ) == [{"data": []}, {"data": []}]
+        assert mock_query.call_count == 1
+        assert len(mock_query.call_args[0][0]) == 1
+
+        mock_query.side_effect = QueryExecutionError("boom")
+        with pytest.raises(QueryExecutionError):
+            _apply_cache_and_build_results(
+                [self.query("2021-01-01T00:00:00"), self.query("2021-01-01T00:00:00")],
+                referrer=self.referrer,
+                use_cache=True,
+            )
+
+    @mock.patch("sentry.utils.snuba._cache_refresh_pool")
+    @mock.patch("sentry.utils.snuba._bulk_snuba_query")
+    def test_stale_while_revalidate(self, mock_query, mock_pool):
+        mock_pool.submit.side_effect = lambda fn: fn()
+        mock_query.return_value = [{"data": [{"count": 1}]}]
+
+        with self.settings(SENTRY_SNUBA_CACHE_TTL_SECONDS=60, SENTRY_SNUBA_CACHE_STALE_SECONDS=60):
+            with mock.patch("time.time", return_value=1000):
+                _apply_cache_and_build_results(
+                    [self.query()], referrer=self.referrer, use_cache=True
+                )
+
+            mock_query.return_value = [{"data": [{"count": 2}]}]
+            with mock.patch("time.time", return_value=1030):
+                assert _apply_cache_and_build_results(
+                    [self.query()], referrer=self.referrer, use_cache=True
+                ) == [{"data": [{"count": 1}]}]
+            assert mock_query.call_count == 1
+
+            # The stale result is served while it is being refreshed.
+            with mock.patch("time.time", return_value=1090):
+                assert _apply_cache_and_build_results(
+                    [self.query()], referrer=self.referrer, use_cache=True
+                ) == [{"data": [{"count": 1}]}]
+            assert mock_query.call_count == 2
+
+            with mock.patch("time.time", return_value=1095):
+                assert _apply_cache_and_build_results(
+                    [self.query()], referrer=self.referrer, use_cache=True
+                ) == [{"data": [{"count": 2}]}]
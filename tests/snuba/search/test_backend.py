@@ -37,7 +37,7 @@ from sentry.search.snuba.executors import InvalidQueryForExecutor
 from sentry.testutils import SnubaTestCase, TestCase, xfail_if_not_postgres
 from sentry.testutils.helpers import Feature
 from sentry.testutils.helpers.datetime import before_now, iso_format
-from sentry.utils.snuba import SENTRY_SNUBA_MAP, SnubaError
+from sentry.utils.snuba import SENTRY_SNUBA_MAP, SnubaError, bulk_raw_query
 from tests.sentry.issues.test_utils import OccurrenceTestMixin
 
 
@@ -1350,6 +1350,34 @@ class EventsSnubaSearchTest(SharedSnubaTest):
         finally:
             options.set("snuba.search.max-pre-snuba-candidates", prev_max_pre)
 
+    def test_candidate_chunks(self):
+        with self.options({"snuba.search.candidate-chunk-size": 1}), mock.patch(
+            "sentry.search.snuba.executors.bulk_raw_query",
+            wraps=bulk_raw_query,
+        ) as bulk_raw_query_mock:
+            results = self.make_query()
+            assert set(results) == {self.group1, self.group2}
+
+            # one query per candidate
+            (query_params,), _ = bulk_raw_query_mock.call_args
+            assert len(query_params) == 2
+
+            results = self.make_query(sort_by="freq", limit=1)
+            assert list(results) == [self.group1]
+
+    def test_prefetch_chunks(self):
+        with self.options(
+            {
+                "snuba.search.max-pre-snuba-candidates": 1,
+                "snuba.search.prefetch-chunks": True,
+            }
+        ):
+            results = self.make_query()
+            assert set(results) == {self.group1, self.group2}
+
+            results = self.make_query(search_filter_query="is:unresolved", limit=1)
+            assert set(results) == {self.group1}
+
     def test_optimizer_enabled(self):
         prev_optimizer_enabled = options.get("snuba.search.pre-snuba-candidates-optimizer")
         options.set("snuba.search.pre-snuba-candidates-optimizer", True)
@@ -19,6 +19,8 @@ from sentry.tasks.unmerge import (
     get_fingerprint,
     get_group_backfill_attributes,
     get_group_creation_attributes,
+    get_group_merge_attributes,
+    get_shards,
     unmerge,
 )
 from sentry.testutils import SnubaTestCase, TestCase
@@ -163,8 +165,86 @@ class UnmergeTestCase(TestCase, SnubaTestCase):
             "first_release": None,
         }
 
+    def test_get_group_merge_attributes(self):
+        now = datetime.utcnow().replace(microsecond=0, tzinfo=timezone.utc)
+        group = Group(
+            active_at=now - timedelta(hours=1),
+            first_seen=now - timedelta(hours=1),
+            last_seen=now - timedelta(hours=1),
+            platform="javascript",
+            message="Hello from JavaScript",
+            level=logging.INFO,
+            score=Group.calculate_score(1, now - timedelta(hours=1)),
+            logger="javascript",
+            times_seen=1,
+            first_release=None,
+            culprit="",
+            data={"type": "default", "last_received": to_timestamp(now), "metadata": {}},
+        )
+
+        attributes = get_group_merge_attributes(
+            get_caches(),
+            group,
+            [
+                self.store_event(
+                    data={
+                        "platform": "python",
+                        "message": "Hello from Python",
+                        "timestamp": iso_format(now),
+                        "type": "default",
+                        "level": "debug",
+                    },
+                    project_id=self.project.id,
+                ),
+                self.store_event(
+                    data={
+                        "platform": "java",
+                        "message": "Hello from Java",
+                        "timestamp": iso_format(now - timedelta(hours=2)),
+                        "type": "default",
+                        "level": "debug",
+                        "tags": {"logger": "java"},
+                    },
+                    project_id=self.project.id,
+                ),
+            ],
+        )
+
+        # the latest event is newer than the group, the oldest one older
+        assert attributes["last_seen"] == now
+        assert attributes["message"] == "Hello from Python"
+        assert attributes["level"] == logging.DEBUG
+        assert attributes["first_seen"] == attributes["active_at"] == now - timedelta(hours=2)
+        assert attributes["platform"] == "java"
+        assert attributes["logger"] == "java"
+        assert attributes["times_seen"] == 3
+        assert attributes["score"] == Group.calculate_score(3, now)
+
+    def test_get_shards(self):
+        now = datetime.utcnow().replace(microsecond=0, tzinfo=timezone.utc)
+        group = Group(first_seen=now - timedelta(hours=3), last_seen=now)
+
+        shards = get_shards(group, 3)
+        assert [(shard["start"], shard["end"]) for shard in shards] == [
+            (None, (now - timedelta(hours=2)).isoformat()),
+            ((now - timedelta(hours=2)).isoformat(), (now - timedelta(hours=1)).isoformat()),
+            ((now - timedelta(hours=1)).isoformat(), None),
+        ]
+        assert all(shard["last_event"] is None and not shard["done"] for shard in shards)
+
+        # shards are never shorter than a second
+        assert len(get_shards(Group(first_seen=now, last_seen=now), 3)) == 1
+
     @with_feature("projects:similarity-indexing")
     def test_unmerge(self):
+        self.run_unmerge()
+
+    @with_feature("projects:similarity-indexing")
+    def test_unmerge_shards(self):
+        with self.options({"unmerge.shards": 3}):
+            self.run_unmerge()
+
+    def run_unmerge(self):
         now = before_now(minutes=5).replace(microsecond=0, tzinfo=pytz.utc)
 
         def time_from_now(offset=0):